@@ -19,30 +19,52 @@ import os
 import time
 
 # 로깅 모듈 import 및 초기화
-from utils.logger import setup_logging, log_auth, log_error, log_access
+from utils.logger import setup_logging, is_log_enabled, log_auth, log_error, log_access, log_event
 setup_logging(app_name="hotel")
 
 # 인증 모듈 import
 from utils.auth import (
+    AUTH_COOKIE_NAME,
+    AUTH_TOKEN_TTL_SECONDS,
     authenticate_user,
+    create_auth_token,
     is_authenticated,
-    logout
+    logout,
+    restore_auth_from_token
 )
 
 # 숙소 검색 모듈 import
-from utils.hotel_search import search_hotels, get_hotel_by_id
+from utils.hotel_search import search_hotels, get_hotel_by_id, get_hotels_by_ids
+from utils.hotel_index import start_hotel_index
 
 # 숙소별 데이터 조회 모듈 import
-from utils.data_fetcher_hotel import fetch_hotel_data, fetch_hotel_summary_stats
+from utils.data_fetcher_hotel import fetch_hotel_data, iter_hotel_data, summarize_hotel_data
 
 # 숙소별 엑셀 핸들러 import
-from utils.excel_handler_hotel import create_hotel_excel_download
+from utils.excel_handler_hotel import (
+    create_hotel_excel_download,
+    create_hotel_csv_download,
+    create_hotel_parquet_download
+)
+
+# 보고서 컬럼 정의 (화면 미리보기/엑셀 공통)
+from utils.export_engine import HOTEL_REPORT_COLUMNS, PYARROW_AVAILABLE, display_frame
+
+# 조회 작업별 소요 시간 로그용
+from utils.query_executor import format_memory, format_timings, timings_to_ms
 
 from config.master_data_loader import (
     get_date_type_options,
-    get_date_type_display_name
+    get_date_type_display_name,
+    start_master_data_watcher
 )
 
+# master_data.xlsx 변경 감시 (서비스 재시작 없이 반영, 프로세스당 1회 시작)
+start_master_data_watcher()
+
+# 숙소 검색 색인 생성 (백그라운드, 준비 전에는 DB 검색)
+start_hotel_index()
+
 # 페이지 설정
 st.set_page_config(
     page_title="숙소별 예약 통계",
@@ -91,14 +113,7 @@ st.markdown(sidebar_css, unsafe_allow_html=True)
 
 # 쿠키에서 인증 정보 복원 (새로고침 문제 해결)
 def restore_auth_from_cookie():
-    """쿠키에서 인증 정보를 읽어 세션 상태에 복원"""
-    try:
-        log_auth("DEBUG", "restore_auth_from_cookie 시작", 
-                has_logout_flag=st.session_state.get('_logout_in_progress', False),
-                is_authenticated=is_authenticated(st.session_state))
-    except:
-        pass
-    
+    """쿠키의 서명 토큰을 서버에서 검증하여 세션 상태에 복원 (첫 실행에서 바로 복원, 리다이렉트 없음)"""
     # 로그아웃 중이면 복원하지 않음
     # 단, 로그아웃 플래그는 로그아웃 버튼 클릭 시에만 설정되므로
     # 새로고침 시에는 플래그가 없어야 함
@@ -111,124 +126,40 @@ def restore_auth_from_cookie():
     
     # 이미 인증되어 있으면 복원 불필요
     if is_authenticated(st.session_state):
-        try:
-            log_auth("DEBUG", "이미 인증됨 - 쿠키 복원 불필요")
-        except:
-            pass
         return True
     
-    # 방법 1: URL 파라미터에서 복원 (JavaScript 리다이렉트로 설정된 경우 우선 처리)
     try:
-        query_params = st.query_params
-        if 'auth_restore' in query_params:
-            admin_id = query_params['auth_restore']
-            if admin_id:
-                st.session_state.authenticated = True
-                st.session_state.admin_id = admin_id
-                if '_logout_in_progress' in st.session_state:
-                    del st.session_state['_logout_in_progress']
-                # URL 파라미터 제거 (다음 요청에서는 쿠키로만 복원)
-                st.query_params.clear()
-                try:
-                    log_auth("INFO", "쿠키에서 인증 정보 복원 (URL 파라미터)", admin_id=admin_id)
-                except:
-                    pass
-                # URL 파라미터로 복원된 경우 rerun (쿠키로 복원되도록)
-                st.rerun()
-                return True
+        return restore_auth_from_token(st.session_state)
     except Exception as e:
         try:
-            log_error("DEBUG", "URL 파라미터 복원 실패", exception=e)
+            log_error("ERROR", "쿠키에서 인증 정보 복원 실패", exception=e, traceback_str=str(e))
         except:
-            pass
-    
-    # 방법 2: st.context.cookies 사용 (서버 측 쿠키 읽기)
-    try:
-        has_context = hasattr(st, 'context')
-        has_cookies = has_context and hasattr(st.context, 'cookies')
-        
-        if has_cookies:
-            cookies = st.context.cookies
-            cookie_dict = cookies.to_dict() if hasattr(cookies, 'to_dict') else dict(cookies)
-            
-            if 'auth_admin_id' in cookie_dict:
-                admin_id = cookie_dict.get('auth_admin_id')
-                if admin_id:
-                    st.session_state.authenticated = True
-                    st.session_state.admin_id = admin_id
-                    # 로그아웃 플래그가 있다면 삭제 (새로고침 시 정상 복원을 위해)
-                    if '_logout_in_progress' in st.session_state:
-                        del st.session_state['_logout_in_progress']
-                    try:
-                        log_auth("INFO", "쿠키에서 인증 정보 복원 (context)", admin_id=admin_id)
-                    except:
-                        pass
-                    return True
-        
-    except Exception as e:
-        try:
-            log_error("DEBUG", "st.context.cookies 접근 실패", exception=e)
-        except:
-            pass
-    
-    return False
+            pass  # 로그 기록 실패해도 계속 진행
+        return False
 
-# 쿠키에서 인증 정보 복원 시도
+# 쿠키에서 인증 정보 복원 시도 (요청 쿠키를 서버에서 바로 읽으므로 JavaScript 재시도 불필요)
 restore_result = restore_auth_from_cookie()
 
-# 쿠키 복원 실패 시 JavaScript로 쿠키 읽기 시도 (운영서버 대응)
-# 단, 로그아웃 진행 중이거나 이미 인증된 경우는 실행하지 않음
-if not restore_result and not is_authenticated(st.session_state) and not st.session_state.get('_logout_in_progress', False):
-    # URL 파라미터에 auth_restore가 없을 때만 JavaScript 실행 (무한 리다이렉트 방지)
-    if 'auth_restore' not in st.query_params:
-        cookie_read_script = """
-        <script>
-        (function() {
-            function getCookie(name) {
-                var nameEQ = name + "=";
-                var ca = document.cookie.split(';');
-                for(var i = 0; i < ca.length; i++) {
-                    var c = ca[i];
-                    while (c.charAt(0) == ' ') c = c.substring(1, c.length);
-                    if (c.indexOf(nameEQ) == 0) {
-                        return c.substring(nameEQ.length, c.length);
-                    }
-                }
-                return null;
-            }
-            
-            // URL 파라미터에 auth_restore가 없고, 쿠키에 auth_admin_id가 있으면 리다이렉트
-            var urlParams = new URLSearchParams(window.location.search);
-            if (!urlParams.has('auth_restore')) {
-                var authId = getCookie("auth_admin_id");
-                if (authId) {
-                    // 즉시 리다이렉트 (방안 1: 타이밍 문제 해결)
-                    var newUrl = window.location.pathname + "?auth_restore=" + encodeURIComponent(authId);
-                    window.location.replace(newUrl);
-                }
-            }
-        })();
-        </script>
-        """
-        st.components.v1.html(cookie_read_script, height=0)
-
-# 디버깅: 세션 상태 확인
-debug_info = {
-    'has_authenticated': 'authenticated' in st.session_state,
-    'authenticated_value': st.session_state.get('authenticated', 'NOT_SET'),
-    'has_admin_id': 'admin_id' in st.session_state,
-    'admin_id_value': st.session_state.get('admin_id', 'NOT_SET'),
-    'session_state_keys': list(st.session_state.keys())
-}
 is_auth_result = is_authenticated(st.session_state)
 
-# 디버깅 로그 (로그 기록 실패해도 계속 진행)
-try:
-    log_auth("INFO", "인증 상태 체크", 
-             is_authenticated=is_auth_result,
-             debug_info=str(debug_info))
-except:
-    pass  # 로그 기록 실패해도 계속 진행
+# 디버깅: 세션 상태 확인 (로그인 페이지이거나 DEBUG 로그가 켜진 경우에만 수집 - 매 rerun 비용 방지)
+debug_info = None
+if not is_auth_result or is_log_enabled("DEBUG"):
+    debug_info = {
+        'has_authenticated': 'authenticated' in st.session_state,
+        'authenticated_value': st.session_state.get('authenticated', 'NOT_SET'),
+        'has_admin_id': 'admin_id' in st.session_state,
+        'admin_id_value': st.session_state.get('admin_id', 'NOT_SET'),
+        'session_state_keys': list(st.session_state.keys())
+    }
+    
+    # 디버깅 로그 (로그 기록 실패해도 계속 진행)
+    try:
+        log_auth("DEBUG", "인증 상태 체크", 
+                 is_authenticated=is_auth_result,
+                 debug_info=str(debug_info))
+    except:
+        pass  # 로그 기록 실패해도 계속 진행
 
 # 인증 상태 확인
 if not is_auth_result:
@@ -261,9 +192,10 @@ if not is_auth_result:
                     if '_logout_in_progress' in st.session_state:
                         del st.session_state['_logout_in_progress']
                     
-                    # 쿠키에 인증 정보 저장 (새로고침 문제 해결)
+                    # 쿠키에 서명된 인증 토큰 저장 (새로고침 시 서버에서 검증하여 복원)
                     # JavaScript를 사용하여 쿠키 설정 (서버 환경 대응)
                     admin_id = auth_result['admin_id']
+                    auth_token = create_auth_token(admin_id)
                     # 쿠키 설정 스크립트 (운영 서버 환경 대응 강화)
                     cookie_script = f"""
                     <script>
@@ -318,7 +250,9 @@ if not is_auth_result:
                         }}
                         
                         // 즉시 실행
-                        setCookie("auth_admin_id", "{admin_id}", 1);
+                        setCookie("{AUTH_COOKIE_NAME}", "{auth_token}", {AUTH_TOKEN_TTL_SECONDS / 86400});
+                        // 이전 방식(서명 없는 auth_admin_id) 쿠키 삭제
+                        document.cookie = "auth_admin_id=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT; SameSite=Lax";
                     }})();
                     </script>
                     """
@@ -352,11 +286,12 @@ if not is_auth_result:
 
 # 인증된 사용자만 여기까지 도달
 
-# 디버깅: 인증된 사용자 접근 확인
-log_auth("INFO", "인증된 사용자 접근", 
-         admin_id=st.session_state.get('admin_id'),
-         authenticated=st.session_state.get('authenticated'),
-         session_keys=list(st.session_state.keys()))
+# 디버깅: 인증된 사용자 접근 확인 (매 rerun 실행되므로 DEBUG 로그가 켜진 경우에만)
+if is_log_enabled("DEBUG"):
+    log_auth("DEBUG", "인증된 사용자 접근", 
+             admin_id=st.session_state.get('admin_id'),
+             authenticated=st.session_state.get('authenticated'),
+             session_keys=list(st.session_state.keys()))
 
 # ============================================
 # 메인 애플리케이션
@@ -375,14 +310,15 @@ with col_header2:
         logout(st.session_state)
         
         # 쿠키 삭제 및 페이지 리로드 (JavaScript로 강제 리로드)
-        cookie_script = """
+        cookie_script = f"""
         <script>
         // 쿠키 삭제
+        document.cookie = "{AUTH_COOKIE_NAME}=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT; SameSite=Lax";
         document.cookie = "auth_admin_id=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT; SameSite=Lax";
         // 페이지 강제 리로드하여 로그인 페이지로 이동
-        setTimeout(function() {
+        setTimeout(function() {{
             window.location.href = window.location.pathname;
-        }, 100);
+        }}, 100);
         </script>
         """
         st.components.v1.html(cookie_script, height=0)
@@ -439,11 +375,14 @@ with st.sidebar:
         st.session_state.start_date = default_start
     if 'end_date' not in st.session_state:
         st.session_state.end_date = default_end
-    if 'selected_hotels' not in st.session_state:
-        st.session_state.selected_hotels = []
+    if 'selected_hotel_ids' not in st.session_state:
+        st.session_state.selected_hotel_ids = []
     if 'search_term' not in st.session_state:
         st.session_state.search_term = ''
     
+    # 선택한 숙소는 세션에 idx만 저장하고, 표시용 숙소 정보는 숙소 디멘션 캐시에서 한 번에 조회
+    selected_hotels = get_hotels_by_ids(st.session_state.selected_hotel_ids)
+    
     # 세션 상태에서 날짜유형 인덱스 찾기
     date_type_index = 0
     if 'date_type' in st.session_state and st.session_state.date_type in date_type_options:
@@ -577,7 +516,7 @@ with st.sidebar:
     # 검색 결과를 multiselect 형태로 표시 (선택된 숙소도 포함)
     if search_results:
         # 이미 선택된 숙소의 idx 목록 (중복 선택 방지)
-        selected_hotel_indices = {h.get('idx') for h in st.session_state.selected_hotels if h.get('idx')}
+        selected_hotel_indices = set(st.session_state.selected_hotel_ids)
         
         # 검색 결과를 옵션 리스트로 변환 (모든 검색 결과 포함)
         hotel_options = []
@@ -590,7 +529,7 @@ with st.sidebar:
         
         # 이미 선택된 숙소의 라벨 추출 (체크 상태로 유지)
         selected_labels_in_results = []
-        for hotel in st.session_state.selected_hotels:
+        for hotel in selected_hotels:
             hotel_label = f"{hotel['name_kr']} ({hotel['product_code']})"
             if hotel_label in hotel_options:
                 selected_labels_in_results.append(hotel_label)
@@ -624,10 +563,10 @@ with st.sidebar:
             if label not in selected_labels_in_results:
                 hotel = hotel_dict[label]
                 # 중복 확인 (이미 선택된 숙소인지)
-                if not any(h.get('idx') == hotel['idx'] for h in st.session_state.selected_hotels):
+                if hotel['idx'] not in selected_hotel_indices:
                     # 최대 10개 제한
-                    if len(st.session_state.selected_hotels) < 10:
-                        st.session_state.selected_hotels.append(hotel)
+                    if len(st.session_state.selected_hotel_ids) < 10:
+                        st.session_state.selected_hotel_ids.append(hotel['idx'])
                         st.rerun()
                     else:
                         st.warning("⚠️ 최대 10개까지 선택 가능합니다.")
@@ -637,22 +576,24 @@ with st.sidebar:
         for label in selected_labels_in_results:
             if label not in selected_hotel_labels:
                 hotel = hotel_dict[label]
-                st.session_state.selected_hotels = [h for h in st.session_state.selected_hotels if h.get('idx') != hotel['idx']]
+                st.session_state.selected_hotel_ids = [
+                    hotel_idx for hotel_idx in st.session_state.selected_hotel_ids if hotel_idx != hotel['idx']
+                ]
                 st.rerun()
     
     # 선택한 숙소 목록 (체크박스 형태, 체크 해제 시 삭제)
-    if st.session_state.selected_hotels:
+    if selected_hotels:
         st.markdown("---")
         st.write("**선택한 숙소 목록:**")
         
         # 디버깅: 초기 상태 확인
-        print(f"[DEBUG] 선택한 숙소 목록 시작 - 총 {len(st.session_state.selected_hotels)}개")
-        print(f"[DEBUG] selected_hotels: {[h.get('idx') for h in st.session_state.selected_hotels]}")
+        print(f"[DEBUG] 선택한 숙소 목록 시작 - 총 {len(selected_hotels)}개")
+        print(f"[DEBUG] selected_hotel_ids: {st.session_state.selected_hotel_ids}")
         
         # 선택된 숙소를 체크박스 형태로 표시
         hotels_to_remove = []
         
-        for i, hotel in enumerate(st.session_state.selected_hotels):
+        for i, hotel in enumerate(selected_hotels):
             hotel_name = hotel.get('name_kr', 'Unknown')
             hotel_name_short = format_hotel_name(hotel_name, max_length=8)
             hotel_label = f"🏨 {hotel_name_short}"
@@ -687,14 +628,16 @@ with st.sidebar:
         print(f"[DEBUG] 루프 종료 - hotels_to_remove 개수: {len(hotels_to_remove)}")
         if hotels_to_remove:
             print(f"[DEBUG] 삭제할 숙소 목록: {hotels_to_remove}")
-            print(f"[DEBUG] 삭제 전 selected_hotels 개수: {len(st.session_state.selected_hotels)}")
-            print(f"[DEBUG] 삭제 전 selected_hotels idx 목록: {[h.get('idx') for h in st.session_state.selected_hotels]}")
+            print(f"[DEBUG] 삭제 전 selected_hotel_ids 개수: {len(st.session_state.selected_hotel_ids)}")
+            print(f"[DEBUG] 삭제 전 selected_hotel_ids 목록: {st.session_state.selected_hotel_ids}")
         
         # 삭제 처리
         if hotels_to_remove:
             for idx, hotel_idx in sorted(hotels_to_remove, key=lambda x: x[0], reverse=True):
                 print(f"[DEBUG] 삭제 처리 시작 - 인덱스={idx}, hotel_idx={hotel_idx}")
-                removed_hotel = st.session_state.selected_hotels.pop(idx)
+                # 세션에는 idx만 있으므로 hotel_idx로 삭제
+                st.session_state.selected_hotel_ids.remove(hotel_idx)
+                removed_hotel = selected_hotels[idx]
                 print(f"[DEBUG] 삭제된 숙소: idx={removed_hotel.get('idx')}, name={removed_hotel.get('name_kr', 'Unknown')}")
                 
                 # 세션 상태에서 체크박스 key 삭제 (체크 해제 상태가 남지 않도록)
@@ -706,8 +649,8 @@ with st.sidebar:
                     print(f"[DEBUG] ⚠️ 세션 상태에 체크박스 key 없음: {checkbox_key}")
             
             # 디버깅: 삭제 처리 후 상태
-            print(f"[DEBUG] 삭제 후 selected_hotels 개수: {len(st.session_state.selected_hotels)}")
-            print(f"[DEBUG] 삭제 후 selected_hotels idx 목록: {[h.get('idx') for h in st.session_state.selected_hotels]}")
+            print(f"[DEBUG] 삭제 후 selected_hotel_ids 개수: {len(st.session_state.selected_hotel_ids)}")
+            print(f"[DEBUG] 삭제 후 selected_hotel_ids 목록: {st.session_state.selected_hotel_ids}")
             
             # multiselect 동기화 플래그 설정 (방안 1)
             # 체크박스에서 삭제한 경우에만 multiselect 세션 상태를 동기화하도록 플래그 설정
@@ -719,10 +662,10 @@ with st.sidebar:
             # 화면에 디버깅 정보 표시 (개발용)
             with st.expander("🔍 디버깅 정보 (체크 해제)", expanded=True):
                 st.write(f"**삭제된 숙소 수:** {len(hotels_to_remove)}")
-                st.write(f"**삭제 전 목록 개수:** {len(st.session_state.selected_hotels) + len(hotels_to_remove)}")
-                st.write(f"**삭제 후 목록 개수:** {len(st.session_state.selected_hotels)}")
+                st.write(f"**삭제 전 목록 개수:** {len(st.session_state.selected_hotel_ids) + len(hotels_to_remove)}")
+                st.write(f"**삭제 후 목록 개수:** {len(st.session_state.selected_hotel_ids)}")
                 st.write(f"**삭제된 숙소 idx:** {[h[1] for h in hotels_to_remove]}")
-                st.write(f"**남은 숙소 idx:** {[h.get('idx') for h in st.session_state.selected_hotels]}")
+                st.write(f"**남은 숙소 idx:** {st.session_state.selected_hotel_ids}")
             
             st.rerun()
     else:
@@ -741,7 +684,7 @@ with st.sidebar:
         st.session_state.date_type = default_date_type
         st.session_state.start_date = default_start
         st.session_state.end_date = default_end
-        st.session_state.selected_hotels = []
+        st.session_state.selected_hotel_ids = []
         st.session_state.search_term = ''
         st.session_state.selected_sale_type = '전체'
         st.session_state.last_search_result = None
@@ -756,12 +699,12 @@ if should_show_result:
     # 조회 버튼이 클릭된 경우에만 새로 조회
     if search_button:
         # 선택된 숙소 확인
-        if not st.session_state.selected_hotels:
+        if not selected_hotels:
             st.error("⚠️ 최소 1개 이상의 숙소를 선택해주세요.")
             st.stop()
         
-        # 선택된 숙소 ID 리스트 추출
-        selected_hotel_ids = [hotel.get('idx') for hotel in st.session_state.selected_hotels if hotel.get('idx')]
+        # 선택된 숙소 ID 리스트 추출 (product에 있는 숙소만)
+        selected_hotel_ids = [hotel['idx'] for hotel in selected_hotels]
         
         if not selected_hotel_ids:
             st.error("⚠️ 선택된 숙소가 없습니다. 숙소를 선택해주세요.")
@@ -789,15 +732,8 @@ if should_show_result:
                     sale_type=sale_type
                 )
                 
-                # 요약 통계 조회
-                summary_stats = fetch_hotel_summary_stats(
-                    start_date, 
-                    end_date, 
-                    selected_hotel_ids=selected_hotel_ids,
-                    date_type=date_type,
-                    order_status='전체',  # 항상 '전체'로 고정
-                    sale_type=sale_type
-                )
+                # 요약 통계는 상세 조회 결과에서 계산 (추가 쿼리 없음)
+                summary_stats = summarize_hotel_data(df)
                 
                 # 조회 결과를 세션 상태에 저장
                 st.session_state.last_search_result = {
@@ -818,7 +754,15 @@ if should_show_result:
                 # 로깅: 조회 버튼 클릭 - 성공
                 log_access("INFO", "[ACTION] 조회 버튼 클릭 - 성공", admin_id=admin_id, 
                           결과건수=len(df),
-                          소요시간=f"{elapsed_time:.2f}초")
+                          소요시간=f"{elapsed_time:.2f}초",
+                          쿼리시간=format_timings(df.attrs.get('query_timings', [])),
+                          조회메모리=format_memory(df.attrs.get('peak_memory_bytes')))
+                log_event('search', admin_id=admin_id,
+                          start_date=str(start_date), end_date=str(end_date), days=days_diff,
+                          date_type=date_type, sale_type=sale_type, hotel_count=len(selected_hotel_ids),
+                          rows=len(df), elapsed_ms=round(elapsed_time * 1000, 1),
+                          peak_memory_bytes=df.attrs.get('peak_memory_bytes'),
+                          timings=timings_to_ms(df.attrs.get('query_timings', [])))
                 
         except Exception as e:
             # 소요 시간 계산 (실패 시에도)
@@ -828,6 +772,10 @@ if should_show_result:
             log_error("ERROR", "[ACTION] 조회 버튼 클릭 - 실패", exception=e, admin_id=admin_id,
                      기간=f"{start_date}~{end_date}", 숙소수=len(selected_hotel_ids),
                      소요시간=f"{elapsed_time:.2f}초")
+            log_event('search', status='error', admin_id=admin_id,
+                      start_date=str(start_date), end_date=str(end_date), days=days_diff,
+                      date_type=date_type, sale_type=sale_type, hotel_count=len(selected_hotel_ids),
+                      elapsed_ms=round(elapsed_time * 1000, 1), error=type(e).__name__)
             
             st.error(f"❌ 데이터 조회 중 오류가 발생했습니다: {e}")
             st.exception(e)
@@ -912,78 +860,8 @@ if should_show_result:
         if total_rows > 10:
             st.info(f"📊 상위 10개만 표시됩니다. 전체 데이터는 엑셀 다운로드를 이용하세요. (전체 {total_rows}개)")
         
-        # 데이터 포맷팅
-        display_df = df.copy()
-        
-        # 날짜 컬럼명 결정
-        date_col_name = '구매일(예약일)' if date_type == 'orderDate' else '이용일(체크인)'
-        
-        # 날짜 포맷팅
-        display_df['booking_date'] = pd.to_datetime(display_df['booking_date']).dt.strftime('%Y-%m-%d')
-        
-        # 컬럼명 한글화 및 순서 정리
-        column_mapping = {
-            'booking_date': date_col_name,
-            'hotel_name': '숙소명',
-            'channel_name': '채널명',
-            'sale_type': '판매유형',
-            'booking_count': '예약건수',
-            'total_rooms': '총객실수',
-            'confirmed_rooms': '확정객실수',
-            'cancelled_rooms': '취소객실수',
-            'cancellation_rate': '취소율',
-            'total_deposit': '총 입금가',
-            'total_purchase': '총 실구매가',
-            'total_profit': '총 수익',
-            'profit_rate': '수익률 (%)'
-        }
-        
-        # 존재하는 컬럼만 매핑
-        for old_col, new_col in column_mapping.items():
-            if old_col in display_df.columns:
-                display_df = display_df.rename(columns={old_col: new_col})
-        
-        # 컬럼 순서 정리
-        desired_order = [
-            date_col_name,
-            '숙소명',
-            '채널명',
-            '판매유형',
-            '예약건수',
-            '총객실수',
-            '확정객실수',
-            '취소객실수',
-            '취소율',
-            '총 입금가',
-            '총 실구매가',
-            '총 수익',
-            '수익률 (%)'
-        ]
-        
-        # 존재하는 컬럼만 선택
-        final_cols = [col for col in desired_order if col in display_df.columns]
-        display_df = display_df[final_cols]
-        
-        # 숫자 포맷팅 (천단위 구분, 숫자만 표시)
-        numeric_cols = ['예약건수', '총객실수', '확정객실수', '취소객실수', '총 입금가', '총 실구매가', '총 수익']
-        for col in numeric_cols:
-            if col in display_df.columns:
-                display_df[col] = display_df[col].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "0")
-        
-        # 취소율 포맷팅 (소수점 1자리, % 표시)
-        if '취소율' in display_df.columns:
-            display_df['취소율'] = display_df['취소율'].apply(
-                lambda x: f"{float(x):.1f}%" if pd.notna(x) else "0.0%"
-            )
-        
-        # 수익률 포맷팅 (소수점 1자리)
-        if '수익률 (%)' in display_df.columns:
-            display_df['수익률 (%)'] = display_df['수익률 (%)'].apply(
-                lambda x: f"{float(x):.1f}%" if pd.notna(x) else "0.0%"
-            )
-        
-        # 상위 10개만 표시
-        display_df_top10 = display_df.head(10)
+        # 데이터 포맷팅 (컬럼명 한글화/순서 정리 후 상위 10개만 표시 형식으로 변환)
+        display_df_top10 = display_frame(df, HOTEL_REPORT_COLUMNS, date_type, rows=10)
         
         st.dataframe(
             display_df_top10,
@@ -991,9 +869,12 @@ if should_show_result:
             hide_index=True
         )
         
-        # 엑셀 다운로드
+        # 다운로드 (엑셀 / 원본 데이터 CSV·Parquet)
         st.markdown("---")
-        st.subheader("💾 엑셀 다운로드")
+        st.subheader("💾 다운로드")
+        
+        export_formats = ['엑셀 (xlsx)', 'CSV (gzip)'] + (['Parquet'] if PYARROW_AVAILABLE else [])
+        export_format = st.radio("파일 형식", export_formats, horizontal=True, key='export_format')
         
         # date_type_display 재생성 (세션에서 가져온 경우를 대비)
         date_type_display_for_excel = {opt: get_date_type_display_name(opt) 
@@ -1006,34 +887,88 @@ if should_show_result:
             'date_type': date_type_display_for_excel.get(date_type, date_type)
         }
         
-        try:
-            # 로깅: 엑셀 다운로드 버튼 클릭 - 요청
-            log_access("INFO", "[ACTION] 엑셀 다운로드 버튼 클릭 - 요청", admin_id=admin_id)
+        if export_format == '엑셀 (xlsx)':
+            try:
+                # 로깅: 엑셀 다운로드 버튼 클릭 - 요청
+                log_access("INFO", "[ACTION] 엑셀 다운로드 버튼 클릭 - 요청", admin_id=admin_id)
+                export_start = time.time()
             
-            excel_data, filename = create_hotel_excel_download(
-                df=df,  # 전체 데이터 (엑셀에는 전체 포함)
-                summary_stats=summary_for_excel,
-                date_type=date_type
-            )
+                excel_data, filename = create_hotel_excel_download(
+                    df=df,  # 전체 데이터 (엑셀에는 전체 포함)
+                    summary_stats=summary_for_excel,
+                    date_type=date_type
+                )
             
-            # 파일 크기 계산 (KB 단위)
-            file_size_kb = len(excel_data) / 1024
+                # 파일 크기 계산 (KB 단위)
+                file_size_kb = len(excel_data) / 1024
             
-            st.download_button(
-                label="📥 엑셀 파일 다운로드",
-                data=excel_data,
-                file_name=filename,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
+                st.download_button(
+                    label="📥 엑셀 파일 다운로드",
+                    data=excel_data,
+                    file_name=filename,
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True
+                )
             
-            # 로깅: 엑셀 다운로드 버튼 클릭 - 성공
-            log_access("INFO", "[ACTION] 엑셀 다운로드 버튼 클릭 - 성공", admin_id=admin_id, 
-                      파일명=filename, 파일크기=f"{file_size_kb:.2f}KB")
-        except Exception as e:
-            # 에러 로깅: 엑셀 다운로드 버튼 클릭 - 실패
-            log_error("ERROR", "[ACTION] 엑셀 다운로드 버튼 클릭 - 실패", exception=e, admin_id=admin_id)
-            st.error(f"❌ 엑셀 다운로드 중 오류가 발생했습니다: {e}")
+                # 로깅: 엑셀 다운로드 버튼 클릭 - 성공
+                log_access("INFO", "[ACTION] 엑셀 다운로드 버튼 클릭 - 성공", admin_id=admin_id, 
+                          파일명=filename, 파일크기=f"{file_size_kb:.2f}KB")
+                log_event('excel_download', admin_id=admin_id, days=days_diff, rows=len(df),
+                          bytes=len(excel_data), elapsed_ms=round((time.time() - export_start) * 1000, 1))
+            except Exception as e:
+                # 에러 로깅: 엑셀 다운로드 버튼 클릭 - 실패
+                log_error("ERROR", "[ACTION] 엑셀 다운로드 버튼 클릭 - 실패", exception=e, admin_id=admin_id)
+                log_event('excel_download', status='error', admin_id=admin_id, days=days_diff,
+                          error=type(e).__name__)
+                st.error(f"❌ 엑셀 다운로드 중 오류가 발생했습니다: {e}")
+        else:
+            # 원본 데이터는 버튼을 누를 때만 DB에서 구간별로 읽어 바로 기록 (전체 DataFrame 미생성)
+            hotel_ids_for_export = (st.session_state.last_search_result or {}).get('selected_hotel_ids')
+            export_key = (export_format, str(start_date), str(end_date), date_type, sale_type,
+                          tuple(hotel_ids_for_export or []))
+            prepared = st.session_state.get('raw_export')
+            
+            if st.button("📦 파일 생성", use_container_width=True):
+                try:
+                    # 로깅: 원본 데이터 파일 생성 - 요청
+                    log_access("INFO", "[ACTION] 원본 데이터 파일 생성 - 요청", admin_id=admin_id, 형식=export_format)
+                    export_start = time.time()
+                    
+                    with st.spinner("🔄 파일을 생성하는 중..."):
+                        chunks = iter_hotel_data(
+                            start_date=start_date,
+                            end_date=end_date,
+                            selected_hotel_ids=hotel_ids_for_export,
+                            date_type=date_type,
+                            sale_type=sale_type
+                        )
+                        create_download = create_hotel_csv_download if export_format == 'CSV (gzip)' else create_hotel_parquet_download
+                        raw_data, raw_filename = create_download(chunks, date_type=date_type)
+                    
+                    prepared = {'key': export_key, 'data': raw_data, 'filename': raw_filename}
+                    st.session_state.raw_export = prepared
+                    
+                    # 로깅: 원본 데이터 파일 생성 - 성공
+                    log_access("INFO", "[ACTION] 원본 데이터 파일 생성 - 성공", admin_id=admin_id,
+                              파일명=raw_filename, 파일크기=f"{len(raw_data) / 1024:.2f}KB")
+                    log_event('raw_export', admin_id=admin_id, format=export_format, days=days_diff,
+                              bytes=len(raw_data), elapsed_ms=round((time.time() - export_start) * 1000, 1))
+                except Exception as e:
+                    # 에러 로깅: 원본 데이터 파일 생성 - 실패
+                    log_error("ERROR", "[ACTION] 원본 데이터 파일 생성 - 실패", exception=e, admin_id=admin_id)
+                    log_event('raw_export', status='error', admin_id=admin_id, format=export_format,
+                              days=days_diff, error=type(e).__name__)
+                    st.error(f"❌ 파일 생성 중 오류가 발생했습니다: {e}")
+            
+            # 현재 조회 조건/형식으로 생성한 파일만 다운로드 버튼 표시
+            if prepared and prepared['key'] == export_key:
+                st.download_button(
+                    label="📥 파일 다운로드",
+                    data=prepared['data'],
+                    file_name=prepared['filename'],
+                    mime="application/octet-stream",
+                    use_container_width=True
+                )
         
         # 사용안내 (엑셀 다운로드 하단에 위치)
         st.markdown("---")
@@ -0,0 +1,151 @@
+# benchmark/excel_memory.py
+"""엑셀 생성 메모리/시간 벤치마크
+- 숙소별 보고서 형태(날짜 × 숙소 × 채널)의 합성 DataFrame을 행 수별로 생성
+- pd.ExcelWriter 경로(standard)와 write-only 스트리밍 경로(streaming)를 각각 별도 프로세스에서 실행
+- 엑셀 생성 구간의 최대 RSS 증가량, 소요 시간, 파일 크기를 JSON으로 저장
+  (Linux는 /proc/self/clear_refs로 최대 RSS 기록을 초기화, 그 외 환경은 tracemalloc 최대 할당량)
+
+사용법:
+    python benchmark/excel_memory.py
+    python benchmark/excel_memory.py --rows 10000,100000,500000 --output excel_memory.json
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import gc
+import json
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+MODES = ('standard', 'streaming')
+
+
+def report_frame(rows, seed=7):
+    """fetch_hotel_data 결과와 같은 컬럼의 합성 DataFrame"""
+    rng = np.random.default_rng(seed)
+    hotels = np.array([f'숙소 {i}' for i in range(5000)], dtype=object)
+    deposit = rng.integers(0, 5_000_000, rows)
+    purchase = (deposit * rng.uniform(0.9, 1.3, rows)).astype(int)
+    hotel_pos = rng.integers(0, len(hotels), rows)
+    return pd.DataFrame({
+        'booking_date': pd.to_datetime('2025-01-01') + pd.to_timedelta(rng.integers(0, 90, rows), unit='D'),
+        'hotel_name': hotels[hotel_pos],
+        'hotel_idx': hotel_pos + 1,
+        'hotel_code': [f'H{i:06d}' for i in hotel_pos],
+        'channel_name': rng.choice(['익스피디아', '호텔베드', '다보', '아고다', '트립닷컴'], rows),
+        'channel_idx': rng.integers(10, 20, rows),
+        'channel_code': rng.choice(['expedia', 'hotelbeds', 'dabo'], rows),
+        'sale_type': rng.choice(['b2c', 'b2b', ''], rows),
+        'booking_count': rng.integers(1, 20, rows),
+        'order_count': rng.integers(0, 20, rows),
+        'total_rooms': rng.integers(0, 60, rows),
+        'confirmed_rooms': rng.integers(0, 50, rows),
+        'cancelled_rooms': rng.integers(0, 10, rows),
+        'cancellation_rate': rng.uniform(0, 100, rows).round(1),
+        'total_deposit': deposit,
+        'total_purchase': purchase,
+        'total_profit': purchase - deposit,
+        'profit_rate': rng.uniform(-20, 60, rows).round(1),
+    })
+
+
+def _proc_status_kb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _reset_peak_rss():
+    """최대 RSS(VmHWM)를 현재 RSS로 초기화 (Linux 전용, 실패하면 False)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def run_child(mode, rows):
+    """한 프로세스에서 한 가지 경로만 측정 (최대 RSS는 프로세스 단위로만 알 수 있음)"""
+    from utils.excel_handler_hotel import create_hotel_excel_file
+
+    df = report_frame(rows)
+    summary = {'total_bookings': int(df['booking_count'].sum()), 'total_revenue': float(df['total_deposit'].sum()),
+               'hotel_count': int(df['hotel_idx'].nunique()), 'start_date': '2025-01-01',
+               'end_date': '2025-03-31', 'date_type': '구매일'}
+    gc.collect()
+
+    use_rss = _reset_peak_rss()
+    if use_rss:
+        baseline = _proc_status_kb('VmRSS')
+    else:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    output = create_hotel_excel_file(df, summary, '구매일', 'orderDate', streaming=(mode == 'streaming'))
+    elapsed = time.perf_counter() - started
+
+    if use_rss:
+        peak = (_proc_status_kb('VmHWM') - baseline) * 1024
+        measure = 'peak_rss_delta'
+    else:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        measure = 'tracemalloc_peak'
+
+    return {
+        'mode': mode,
+        'rows': rows,
+        'elapsed_s': elapsed,
+        'peak_mb': peak / 1024 / 1024,
+        'measure': measure,
+        'file_mb': len(output.getvalue()) / 1024 / 1024
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='엑셀 생성 메모리/시간 벤치마크')
+    parser.add_argument('--rows', default='10000,100000,500000', help='행 수 (쉼표 구분)')
+    parser.add_argument('--modes', default=','.join(MODES), help='측정 경로 (standard,streaming)')
+    parser.add_argument('--output', help='결과 JSON 경로')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(args.child[0], int(args.child[1]))))
+        return None
+
+    results = []
+    for rows in [int(r) for r in args.rows.split(',') if r.strip()]:
+        for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', mode, str(rows)],
+                capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                print(f"❌ {mode} {rows:,}행 실패: {completed.stderr.strip()[-500:]}")
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(f"  {mode:<10} {rows:>9,}행  {result['elapsed_s']:7.2f}s  "
+                  f"메모리 +{result['peak_mb']:8.1f}MB  파일 {result['file_mb']:6.1f}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
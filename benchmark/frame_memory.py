@@ -0,0 +1,64 @@
+# benchmark/frame_memory.py
+"""조회 결과 DataFrame 메모리 비교
+- 90일 숙소별 조회 결과 형태(날짜 × 숙소 × 채널)의 합성 DataFrame을 행 수별로 생성
+- 기존 타입(라벨 object, 정수 int64)과 HOTEL_DATA_SCHEMA 적용 후 메모리(memory_usage deep)를 비교
+- 컬럼별 크기를 함께 출력하고 --output이면 JSON으로 저장
+
+사용법:
+    python benchmark/frame_memory.py
+    python benchmark/frame_memory.py --rows 100000,500000 --output frame_memory.json
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+
+from benchmark.excel_memory import report_frame
+from utils.frame_schema import HOTEL_DATA_SCHEMA, apply_schema
+
+
+def _column_bytes(df):
+    return {col: int(size) for col, size in df.memory_usage(index=False, deep=True).items()}
+
+
+def measure(rows):
+    """행 수별 변환 전/후 컬럼별 메모리 (bytes)"""
+    before = report_frame(rows)
+    before_columns = _column_bytes(before)
+    after_columns = _column_bytes(apply_schema(before.copy(), HOTEL_DATA_SCHEMA))
+    return {
+        'rows': rows,
+        'before_mb': sum(before_columns.values()) / 1024 / 1024,
+        'after_mb': sum(after_columns.values()) / 1024 / 1024,
+        'columns': {col: {'before': before_columns[col], 'after': after_columns[col]} for col in before_columns}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='조회 결과 DataFrame 메모리 비교')
+    parser.add_argument('--rows', default='100000,500000', help='행 수 (쉼표 구분)')
+    parser.add_argument('--output', help='결과 JSON 경로')
+    args = parser.parse_args(argv)
+
+    results = []
+    for rows in [int(r) for r in args.rows.split(',') if r.strip()]:
+        result = measure(rows)
+        results.append(result)
+        print(f"\n📊 {rows:,}행  {result['before_mb']:.1f}MB → {result['after_mb']:.1f}MB "
+              f"({result['after_mb'] / result['before_mb'] * 100:.0f}%)")
+        for col, size in result['columns'].items():
+            print(f"  {col:<18} {size['before'] / 1024 / 1024:8.2f}MB → {size['after'] / 1024 / 1024:8.2f}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
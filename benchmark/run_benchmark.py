@@ -0,0 +1,318 @@
+# benchmark/run_benchmark.py
+"""오프라인 벤치마크 실행 스크립트
+- 합성 예약 데이터를 로컬 SQLite 파일에 적재 (DATABASE_URL로 get_db_connection 대상 교체)
+- utils 쿼리 빌더/조회 함수, 숙소 검색, 엑셀 생성 함수를 7/30/90일 기간별로 시간 측정
+- 결과를 JSON으로 저장하고, 이전 결과 파일과 비교 출력
+
+사용법:
+    python benchmark/run_benchmark.py
+    python benchmark/run_benchmark.py --orders 100000 --skew 1.3 --ranges 7,30,90,180
+    python benchmark/run_benchmark.py --reuse-db --compare benchmark/results/bench_abc1234_20250101_120000.json
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import sqlalchemy
+
+from benchmark.synthetic_data import generate_dataset, write_database, install_mysql_compat
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_benchmark_dir = os.path.join(_project_root, 'benchmark')
+
+DEFAULT_DB_PATH = os.path.join(_benchmark_dir, '.data', 'bench.db')
+DEFAULT_RESULTS_DIR = os.path.join(_benchmark_dir, 'results')
+
+
+def _load_module(name, filename):
+    """점이 있는 파일명의 utils 모듈 로드 (이미 로드되어 있으면 재사용)"""
+    if name in sys.modules:
+        return sys.modules[name]
+    path = os.path.join(_project_root, 'utils', filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _git_commit():
+    """현재 커밋 (git이 없으면 None)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=_project_root,
+            capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _size_of(result):
+    """결과 크기 (DataFrame 행 수, bytes 길이, list/dict 길이)"""
+    if isinstance(result, pd.DataFrame):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], (bytes, bytearray)):
+        return len(result[0])
+    if isinstance(result, (list, dict, bytes)):
+        return len(result)
+    return None
+
+
+def _measure(fn, repeat, before=None):
+    """fn을 repeat번 실행한 시간(초) 목록과 마지막 결과"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        if before:
+            before()
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+
+def _record(results, name, group, range_days, date_type, timings, result):
+    entry = {
+        'name': name,
+        'group': group,
+        'range_days': range_days,
+        'date_type': date_type,
+        'repeat': len(timings),
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'size': _size_of(result)
+    }
+    results.append(entry)
+    label = f"{name} [{range_days}일, {date_type}]" if range_days else name
+    print(f"  {label:<60} median {entry['median_s'] * 1000:9.1f}ms  size={entry['size']}")
+    return entry
+
+
+def prepare_database(db_path, orders, days, products, skew, seed, reuse=False):
+    """합성 DB 생성 (reuse=True이고 파일이 있으면 그대로 사용)"""
+    if reuse and os.path.exists(db_path):
+        print(f"📂 기존 합성 DB 사용: {db_path}")
+        return None
+
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    print(f"🛠️ 합성 데이터 생성 중... (주문 {orders:,}건, {days}일, 숙소 {products:,}개, skew={skew})")
+    started = time.perf_counter()
+    dataset = generate_dataset(orders=orders, days=days, products=products, skew=skew, seed=seed)
+    counts = write_database(db_path, dataset)
+    print(f"✅ 합성 DB 생성 완료 ({time.perf_counter() - started:.1f}초): {counts}")
+    return counts
+
+
+def run(db_path, ranges=(7, 30, 90), date_types=('orderDate',), repeat=3, exports=True):
+    """
+    벤치마크 실행
+
+    Returns:
+        list: 측정 결과 dict 목록
+    """
+    # get_db_connection이 합성 DB를 사용하도록 설정 (모듈 import 전에 설정)
+    os.environ['DATABASE_URL'] = f"sqlite:///{db_path}"
+
+    from config.configdb import get_db_connection
+    from utils import result_cache
+    from utils.dimension_cache import clear_dimension_cache
+
+    engine = get_db_connection()
+    install_mysql_compat(engine)
+
+    # 결과 캐시를 끄고 매번 DB 조회 시간을 측정
+    result_cache.RESULT_CACHE_ENABLED = False
+
+    query_builder_v1_5 = _load_module('query_builder_v1_5', 'query_builder_v1.5.py')
+    data_fetcher_v1_5 = _load_module('data_fetcher_v1_5', 'data_fetcher_v1.5.py')
+    excel_handler_v1_5 = _load_module('excel_handler_v1_5', 'excel_handler_v1.5.py')
+    from utils import query_builder_hotel, data_fetcher_hotel, excel_handler_hotel, hotel_search
+
+    # 예약이 많은 숙소 20개 / 예약이 가장 많은 채널 (선택 필터 조회용)
+    top_hotels = pd.read_sql(
+        "SELECT product_idx FROM order_product GROUP BY product_idx ORDER BY COUNT(*) DESC LIMIT 20", engine
+    )['product_idx'].tolist()
+    top_channel = pd.read_sql(
+        "SELECT cc.code_name FROM order_product op JOIN common_code cc "
+        "ON cc.code_id = op.order_channel_idx AND cc.parent_idx = 1 "
+        "GROUP BY cc.code_name ORDER BY COUNT(*) DESC LIMIT 1", engine
+    )['code_name'].tolist()
+
+    results = []
+    end_date = date.today() - timedelta(days=1)
+
+    for range_days in ranges:
+        start_date = end_date - timedelta(days=range_days - 1)
+        for date_type in date_types:
+            print(f"\n⏱️ 기간 {range_days}일 ({start_date} ~ {end_date}, {date_type})")
+
+            builders = {
+                'build_integrated_query': lambda: query_builder_v1_5.build_integrated_query(
+                    start_date, end_date, None, date_type),
+                'build_summary_query': lambda: query_builder_v1_5.build_summary_query(
+                    start_date, end_date, date_type),
+                'build_daily_trend_query': lambda: query_builder_v1_5.build_daily_trend_query(
+                    start_date, end_date, date_type),
+                'build_channel_performance_query': lambda: query_builder_v1_5.build_channel_performance_query(
+                    start_date, end_date, date_type),
+                'build_hotel_statistics_query': lambda: query_builder_hotel.build_hotel_statistics_query(
+                    start_date, end_date, top_hotels, date_type),
+                'build_hotel_summary_query': lambda: query_builder_hotel.build_hotel_summary_query(
+                    start_date, end_date, top_hotels, date_type),
+            }
+            for name, fn in builders.items():
+                timings, _ = _measure(fn, repeat)
+                _record(results, name, 'builder', range_days, date_type, timings, None)
+
+            fetchers = {
+                'fetch_channel_data': lambda: data_fetcher_v1_5.fetch_channel_data(
+                    start_date, end_date, None, date_type),
+                'fetch_channel_data[1채널]': lambda: data_fetcher_v1_5.fetch_channel_data(
+                    start_date, end_date, top_channel, date_type),
+                'fetch_summary_stats': lambda: data_fetcher_v1_5.fetch_summary_stats(
+                    start_date, end_date, date_type),
+                'fetch_daily_trend': lambda: data_fetcher_v1_5.fetch_daily_trend(
+                    start_date, end_date, date_type),
+                'fetch_channel_performance': lambda: data_fetcher_v1_5.fetch_channel_performance(
+                    start_date, end_date, date_type),
+                'fetch_hotel_data': lambda: data_fetcher_hotel.fetch_hotel_data(
+                    start_date, end_date, top_hotels, date_type),
+                'fetch_hotel_summary_stats': lambda: data_fetcher_hotel.fetch_hotel_summary_stats(
+                    start_date, end_date, top_hotels, date_type),
+            }
+            fetched = {}
+            for name, fn in fetchers.items():
+                # 라벨 캐시도 비워서 매 회 조회 전체 비용 측정
+                timings, fetched[name] = _measure(fn, repeat, before=clear_dimension_cache)
+                _record(results, name, 'fetcher', range_days, date_type, timings, fetched[name])
+
+            if not exports:
+                continue
+
+            channel_df = fetched['fetch_channel_data']
+            hotel_df = fetched['fetch_hotel_data']
+            summary = {
+                **data_fetcher_v1_5.summarize_channel_data(channel_df),
+                'start_date': str(start_date), 'end_date': str(end_date), 'date_type': date_type
+            }
+            hotel_summary = {
+                **data_fetcher_hotel.summarize_hotel_data(hotel_df),
+                'start_date': str(start_date), 'end_date': str(end_date), 'date_type': date_type
+            }
+            exporters = {
+                'create_excel_download': lambda: excel_handler_v1_5.create_excel_download(
+                    channel_df, summary, date_type=date_type),
+                'create_hotel_excel_download': lambda: excel_handler_hotel.create_hotel_excel_download(
+                    hotel_df, hotel_summary, date_type=date_type),
+            }
+            for name, fn in exporters.items():
+                timings, result = _measure(fn, repeat)
+                _record(results, name, 'export', range_days, date_type, timings, result)
+
+    # 기간과 무관한 조회
+    print("\n⏱️ 기간 무관")
+    for name, fn in {
+        'search_hotels': lambda: hotel_search.search_hotels('호텔 1'),
+        'fetch_channel_list': data_fetcher_v1_5.fetch_channel_list,
+    }.items():
+        timings, result = _measure(fn, repeat, before=clear_dimension_cache)
+        _record(results, name, 'fetcher', None, None, timings, result)
+
+    return results
+
+
+def compare(previous, current):
+    """이전 결과와 중앙값 비교 출력"""
+    def _key(entry):
+        return (entry['name'], entry['range_days'], entry['date_type'])
+
+    before = {_key(e): e for e in previous.get('results', [])}
+    print(f"\n📊 비교: {previous.get('meta', {}).get('commit')} -> {current['meta'].get('commit')}")
+    for entry in current['results']:
+        old = before.get(_key(entry))
+        if not old or not old['median_s']:
+            continue
+        ratio = entry['median_s'] / old['median_s']
+        mark = '🔺' if ratio > 1.1 else ('🔻' if ratio < 0.9 else '  ')
+        label = f"{entry['name']} [{entry['range_days']}일]" if entry['range_days'] else entry['name']
+        print(f"  {mark} {label:<55} {old['median_s'] * 1000:9.1f}ms -> {entry['median_s'] * 1000:9.1f}ms "
+              f"(x{ratio:.2f})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='합성 DB 기반 오프라인 벤치마크')
+    parser.add_argument('--orders', type=int, default=20000, help='주문번호 수')
+    parser.add_argument('--days', type=int, default=120, help='주문 생성 기간 (일)')
+    parser.add_argument('--products', type=int, default=2000, help='숙소 수')
+    parser.add_argument('--skew', type=float, default=1.1, help='채널/숙소 인기도 편중 (Zipf 지수)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='합성 SQLite 파일 경로')
+    parser.add_argument('--reuse-db', action='store_true', help='합성 DB 파일이 있으면 다시 만들지 않음')
+    parser.add_argument('--ranges', default='7,30,90', help='조회 기간 (일, 쉼표 구분)')
+    parser.add_argument('--date-types', default='orderDate', help='날짜유형 (orderDate,useDate)')
+    parser.add_argument('--repeat', type=int, default=3, help='항목별 반복 횟수')
+    parser.add_argument('--no-export', action='store_true', help='엑셀 생성 측정 제외')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmark/results/bench_<커밋>_<시각>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    args = parser.parse_args(argv)
+
+    counts = prepare_database(args.db, args.orders, args.days, args.products, args.skew, args.seed,
+                              reuse=args.reuse_db)
+
+    started = time.perf_counter()
+    results = run(
+        args.db,
+        ranges=[int(r) for r in args.ranges.split(',') if r.strip()],
+        date_types=[d.strip() for d in args.date_types.split(',') if d.strip()],
+        repeat=args.repeat,
+        exports=not args.no_export
+    )
+
+    commit = _git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_s': time.perf_counter() - started,
+            'dataset': {
+                'orders': args.orders, 'days': args.days, 'products': args.products,
+                'skew': args.skew, 'seed': args.seed, 'db': args.db, 'tables': counts
+            },
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'sqlalchemy': sqlalchemy.__version__
+        },
+        'results': results
+    }
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"bench_{commit or 'nocommit'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
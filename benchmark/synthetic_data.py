@@ -0,0 +1,218 @@
+# benchmark/synthetic_data.py
+"""합성 예약 데이터 생성 모듈 (벤치마크용)
+- order_product, order_item, order_pay, product, product_rateplan, common_code, tblmanager
+- 채널/숙소 인기도는 Zipf 분포(skew)로 편중, 요일별 예약량 차이, 주문당 1~3개 상품
+- 로컬 SQLite 파일에 적재하고 MySQL 전용 문법을 SQLite에서 실행 가능하도록 변환
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import re
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, event
+
+from config.order_status_mapping import ORDER_STATUS_GROUPS
+
+# 채널 (common_code code_id, order_type, 채널명)
+CHANNELS = [
+    (10, 'expedia', '익스피디아'),
+    (11, 'expediab2b', '익스피디아 B2B'),
+    (12, 'hotelbeds', '호텔베드'),
+    (13, 'dabo', '다보'),
+    (14, 'nuuaapi', '누아'),
+    (15, 'hiot', '하이오티'),
+    (16, 'agoda', '아고다'),
+    (17, 'trip', '트립닷컴'),
+    (18, 'booking', '부킹닷컴'),
+    (19, 'direct', '직판'),
+]
+
+# 조회 쿼리에서 사용하는 인덱스 (운영 DB와 유사하게 구성)
+INDEXES = [
+    ('ix_op_create_date', 'order_product', 'create_date'),
+    ('ix_op_checkin_date', 'order_product', 'checkin_date'),
+    ('ix_op_product_idx', 'order_product', 'product_idx'),
+    ('ix_op_order_num', 'order_product', 'order_num'),
+    ('ix_oi_order_product_idx', 'order_item', 'order_product_idx'),
+    ('ix_opay_idx', 'order_pay', 'idx'),
+    ('ix_product_idx', 'product', 'idx'),
+    ('ix_rateplan_idx', 'product_rateplan', 'idx'),
+    ('ix_common_code_parent', 'common_code', 'parent_idx'),
+    ('ix_tblmanager_admin_id', 'tblmanager', 'admin_id'),
+]
+
+_GROUP_CONCAT_RE = re.compile(r"GROUP_CONCAT\(DISTINCT ([\w.]+) ORDER BY [\w.]+ SEPARATOR ', '\)")
+_DATE_SHIFT_RE = re.compile(r"DATE_(SUB|ADD)\(CURDATE\(\), INTERVAL (\d+) DAY\)")
+
+
+def _zipf_weights(n, skew):
+    """순위 기반 Zipf 가중치 (skew=0이면 균등)"""
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def generate_dataset(orders=20000, days=120, products=2000, skew=1.1, seed=42, today=None):
+    """
+    합성 예약 데이터 생성
+
+    Args:
+        orders: 주문번호 수
+        days: 오늘 이전 몇 일에 걸쳐 주문을 생성할지
+        products: 숙소 수
+        skew: 채널/숙소 인기도 편중 정도 (Zipf 지수, 0이면 균등)
+        seed: 난수 시드
+        today: 기준일 (None이면 오늘)
+
+    Returns:
+        dict: {테이블명: DataFrame}
+    """
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+    start = datetime.combine(today - timedelta(days=days), datetime.min.time())
+
+    # 숙소 / 요금제 / 공통코드 / 관리자
+    product = pd.DataFrame({
+        'idx': np.arange(1, products + 1),
+        'product_code': [f'H{i:06d}' for i in range(1, products + 1)],
+        'name_kr': [f'{city} 호텔 {i}' for i, city in zip(
+            range(1, products + 1), rng.choice(['서울', '부산', '제주', '도쿄', '오사카', '방콕'], products))],
+        'reg_date': [(start - timedelta(days=int(d))).strftime('%Y-%m-%d %H:%M:%S')
+                     for d in rng.integers(-days, 1500, products)],
+    })
+    rateplans = products * 2
+    product_rateplan = pd.DataFrame({
+        'idx': np.arange(1, rateplans + 1),
+        'product_idx': np.repeat(np.arange(1, products + 1), 2),
+        'sale_type': rng.choice(['b2c', 'b2b', None], rateplans, p=[0.6, 0.3, 0.1]),
+    })
+    common_code = pd.DataFrame(
+        [{'idx': i + 1, 'parent_idx': 1, 'code_id': code_id, 'code_name': name}
+         for i, (code_id, _, name) in enumerate(CHANNELS)]
+        + [{'idx': 100, 'parent_idx': 2, 'code_id': 900, 'code_name': '기타 그룹'}]
+    )
+    tblmanager = pd.DataFrame({
+        'admin_id': [f'admin{i}' for i in range(1, 21)],
+        'passwd': [hashlib.sha256(f'password{i}'.encode()).hexdigest() for i in range(1, 21)],
+        'user_status': ['1'] * 18 + ['0'] * 2,
+    })
+
+    # 주문 생성 시각: 요일별 가중치 (주말 적음) + 하루 중 임의 시각
+    day_offsets = np.arange(days)
+    weekday = np.array([(start + timedelta(days=int(d))).weekday() for d in day_offsets])
+    day_weights = np.where(weekday >= 5, 0.7, 1.0)
+    order_day = rng.choice(day_offsets, orders, p=day_weights / day_weights.sum())
+    created = pd.to_datetime(start) + pd.to_timedelta(order_day, unit='D') \
+        + pd.to_timedelta(rng.integers(0, 24 * 3600, orders), unit='s')
+
+    channel_pos = rng.choice(len(CHANNELS), orders, p=_zipf_weights(len(CHANNELS), skew))
+    # common_code에 없는 채널(order_type으로 표시)도 일부 포함
+    channel_idx = np.array([CHANNELS[p][0] for p in channel_pos])
+    channel_idx[rng.random(orders) < 0.02] = 99
+    order_type = np.array([CHANNELS[p][1] for p in channel_pos])
+    lead_days = rng.exponential(20, orders).astype(int)
+
+    # 주문당 상품 수 (1~3), 상품 행 전개
+    items_per_order = rng.choice([1, 2, 3], orders, p=[0.75, 0.2, 0.05])
+    order_pos = np.repeat(np.arange(orders), items_per_order)
+    rows = len(order_pos)
+
+    product_idx = rng.choice(np.arange(1, products + 1), rows, p=_zipf_weights(products, skew))
+    terms = rng.choice([1, 1, 1, 2, 2, 3, 4, 7], rows)
+    room_cnt = rng.choice([1, 1, 1, 1, 2, 3], rows)
+    checkin = (created[order_pos].normalize() + pd.to_timedelta(lead_days[order_pos], unit='D'))
+    all_statuses = ORDER_STATUS_GROUPS['확정'] + ORDER_STATUS_GROUPS['취소']
+    status_weights = np.array([0.05, 0.25, 0.4, 0.02, 0.02, 0.01, 0.05] + [0.14, 0.02, 0.01, 0.01, 0.02])
+    status = rng.choice(all_statuses, rows, p=status_weights / status_weights.sum())
+
+    op_idx = np.arange(1, rows + 1)
+    has_pay = rng.random(rows) < 0.95
+    order_product = pd.DataFrame({
+        'idx': op_idx,
+        'order_num': [f'ORD{n:08d}' for n in order_pos],
+        'order_type': order_type[order_pos],
+        'order_channel_idx': channel_idx[order_pos],
+        'order_product_status': status,
+        'create_date': created[order_pos].strftime('%Y-%m-%d %H:%M:%S'),
+        'update_date': created[order_pos].strftime('%Y-%m-%d %H:%M:%S'),
+        'checkin_date': checkin.strftime('%Y-%m-%d'),
+        'terms': terms,
+        'room_cnt': room_cnt,
+        'product_idx': product_idx,
+        'product_name': product['name_kr'].values[product_idx - 1],
+        'rateplan_idx': (product_idx - 1) * 2 + 1 + rng.integers(0, 2, rows),
+        'order_pay_idx': np.where(has_pay, op_idx, None),
+    })
+
+    # 숙박일수만큼 order_item (1박당 입금가)
+    base_price = rng.integers(50, 400, rows) * 1000
+    item_pos = np.repeat(np.arange(rows), terms)
+    order_item = pd.DataFrame({
+        'idx': np.arange(1, len(item_pos) + 1),
+        'order_product_idx': op_idx[item_pos],
+        'due_price': (base_price[item_pos] * rng.uniform(0.9, 1.1, len(item_pos))).round(-2),
+    })
+
+    # 실구매가 = 입금가 합계 * 객실 수 * 마진
+    margin = rng.uniform(1.02, 1.25, rows)
+    order_pay = pd.DataFrame({
+        'idx': op_idx[has_pay],
+        'total_amount': (base_price * terms * room_cnt * margin)[has_pay].round(-2),
+    })
+
+    return {
+        'common_code': common_code,
+        'product': product,
+        'product_rateplan': product_rateplan,
+        'order_product': order_product,
+        'order_item': order_item,
+        'order_pay': order_pay,
+        'tblmanager': tblmanager,
+    }
+
+
+def mysql_to_sqlite(conn, cursor, statement, parameters, context, executemany):
+    """MySQL 전용 문법을 SQLite에서 실행 가능한 형태로 변환 (before_cursor_execute)"""
+    statement = _GROUP_CONCAT_RE.sub(r"GROUP_CONCAT(DISTINCT \1)", statement)
+    statement = _DATE_SHIFT_RE.sub(
+        lambda m: f"DATE(CURDATE(), '{'-' if m.group(1) == 'SUB' else '+'}{m.group(2)} day')", statement
+    )
+    # pymysql 형식(%s) 위치 파라미터
+    if isinstance(parameters, (tuple, list)) and '%s' in statement:
+        statement = statement.replace('%s', '?')
+    return statement, parameters
+
+
+def install_mysql_compat(engine, today=None):
+    """SQLite 엔진에 CURDATE() 함수와 MySQL 문법 변환 등록 (첫 연결 생성 전에 호출)"""
+    today = today or date.today()
+
+    @event.listens_for(engine, 'connect')
+    def _register_functions(dbapi_conn, _):
+        dbapi_conn.create_function('CURDATE', 0, lambda: today.isoformat())
+
+    event.listen(engine, 'before_cursor_execute', mysql_to_sqlite, retval=True)
+    return engine
+
+
+def write_database(path, dataset):
+    """합성 데이터를 SQLite 파일로 저장 (기존 파일은 교체)"""
+    if os.path.exists(path):
+        os.remove(path)
+
+    engine = create_engine(f'sqlite:///{path}')
+    for table, df in dataset.items():
+        df.to_sql(table, engine, index=False, chunksize=50000)
+
+    with engine.begin() as conn:
+        for name, table, column in INDEXES:
+            conn.exec_driver_sql(f"CREATE INDEX {name} ON {table} ({column})")
+    engine.dispose()
+
+    return {table: len(df) for table, df in dataset.items()}
@@ -2,8 +2,11 @@
 """데이터베이스 연결 설정 및 테스트"""
 
 import os
+import threading
+import time
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
 import pandas as pd
 import pymysql
 
@@ -31,6 +34,58 @@ else:
 # SSH 터널 전역 변수 (프로세스 종료 시 정리)
 _ssh_tunnel = None
 
+# 커넥션 풀 설정 (.env에서 조정 가능)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))        # 상시 유지 연결 수
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))  # 풀 초과 시 추가 허용 연결 수
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))  # 연결 대기 최대 시간 (초)
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))  # 연결 재활용 주기 (초)
+
+# 프로세스 전역 엔진 레지스트리 (연결 문자열 -> Engine)
+_engines = {}
+_engine_lock = threading.Lock()
+_active_url = None
+
+
+class _TimedQueuePool(QueuePool):
+    """연결 체크아웃 대기시간을 기록하는 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.wait_stats = {
+            'checkouts': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0,
+            'timeouts': 0
+        }
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.wait_stats['checkouts'] += 1
+                self.wait_stats['total_wait'] += waited
+                self.wait_stats['max_wait'] = max(self.wait_stats['max_wait'], waited)
+                if timed_out:
+                    self.wait_stats['timeouts'] += 1
+
+
+def _dispose_engines_after_fork():
+    """fork된 자식 프로세스에서 부모의 연결을 닫지 않고 풀만 버림"""
+    for engine in list(_engines.values()):
+        engine.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
 def _setup_ssh_tunnel():
     """SSH 터널 설정 (필요한 경우)"""
     global _ssh_tunnel
@@ -90,9 +145,15 @@ def _setup_ssh_tunnel():
         print("4. SSH 터널 없이 직접 연결을 시도하세요")
         return None
 
-def get_db_connection():
-    """데이터베이스 연결 객체 반환"""
-    global _ssh_tunnel
+def _build_connection_string():
+    """
+    현재 설정(SSH 터널 포함)에 맞는 MySQL 연결 문자열 생성
+    
+    DATABASE_URL이 설정되어 있으면 그대로 사용합니다 (벤치마크용 로컬 DB 등).
+    """
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        return database_url, False
     
     # SSH 터널 설정 (필요한 경우)
     tunnel = _setup_ssh_tunnel()
@@ -101,7 +162,6 @@ def get_db_connection():
     if tunnel:
         db_host = tunnel.local_bind_host
         db_port = tunnel.local_bind_port
-        print(f"📡 SSH 터널을 통해 DB 연결: {db_host}:{db_port}")
     else:
         # 직접 연결
         db_host = os.getenv('DB_HOST')
@@ -130,22 +190,111 @@ def get_db_connection():
     # 한글 처리를 위한 charset 추가
     connection_string += "?charset=utf8mb4"
     
-    try:
-        engine = create_engine(
-            connection_string,
-            pool_pre_ping=True,  # 연결 상태 자동 확인
-            pool_recycle=3600,   # 1시간마다 연결 재활용
-            echo=False,          # SQL 로그 출력 (디버깅시 True)
-            connect_args={
-                'connect_timeout': 30,  # 연결 타임아웃 30초
-                'read_timeout': 30,     # 읽기 타임아웃 30초
-                'write_timeout': 30     # 쓰기 타임아웃 30초
-            }
-        )
+    return connection_string, tunnel is not None
+
+def _create_pooled_engine(connection_string):
+    """프로세스 공유용 커넥션 풀 엔진 생성"""
+    if connection_string.startswith('mysql'):
+        connect_args = {
+            'connect_timeout': 30,  # 연결 타임아웃 30초
+            'read_timeout': 30,     # 읽기 타임아웃 30초
+            'write_timeout': 30     # 쓰기 타임아웃 30초
+        }
+    elif connection_string.startswith('sqlite'):
+        # 조회 작업 스레드에서 풀의 연결을 함께 사용
+        connect_args = {'check_same_thread': False}
+    else:
+        connect_args = {}
+    
+    return create_engine(
+        connection_string,
+        poolclass=_TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=True,         # 연결 상태 자동 확인
+        pool_recycle=DB_POOL_RECYCLE,  # 주기적으로 연결 재활용
+        echo=False,                 # SQL 로그 출력 (디버깅시 True)
+        connect_args=connect_args
+    )
+
+def get_db_connection():
+    """
+    데이터베이스 엔진 반환 (프로세스 전역 커넥션 풀 재사용)
+    
+    같은 연결 문자열에 대해서는 항상 동일한 Engine을 반환하므로
+    호출할 때마다 TCP/MySQL 핸드셰이크가 발생하지 않습니다.
+    SSH 터널이 재생성되어 로컬 포트가 바뀐 경우에만 새 엔진을 만들고
+    이전 엔진은 정리합니다.
+    """
+    global _active_url
+    
+    connection_string, via_tunnel = _build_connection_string()
+    
+    engine = _engines.get(connection_string)
+    if engine is not None:
+        return engine
+    
+    with _engine_lock:
+        engine = _engines.get(connection_string)
+        if engine is not None:
+            return engine
+        
+        try:
+            engine = _create_pooled_engine(connection_string)
+        except Exception as e:
+            print(f"❌ DB 연결 생성 실패: {e}")
+            raise
+        
+        if via_tunnel:
+            print(f"📡 SSH 터널을 통해 DB 연결: {engine.url.host}:{engine.url.port}")
+        
+        # 터널 재생성 등으로 대상이 바뀐 경우 이전 풀 정리
+        previous = _engines.pop(_active_url, None) if _active_url else None
+        if previous is not None:
+            previous.dispose()
+        
+        _engines[connection_string] = engine
+        _active_url = connection_string
         return engine
-    except Exception as e:
-        print(f"❌ DB 연결 생성 실패: {e}")
-        raise
+
+def get_pool_stats():
+    """
+    현재 사용 중인 커넥션 풀 통계 반환
+    
+    Returns:
+        dict: 풀 크기, 사용 중/대기 연결 수, overflow, 체크아웃 대기시간 통계
+              (엔진이 아직 생성되지 않았으면 빈 dict)
+    """
+    engine = _engines.get(_active_url) if _active_url else None
+    if engine is None:
+        return {}
+    
+    pool = engine.pool
+    wait_stats = dict(getattr(pool, 'wait_stats', {}))
+    checkouts = wait_stats.get('checkouts', 0)
+    
+    return {
+        'pool_size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'max_overflow': DB_MAX_OVERFLOW,
+        'checkouts': checkouts,
+        'timeouts': wait_stats.get('timeouts', 0),
+        'avg_wait_ms': (wait_stats.get('total_wait', 0.0) / checkouts * 1000) if checkouts else 0.0,
+        'max_wait_ms': wait_stats.get('max_wait', 0.0) * 1000
+    }
+
+def dispose_engines():
+    """모든 엔진의 커넥션 풀 정리 (프로세스 종료/설정 변경 시)"""
+    global _active_url
+    
+    with _engine_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _active_url = None
 
 def test_connection():
     """DB 연결 테스트"""
@@ -218,6 +367,12 @@ def test_connection():
             for idx, row in df_recent.iterrows():
                 print(f"    - {row['date']}: {row['count']:,}건")
         
+        # 5. 커넥션 풀 상태
+        pool_stats = get_pool_stats()
+        print(f"\n커넥션 풀: 사용중 {pool_stats.get('checked_out', 0)}개, "
+              f"대기 {pool_stats.get('checked_in', 0)}개 (pool_size={pool_stats.get('pool_size', 0)}, "
+              f"overflow={pool_stats.get('overflow', 0)}/{pool_stats.get('max_overflow', 0)})")
+        
         print("\n" + "="*50)
         print("🎉 DB 연결 테스트 완료!")
         print("="*50)
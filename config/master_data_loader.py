@@ -1,17 +1,296 @@
 # config/master_data_loader.py
-"""master_data.xlsx 파일 로더"""
+"""master_data.xlsx 파일 로더
+- 워크북을 한 번만 열어 필요한 시트(date_types, order_status, channels)를 모두 읽음
+- 읽은 매핑은 워크북 옆 JSON 파일(master_data.cache.json)에 워크북 수정시각/크기와 함께 저장하고,
+  다음 실행 시 워크북이 바뀌지 않았으면 JSON에서 바로 읽음 (openpyxl 파싱 생략)
+- 모든 조회 함수는 프로세스 메모리의 같은 스냅샷을 사용
+- 감시 스레드(start_master_data_watcher)가 워크북 변경을 확인하면 백그라운드에서 다시 읽어
+  스냅샷을 통째로 교체 (서비스 재시작 없이 반영, 읽기 실패 시 이전 스냅샷 유지)
+"""
 
-import pandas as pd
+import json
 import os
+import threading
+import time
+
+from openpyxl import load_workbook
 
 # 프로젝트 루트 디렉토리
 _current_dir = os.path.dirname(os.path.abspath(__file__))
 _project_root = os.path.dirname(_current_dir)
 _excel_path = os.path.join(_project_root, "master_data.xlsx")
 
-# 캐시 변수
-_date_types = None
-_order_statuses = None
+# 파싱 결과 JSON 저장 여부 (.env에서 조정 가능)
+MASTER_DATA_SIDECAR = os.getenv('MASTER_DATA_SIDECAR', 'true').lower() in ('1', 'true', 'yes')
+_SIDECAR_VERSION = 1
+
+# 워크북 변경 확인 주기 (초, 0이면 감시하지 않음)
+MASTER_DATA_POLL_SECONDS = float(os.getenv('MASTER_DATA_POLL_SECONDS', 30))
+
+# 시트별 (시트명, 키 컬럼, 값 컬럼)
+_SHEETS = {
+    'date_types': ('date_types', 'date_types_en', 'date_types_kr'),
+    'order_statuses': ('order_status', 'status_en', 'status_kr'),
+    'channels': ('channels', 'ID', 'channels'),
+}
+
+# 스냅샷 캐시 {'date_types', 'order_statuses', 'channel_id_to_name', 'channel_name_to_ids', 'meta'}
+# 교체는 참조 대입 한 번으로 하므로, 조회 중인 쪽은 항상 완성된 스냅샷 하나만 봄
+_snapshot = None
+_lock = threading.Lock()
+
+# 감시 스레드
+_watcher = None
+_watcher_stop = threading.Event()
+
+
+def _sidecar_path():
+    return os.path.splitext(_excel_path)[0] + '.cache.json'
+
+
+def _workbook_key():
+    """워크북 변경 확인용 (수정시각 ns, 크기), 파일이 없으면 None"""
+    try:
+        stat = os.stat(_excel_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _text(value):
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _read_pairs(workbook, sheet_name, key_col, value_col):
+    """시트에서 (키, 값) 목록 읽기 (헤더 1행, 빈 값이 있는 행은 제외)"""
+    if sheet_name not in workbook.sheetnames:
+        print(f"Warning: {sheet_name} sheet not found in {_excel_path}")
+        return []
+
+    rows = workbook[sheet_name].iter_rows(values_only=True)
+    header = [_text(name) for name in next(rows, ())]
+    if key_col not in header or value_col not in header:
+        print(f"Warning: {sheet_name} sheet columns: {header}")
+        print(f"Expected columns: ['{key_col}', '{value_col}']")
+        return []
+
+    key_pos, value_pos = header.index(key_col), header.index(value_col)
+    pairs = []
+    for row in rows:
+        key = row[key_pos] if key_pos < len(row) else None
+        value = _text(row[value_pos]) if value_pos < len(row) else None
+        if _text(key) and value:
+            pairs.append([key, value])
+    return pairs
+
+
+def _parse_workbook():
+    """워크북을 한 번 열어 모든 시트의 (키, 값) 목록을 읽음"""
+    workbook = load_workbook(_excel_path, read_only=True, data_only=True)
+    try:
+        sheets = {name: _read_pairs(workbook, *spec) for name, spec in _SHEETS.items()}
+    finally:
+        workbook.close()
+
+    sheets['date_types'] = [[_text(k), v] for k, v in sheets['date_types']]
+    sheets['order_statuses'] = [[_text(k), v] for k, v in sheets['order_statuses']]
+    channels = []
+    for channel_id, channel_name in sheets['channels']:
+        try:
+            channels.append([int(float(channel_id)), channel_name])
+        except (TypeError, ValueError):
+            print(f"Warning: invalid channel ID in channels sheet: {channel_id!r}")
+    sheets['channels'] = channels
+    return sheets
+
+
+def _read_sidecar(key):
+    """워크북 수정시각/크기가 같을 때만 JSON 저장본 반환"""
+    try:
+        with open(_sidecar_path(), encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('version') != _SIDECAR_VERSION or cached.get('workbook') != key:
+        return None
+    return cached.get('sheets')
+
+
+def _write_sidecar(key, sheets):
+    """JSON 저장 (임시 파일에 쓴 뒤 교체하므로 다른 프로세스가 쓰다 만 파일을 읽지 않음)"""
+    path = _sidecar_path()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': _SIDECAR_VERSION, 'workbook': key, 'sheets': sheets}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not write {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _build_snapshot(sheets, meta):
+    """(키, 값) 목록을 조회용 딕셔너리로 변환"""
+    channel_id_to_name = {}
+    channel_name_to_ids = {}
+    for channel_id, channel_name in sheets['channels']:
+        channel_id_to_name[channel_id] = channel_name
+        # 같은 이름이 여러 ID에 있을 수 있음
+        ids = channel_name_to_ids.setdefault(channel_name, [])
+        if channel_id not in ids:
+            ids.append(channel_id)
+
+    return {
+        'date_types': dict(sheets['date_types']),
+        'order_statuses': dict(sheets['order_statuses']),
+        'channel_id_to_name': channel_id_to_name,
+        'channel_name_to_ids': channel_name_to_ids,
+        'meta': meta,
+    }
+
+
+def _read_snapshot(key):
+    """JSON 저장본 또는 워크북에서 스냅샷 생성 (워크북 읽기 실패 시 예외 발생)"""
+    started = time.perf_counter()
+    sheets = _read_sidecar(key) if MASTER_DATA_SIDECAR else None
+    source = 'sidecar'
+    if sheets is None:
+        sheets = _parse_workbook()
+        source = 'workbook'
+        if MASTER_DATA_SIDECAR:
+            _write_sidecar(key, sheets)
+
+    snapshot = _build_snapshot(sheets, {
+        'workbook': key,
+        'source': source,
+        'load_seconds': time.perf_counter() - started,
+        'loaded_at': time.time(),
+    })
+    if not snapshot['date_types']:
+        print(f"Warning: No date types loaded from {_excel_path}")
+    return snapshot
+
+
+def _load_snapshot():
+    """최초 로드 (파일이 없거나 읽기 실패 시 빈 매핑)"""
+    empty = {name: [] for name in _SHEETS}
+    key = _workbook_key()
+    if key is None:
+        print(f"Warning: master_data.xlsx not found at {_excel_path}")
+        return _build_snapshot(empty, {'workbook': None, 'source': None, 'load_seconds': 0.0,
+                                       'loaded_at': time.time()})
+
+    try:
+        return _read_snapshot(key)
+    except Exception as e:
+        print(f"Warning: Could not load {_excel_path}: {e}")
+        import traceback
+        traceback.print_exc()
+        # 워크북 키를 비워 두어 감시 스레드가 다음 확인 때 다시 읽도록 함
+        return _build_snapshot(empty, {'workbook': None, 'source': None, 'load_seconds': 0.0,
+                                       'loaded_at': time.time()})
+
+
+def load_master_data():
+    """
+    master_data.xlsx 스냅샷 반환 (프로세스당 한 번 로드, 이후에는 감시 스레드가 교체)
+
+    Returns:
+        dict: {'date_types': {en: kr}, 'order_statuses': {en: kr},
+               'channel_id_to_name': {ID: 채널명}, 'channel_name_to_ids': {채널명: [ID, ...]},
+               'meta': {'workbook', 'source', 'load_seconds', 'loaded_at'}}
+    """
+    global _snapshot
+
+    if _snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _snapshot = _load_snapshot()
+    return _snapshot
+
+
+def check_master_data():
+    """
+    워크북이 바뀌었으면 다시 읽어 스냅샷 교체
+
+    파일이 잠시 없거나(교체 중) 읽기에 실패하면 이전 스냅샷을 유지하고 다음 확인 때 다시 시도합니다.
+
+    Returns:
+        bool: 스냅샷을 교체했으면 True
+    """
+    global _snapshot
+
+    current = load_master_data()
+    key = _workbook_key()
+    if key is None or key == current['meta']['workbook']:
+        return False
+
+    with _lock:
+        if _snapshot is not current:
+            return False  # 다른 스레드가 이미 교체함
+        try:
+            snapshot = _read_snapshot(key)
+        except Exception as e:
+            print(f"⚠️ master_data.xlsx 다시 읽기 실패, 이전 데이터를 유지합니다: {e}")
+            return False
+        _snapshot = snapshot
+
+    meta = snapshot['meta']
+    print(f"✅ master_data.xlsx 다시 로드 ({meta['source']}, {meta['load_seconds']:.3f}s): "
+          f"날짜유형 {len(snapshot['date_types'])}개, 예약상태 {len(snapshot['order_statuses'])}개, "
+          f"채널 {len(snapshot['channel_id_to_name'])}개")
+    return True
+
+
+def _watch(interval):
+    while not _watcher_stop.wait(interval):
+        try:
+            check_master_data()
+        except Exception as e:
+            print(f"⚠️ master_data.xlsx 변경 확인 오류: {e}")
+
+
+def start_master_data_watcher(interval=None):
+    """
+    워크북 변경 감시 스레드 시작 (프로세스당 1개, 여러 번 호출해도 한 번만 시작)
+
+    Args:
+        interval: 확인 주기 (초, None이면 MASTER_DATA_POLL_SECONDS, 0 이하면 시작하지 않음)
+    """
+    global _watcher
+
+    interval = MASTER_DATA_POLL_SECONDS if interval is None else interval
+    if interval <= 0:
+        return
+    with _lock:
+        if _watcher is not None and _watcher.is_alive():
+            return
+        _watcher_stop.clear()
+        _watcher = threading.Thread(target=_watch, args=(interval,), name='master-data-watcher', daemon=True)
+        _watcher.start()
+
+
+def stop_master_data_watcher():
+    """감시 스레드 종료 (테스트용)"""
+    global _watcher
+
+    _watcher_stop.set()
+    if _watcher is not None:
+        _watcher.join()
+        _watcher = None
+
+
+def clear_master_data_cache():
+    """메모리 스냅샷 초기화 (다음 조회 시 JSON 저장본 또는 워크북에서 다시 로드)"""
+    global _snapshot
+
+    with _lock:
+        _snapshot = None
+
 
 def load_date_types():
     """
@@ -21,52 +300,7 @@ def load_date_types():
         dict: {date_types_en: date_types_kr} 형태
         예: {'useDate': '이용일', 'orderDate': '구매일'}
     """
-    global _date_types
-    
-    if _date_types is not None:
-        return _date_types
-    
-    _date_types = {}
-    
-    if not os.path.exists(_excel_path):
-        print(f"Warning: master_data.xlsx not found at {_excel_path}")
-        return _date_types
-    
-    try:
-        df = pd.read_excel(_excel_path, sheet_name='date_types')
-        
-        # 디버깅: 시트가 비어있는지 확인
-        if df.empty:
-            print(f"Warning: date_types sheet is empty in {_excel_path}")
-            return _date_types
-        
-        # 디버깅: 컬럼명 확인
-        if 'date_types_en' not in df.columns or 'date_types_kr' not in df.columns:
-            print(f"Warning: date_types sheet columns: {df.columns.tolist()}")
-            print(f"Expected columns: ['date_types_en', 'date_types_kr']")
-            return _date_types
-        
-        for _, row in df.iterrows():
-            date_type_en = str(row['date_types_en']).strip() if pd.notna(row.get('date_types_en')) else None
-            date_type_kr = str(row['date_types_kr']).strip() if pd.notna(row.get('date_types_kr')) else None
-            
-            if date_type_en and date_type_kr:
-                _date_types[date_type_en] = date_type_kr
-        
-        # 디버깅: 로드된 데이터 확인
-        if not _date_types:
-            print(f"Warning: No date types loaded from {_excel_path}")
-        else:
-            print(f"Loaded date types: {_date_types}")
-                
-    except FileNotFoundError:
-        print(f"Error: File not found: {_excel_path}")
-    except Exception as e:
-        print(f"Warning: Could not load date_types sheet: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return _date_types
+    return load_master_data()['date_types']
 
 def load_order_statuses():
     """
@@ -76,31 +310,7 @@ def load_order_statuses():
         dict: {status_en: status_kr} 형태
         예: {'addpay': '추가결제대기중', 'cancel': '취소'}
     """
-    global _order_statuses
-    
-    if _order_statuses is not None:
-        return _order_statuses
-    
-    _order_statuses = {}
-    
-    if not os.path.exists(_excel_path):
-        print(f"Warning: master_data.xlsx not found at {_excel_path}")
-        return _order_statuses
-    
-    try:
-        df = pd.read_excel(_excel_path, sheet_name='order_status')
-        
-        for _, row in df.iterrows():
-            status_en = str(row['status_en']).strip() if pd.notna(row.get('status_en')) else None
-            status_kr = str(row['status_kr']).strip() if pd.notna(row.get('status_kr')) else None
-            
-            if status_en and status_kr:
-                _order_statuses[status_en] = status_kr
-                
-    except Exception as e:
-        print(f"Warning: Could not load order_status sheet: {e}")
-    
-    return _order_statuses
+    return load_master_data()['order_statuses']
 
 def get_date_type_options():
     """
@@ -145,4 +355,3 @@ def get_all_order_status_codes():
     """
     order_statuses = load_order_statuses()
     return list(order_statuses.keys())
-
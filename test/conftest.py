@@ -0,0 +1,73 @@
+# conftest.py
+"""테스트 공통 fixture
+- synthetic_db: benchmark 합성 데이터를 SQLite 파일로 적재하고 DATABASE_URL로 연결
+  (규모/시드는 테스트 모듈의 SYNTHETIC_DB 또는 indirect 매개변수로 지정)
+- make_sqlite_engine: 테스트가 만든 테이블을 메모리 SQLite에 적재하고 MySQL 전용 문법 변환 등록
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+
+from benchmark.synthetic_data import generate_dataset, install_mysql_compat, write_database
+
+# synthetic_db 기본 설정 (generate_dataset 인자)
+SYNTHETIC_DB_DEFAULTS = {'orders': 400, 'days': 30, 'products': 30, 'seed': 5, 'today': date(2025, 3, 1)}
+
+
+def _clear_process_caches():
+    """DB 내용을 기억하는 프로세스 캐시 초기화 (테스트 DB가 바뀌므로)"""
+    from utils import dimension_cache, hotel_index, hotel_search
+
+    hotel_index.clear_hotel_index()
+    hotel_search.clear_search_cache()
+    dimension_cache.clear_dimension_cache()
+
+
+@pytest.fixture
+def synthetic_db(request, tmp_path, monkeypatch):
+    """
+    합성 데이터 SQLite DB에 get_db_connection()이 연결되도록 설정 (조회 결과 디스크 캐시는 끔)
+
+    설정 우선순위: indirect 매개변수(dict) > 테스트 모듈의 SYNTHETIC_DB > SYNTHETIC_DB_DEFAULTS
+
+    Returns:
+        SQLAlchemy 엔진 (get_db_connection()과 같은 엔진)
+    """
+    from config import configdb
+    from utils import result_cache
+
+    settings = {**SYNTHETIC_DB_DEFAULTS, **getattr(request.module, 'SYNTHETIC_DB', {}),
+                **getattr(request, 'param', {})}
+    path = tmp_path / f"synthetic_{settings['seed']}.db"
+    write_database(str(path), generate_dataset(**settings))
+
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{path}")
+    monkeypatch.setattr(result_cache, 'RESULT_CACHE_ENABLED', False)
+    engine = install_mysql_compat(configdb.get_db_connection(), settings['today'])
+    _clear_process_caches()
+    yield engine
+    _clear_process_caches()
+    configdb.dispose_engines()
+
+
+@pytest.fixture(scope='session')
+def make_sqlite_engine():
+    """
+    {테이블명: DataFrame}을 메모리 SQLite에 적재한 엔진을 만드는 함수 반환
+
+    CURDATE()는 today로 고정되고, MySQL 전용 문법은 benchmark.synthetic_data.mysql_to_sqlite로 변환됩니다.
+    """
+    def make(dataset, today):
+        engine = install_mysql_compat(create_engine('sqlite://'), today)
+        for table, df in dataset.items():
+            df.to_sql(table, engine, index=False)
+        return engine
+
+    return make
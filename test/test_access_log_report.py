@@ -0,0 +1,55 @@
+# test_access_log_report.py
+"""JSON 접근 로그 지연시간 분석 검증
+- 로테이션된 파일까지 읽고 JSON이 아닌 줄은 건너뜀
+- 작업별 / 조회 기간별 / 일별 p50·p95·p99, 실패 기록은 기본 제외
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+from utils import access_log_report
+
+
+def _write(path, events, extra_lines=()):
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + '\n')
+        for line in extra_lines:
+            f.write(line + '\n')
+
+
+def test_report_percentiles_by_action_range_and_day(tmp_path):
+    searches = [{'ts': f"2025-03-0{1 + i % 2}T10:00:00.000", 'action': 'search', 'status': 'success',
+                 'days': 7 if i < 50 else 90, 'elapsed_ms': float(i + 1)} for i in range(100)]
+    _write(tmp_path / 'hotel_access.jsonl.1', searches[:60])
+    _write(tmp_path / 'hotel_access.jsonl', searches[60:] + [
+        {'ts': '2025-03-02T11:00:00.000', 'action': 'search', 'status': 'error', 'elapsed_ms': 99999.0},
+        {'ts': '2025-03-02T11:00:00.000', 'action': 'excel_download', 'status': 'success', 'elapsed_ms': 40.0},
+    ], extra_lines=['{"ts": "2025-03-02', 'not json'])
+    _write(tmp_path / 'channels_access.jsonl', [
+        {'ts': '2025-03-02T12:00:00.000', 'action': 'search', 'status': 'success', 'days': 1, 'elapsed_ms': 5.0}
+    ])
+
+    paths = access_log_report.find_log_files(str(tmp_path), 'hotel')
+    assert [os.path.basename(path) for path in paths] == ['hotel_access.jsonl.1', 'hotel_access.jsonl']
+
+    result = access_log_report.summarize(access_log_report.load_events(paths))
+    search = result['by_action'].loc['search']
+    assert (search['count'], search['p50'], search['p95'], search['p99'], search['max']) == (100, 50.5, 95.0, 99.0, 100.0)
+    assert result['by_action'].loc['excel_download', 'count'] == 1
+
+    by_range = result['by_range'].loc['search']
+    assert list(by_range.index.astype(str)) == ['2~7일', '32~92일']
+    assert by_range['count'].tolist() == [50, 50]
+    assert result['by_day'].loc['search']['count'].tolist() == [50, 50]
+
+    output = tmp_path / 'latency.json'
+    assert access_log_report.main(['--log-dir', str(tmp_path), '--action', 'search',
+                                   '--since', '2025-03-02', '--output', str(output)]) == 0
+    saved = json.loads(output.read_text(encoding='utf-8'))
+    assert saved['by_action'] == [{'action': 'search', 'count': 51, 'p50': 50.0, 'p95': 95.0, 'p99': 99.0, 'max': 100.0}]
+    assert access_log_report.main(['--log-dir', str(tmp_path / 'missing')]) == 1
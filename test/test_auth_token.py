@@ -0,0 +1,109 @@
+# test_auth_token.py
+"""인증 토큰 검증
+- 서명/만료 확인 (변조, 다른 서명 키, 만료 시각)
+- 요청 쿠키의 토큰으로 세션 복원 (이전 방식의 서명 없는 auth_admin_id 쿠키는 무시)
+- 로그아웃 후에는 이전에 발급된 토큰 거부 (서버 측 로그아웃 시각)
+- 서명 키 파일은 다 쓴 뒤 한 번에 올라가며, 비어 있으면 내용이 생길 때까지 다시 읽음
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트 중 프로젝트 루트에 .auth_secret 파일이 생기지 않도록 서명 키 지정
+os.environ.setdefault('AUTH_TOKEN_SECRET', 'test-secret')
+
+import threading
+import time
+
+import pytest
+
+from utils import auth
+
+
+class _SessionState(dict):
+    """st.session_state처럼 속성 삭제(del session_state.key)를 지원하는 dict"""
+
+    def __delattr__(self, name):
+        del self[name]
+
+
+@pytest.fixture(autouse=True)
+def logout_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, 'AUTH_LOGOUT_DIR', str(tmp_path / 'logout'))
+    return tmp_path / 'logout'
+
+
+def test_token_round_trip_and_expiry():
+    token = auth.create_auth_token('관리자01', now=1000)
+    assert auth.verify_auth_token(token, now=1000) == '관리자01'
+    assert auth.verify_auth_token(token, now=1000 + auth.AUTH_TOKEN_TTL_SECONDS - 1) == '관리자01'
+    assert auth.verify_auth_token(token, now=1000 + auth.AUTH_TOKEN_TTL_SECONDS) is None
+
+
+def test_tampered_or_foreign_tokens_are_rejected(monkeypatch):
+    token = auth.create_auth_token('admin', now=1000)
+    encoded_id, expires, signature = token.split('.')
+
+    forged_id = auth.create_auth_token('root', now=1000).split('.')[0]
+    assert auth.verify_auth_token(f"{forged_id}.{expires}.{signature}", now=1000) is None
+    assert auth.verify_auth_token(f"{encoded_id}.{int(expires) + 3600}.{signature}", now=1000) is None
+    for broken in [None, '', 'admin', 'a.b', 'a.b.c.d', f"{encoded_id}.soon.{signature}"]:
+        assert auth.verify_auth_token(broken, now=1000) is None
+
+    monkeypatch.setattr(auth, '_TOKEN_SECRET', b'other-secret')
+    assert auth.verify_auth_token(token, now=1000) is None
+
+
+def test_restore_auth_from_token():
+    session_state = {}
+    assert not auth.restore_auth_from_token(session_state, {'auth_admin_id': 'admin'})
+    assert not auth.restore_auth_from_token(session_state, {auth.AUTH_COOKIE_NAME: 'x.1.y'})
+    assert session_state == {}
+
+    cookies = {auth.AUTH_COOKIE_NAME: auth.create_auth_token('admin')}
+    assert auth.restore_auth_from_token(session_state, cookies)
+    assert session_state == {'authenticated': True, 'admin_id': 'admin'}
+    assert auth.is_authenticated(session_state)
+
+
+def test_logout_revokes_previously_issued_tokens(logout_dir):
+    old = auth.create_auth_token('admin', now=1000)
+    other = auth.create_auth_token('staff', now=1000)
+    assert auth.revoke_auth_tokens('admin', now=1500)
+
+    assert auth.verify_auth_token(old, now=1600) is None
+    assert auth.verify_auth_token(other, now=1600) == 'staff'
+    # 로그아웃 이후 다시 로그인하여 받은 토큰은 사용 가능
+    assert auth.verify_auth_token(auth.create_auth_token('admin', now=1501), now=1600) == 'admin'
+
+    session_state = _SessionState(authenticated=True, admin_id='staff')
+    auth.logout(session_state)
+    assert session_state == {}
+    assert auth.verify_auth_token(other, now=time.time()) is None
+    assert not auth.restore_auth_from_token(session_state, {auth.AUTH_COOKIE_NAME: other})
+    # 임시 파일은 남지 않음 (사용자별 기록 파일만)
+    assert len(os.listdir(logout_dir)) == 2
+
+
+def test_token_secret_file_is_shared_and_never_read_empty(tmp_path, monkeypatch):
+    monkeypatch.delenv('AUTH_TOKEN_SECRET')
+    monkeypatch.setattr(auth, '_project_root', str(tmp_path))
+    secret_path = tmp_path / '.auth_secret'
+
+    first = auth._load_token_secret()
+    assert auth._load_token_secret() == first
+    assert secret_path.read_text().strip().encode('utf-8') == first
+    assert oct(secret_path.stat().st_mode & 0o777) == '0o600'
+    assert os.listdir(tmp_path) == ['.auth_secret']
+
+    # 다른 프로세스가 아직 쓰는 중인 빈 파일은 내용이 생길 때까지 다시 읽음
+    secret_path.write_text('')
+    monkeypatch.setattr(auth, '_SECRET_READ_INTERVAL', 0.01)
+    writer = threading.Timer(0.05, lambda: secret_path.write_text('written-later'))
+    writer.start()
+    try:
+        assert auth._load_token_secret() == b'written-later'
+    finally:
+        writer.join()
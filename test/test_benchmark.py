@@ -0,0 +1,58 @@
+# test_benchmark.py
+"""오프라인 벤치마크 검증
+- 작은 합성 DB로 벤치마크를 실행해 모든 항목이 측정되고 결과가 비어 있지 않은지 확인
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import pytest
+
+from benchmark import run_benchmark
+from benchmark.synthetic_data import generate_dataset
+from config import configdb
+from utils import result_cache
+from utils.dimension_cache import clear_dimension_cache
+
+
+def test_synthetic_dataset_is_consistent():
+    dataset = generate_dataset(orders=500, days=30, products=50, seed=1)
+    op = dataset['order_product']
+
+    assert set(dataset) == {'order_product', 'order_item', 'order_pay', 'product',
+                            'product_rateplan', 'common_code', 'tblmanager'}
+    assert op['product_idx'].between(1, 50).all()
+    assert op['rateplan_idx'].isin(dataset['product_rateplan']['idx']).all()
+    assert dataset['order_item']['order_product_idx'].isin(op['idx']).all()
+    # 주문번호별 채널/생성 시각은 동일
+    assert (op.groupby('order_num')[['order_channel_idx', 'create_date']].nunique() == 1).all().all()
+
+
+def test_benchmark_runs_against_synthetic_db(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', '')
+    monkeypatch.setattr(result_cache, 'RESULT_CACHE_ENABLED', True)
+    output = tmp_path / 'result.json'
+
+    try:
+        report = run_benchmark.main([
+            '--orders', '400', '--days', '20', '--products', '40', '--db', str(tmp_path / 'bench.db'),
+            '--ranges', '7', '--repeat', '1', '--output', str(output)
+        ])
+    finally:
+        configdb.dispose_engines()
+        clear_dimension_cache()
+
+    saved = json.loads(output.read_text(encoding='utf-8'))
+    assert saved['meta']['dataset']['orders'] == 400
+    names = {entry['name'] for entry in report['results']}
+    assert {'fetch_channel_data', 'fetch_hotel_data', 'create_excel_download',
+            'create_hotel_excel_download', 'search_hotels'} <= names
+
+    by_name = {entry['name']: entry for entry in report['results'] if entry['range_days'] == 7}
+    assert by_name['fetch_channel_data']['size'] > 0
+    assert by_name['fetch_hotel_data']['size'] > 0
+    assert by_name['create_excel_download']['size'] > 0
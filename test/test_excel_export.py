@@ -0,0 +1,116 @@
+# test_excel_export.py
+"""엑셀 생성 검증
+- write-only 스트리밍 경로와 pd.ExcelWriter 경로의 시트/셀 값/표시 형식/열 너비 비교
+- 숫자/비율 컬럼은 숫자 셀 + 컬럼 표시 형식으로 기록
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import importlib.util
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from utils import excel_handler_hotel
+
+_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'utils', 'excel_handler_v1.5.py')
+_spec = importlib.util.spec_from_file_location('excel_handler_v1_5', _path)
+excel_handler_v1_5 = importlib.util.module_from_spec(_spec)
+sys.modules['excel_handler_v1_5'] = excel_handler_v1_5
+_spec.loader.exec_module(excel_handler_v1_5)
+
+SUMMARY = {'total_bookings': 1234, 'total_revenue': 5678900.0, 'channel_count': 3, 'hotel_count': 7,
+           'start_date': '2025-01-01', 'end_date': '2025-01-31', 'date_type': '구매일'}
+
+
+def _report_frame(rows, seed=3):
+    rng = np.random.default_rng(seed)
+    deposit = rng.integers(0, 5_000_000, rows)
+    purchase = rng.integers(0, 6_000_000, rows)
+    return pd.DataFrame({
+        'booking_date': pd.to_datetime('2025-01-01') + pd.to_timedelta(rng.integers(0, 90, rows), unit='D'),
+        'hotel_name': rng.choice(['서울 호텔', '부산 리조트 앤 스파', None], rows),
+        'hotel_code': [f'H{i:05d}' for i in rng.integers(0, 99999, rows)],
+        'channel_name': rng.choice(['익스피디아', '다보', 'hiot'], rows),
+        'channel_idx': rng.integers(1, 20, rows),
+        'channel_code': rng.choice(['expedia', 'dabo'], rows),
+        'sale_type': rng.choice(['b2c', 'b2b', ''], rows),
+        'hotel_count': rng.integers(1, 300, rows),
+        'booking_count': rng.integers(1, 50, rows),
+        'total_rooms': rng.integers(0, 100, rows),
+        'confirmed_rooms': rng.integers(0, 80, rows),
+        'cancelled_rooms': rng.integers(0, 20, rows),
+        'cancellation_rate': rng.uniform(0, 100, rows).round(1),
+        'total_deposit': deposit,
+        'total_purchase': purchase,
+        'total_profit': purchase - deposit,
+        'profit_rate': rng.uniform(-50, 200, rows).round(1),
+    })
+
+
+def _read(data):
+    workbook = load_workbook(BytesIO(data.getvalue()))
+    return {
+        ws.title: {
+            'values': [list(row) for row in ws.iter_rows(values_only=True)],
+            'widths': {k: v.width for k, v in ws.column_dimensions.items() if v.width},
+            'header_bold': ws.cell(1, 1).font.b,
+            'formats': [cell.number_format for cell in ws[2]] if ws.max_row > 1 else [],
+        }
+        for ws in workbook.worksheets
+    }
+
+
+@pytest.mark.parametrize('create', [
+    lambda df, streaming: excel_handler_v1_5.create_excel_file(df, SUMMARY, '구매일', 'orderDate', streaming),
+    lambda df, streaming: excel_handler_hotel.create_hotel_excel_file(df, SUMMARY, '이용일', 'useDate', streaming),
+])
+def test_streaming_matches_standard_writer(create, monkeypatch):
+    from utils import excel_writer
+    # 여러 구간에 걸쳐 기록되도록 구간 크기를 줄임
+    monkeypatch.setattr(excel_writer, 'EXCEL_CHUNK_ROWS', 7)
+    df = _report_frame(50)
+
+    standard = _read(create(df, False))
+    streaming = _read(create(df, True))
+
+    assert list(streaming) == list(standard)
+    for title in standard:
+        # 요약 시트 '생성 일시'는 초 단위로 달라질 수 있음
+        rows = [row for row in standard[title]['values'] if row[0] != '생성 일시']
+        assert [row for row in streaming[title]['values'] if row[0] != '생성 일시'] == rows
+        assert streaming[title]['header_bold']
+        assert streaming[title]['formats'] == standard[title]['formats']
+    data_sheet = list(standard)[-1]
+    assert streaming[data_sheet]['widths'] == standard[data_sheet]['widths']
+
+
+def test_empty_frame_writes_message_sheet():
+    data = _read(excel_handler_hotel.create_hotel_excel_file(pd.DataFrame(), None, '구매일', streaming=True))
+    assert data['구매일']['values'] == [['메시지'], ['조회된 데이터가 없습니다.']]
+
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_numeric_columns_are_typed_cells(streaming):
+    df = _report_frame(20)
+    df.loc[3, 'total_deposit'] = None
+    data = _read(excel_handler_hotel.create_hotel_excel_file(df, None, '구매일', 'orderDate', streaming))['구매일']
+    header, rows = data['values'][0], data['values'][1:]
+    formats = dict(zip(header, data['formats']))
+
+    deposit = [row[header.index('총 입금가')] for row in rows]
+    assert deposit[3] == 0
+    assert deposit[:3] == df['total_deposit'].iloc[:3].tolist()
+    assert formats['총 입금가'] == '#,##0'
+
+    rates = [row[header.index('수익률 (%)')] for row in rows]
+    assert rates == pytest.approx((df['profit_rate'] / 100).tolist())
+    assert formats['수익률 (%)'] == '0.0%'
+
+    assert isinstance(rows[0][header.index('구매일(예약일)')], str)
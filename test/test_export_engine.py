@@ -0,0 +1,70 @@
+# test_export_engine.py
+"""보고서 내보내기 엔진 검증
+- 컬럼 정의 순서/한글명/화면 표시 형식
+- 열 너비 계산 (고유값/표본, 26열 초과)
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io import BytesIO
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from utils import export_engine
+from utils.export_engine import (
+    CHANNEL_REPORT_COLUMNS,
+    HOTEL_REPORT_COLUMNS,
+    column,
+    display_frame,
+    write_report_workbook
+)
+
+
+def test_display_frame_orders_labels_and_formats_top_rows():
+    df = pd.DataFrame({
+        'total_deposit': [1234567.0, None, 5],
+        'channel_code': ['expedia', 'dabo', 'hiot'],
+        'hotel_code': ['H1', 'H2', 'H3'],
+        'hotel_name': ['서울 호텔', '부산 호텔', '제주 호텔'],
+        'booking_date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03']),
+        'profit_rate': [12.345, None, -3.0],
+    })
+
+    result = display_frame(df, HOTEL_REPORT_COLUMNS, 'useDate', rows=2)
+
+    # 숙소코드/채널코드는 화면에 표시하지 않음
+    assert list(result.columns) == ['이용일(체크인)', '숙소명', '총 입금가', '수익률 (%)']
+    assert result.values.tolist() == [
+        ['2025-01-01', '서울 호텔', '1,234,567', '12.3%'],
+        ['2025-01-02', '부산 호텔', '0', '0.0%'],
+    ]
+
+
+def test_text_width_uses_unique_values_and_bounded_sample(monkeypatch):
+    names = pd.Series(['가' * 3] * 1000 + ['가' * 30])
+    col = {**column('hotel_name', '숙소명'), 'label': '숙소명'}
+    assert export_engine.column_width(names, col) == 32
+
+    monkeypatch.setattr(export_engine, 'EXPORT_WIDTH_SAMPLE_ROWS', 1)
+    sampled = export_engine.column_width(pd.Series([f'{i:0{i % 7 + 1}d}' for i in range(100)]), col)
+    assert 3 <= sampled <= 9
+
+    amounts = pd.Series([-1234567.0, 10])
+    amount_col = {**column('total_deposit', '총 입금가', 'int'), 'label': '총 입금가'}
+    assert export_engine.column_width(amounts, amount_col) == len('-1,234,567') + 2
+
+
+def test_workbook_supports_more_than_26_columns():
+    columns = CHANNEL_REPORT_COLUMNS + [column(f'extra_{i}', f'추가{i}', 'int') for i in range(20)]
+    df = pd.DataFrame({col['source']: [1, 22] for col in columns if col['dtype'] != 'date'})
+    df['booking_date'] = pd.to_datetime(['2025-01-01', '2025-01-02'])
+
+    for streaming in (True, False):
+        worksheet = load_workbook(BytesIO(write_report_workbook(df, columns, streaming=streaming).getvalue()))['구매일']
+        assert worksheet.max_column == len(columns)
+        assert worksheet['AG1'].value == '추가19'
+        assert worksheet.column_dimensions['AG'].width == len('추가19') + 2
@@ -0,0 +1,68 @@
+# test_frame_schema.py
+"""조회 결과 스키마 검증
+- 결측 대체/반올림/저장 타입 변환 (NULL 키가 있는 행도 유지)
+- 구간별 카테고리가 달라도 이어 붙인 결과가 category로 유지되고 정렬 순서가 문자열 순서와 같은지 확인
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from utils.frame_schema import HOTEL_DATA_SCHEMA, apply_schema, concat_frames
+
+
+def _chunk(names, deposits):
+    return pd.DataFrame({
+        'booking_date': ['2025-01-01'] * len(names),
+        'hotel_name': names,
+        'hotel_idx': [1.0] * len(names),
+        'booking_count': [3] * len(names),
+        'total_rooms': [None] * len(names),
+        'total_deposit': deposits,
+        'profit_rate': [12.345] * len(names),
+    })
+
+
+def test_apply_schema_converts_types_and_fills_missing():
+    df = apply_schema(_chunk(['서울 호텔', None], [1234.6, None]), HOTEL_DATA_SCHEMA)
+
+    assert str(df['booking_date'].dtype) == 'datetime64[ns]'
+    assert isinstance(df['hotel_name'].dtype, pd.CategoricalDtype)
+    assert df['hotel_name'].isna().tolist() == [False, True]
+    assert str(df['hotel_idx'].dtype) == 'Int64'
+    assert str(df['booking_count'].dtype) == 'int32'
+    assert df['total_rooms'].tolist() == [0, 0]
+    assert str(df['total_deposit'].dtype) == 'int64'
+    assert df['total_deposit'].tolist() == [1235, 0]
+    assert df['profit_rate'].tolist() == [12.3, 12.3]
+
+
+def test_apply_schema_keeps_rows_with_null_key():
+    # product_idx가 NULL인 예약 행이 있어도 변환 오류 없이 유지
+    chunk = _chunk(['서울 호텔', None], [1000, 2000])
+    chunk['hotel_idx'] = [7, None]
+    df = apply_schema(chunk, HOTEL_DATA_SCHEMA)
+
+    assert str(df['hotel_idx'].dtype) == 'Int64'
+    assert df['hotel_idx'].isna().tolist() == [False, True]
+    assert int(df['hotel_idx'].iloc[0]) == 7
+    assert df['total_deposit'].tolist() == [1000, 2000]
+    assert df['hotel_idx'].nunique() == 1
+
+
+def test_concat_frames_unions_categories():
+    parts = [
+        apply_schema(_chunk(['제주 호텔', '부산 호텔'], [1, 2]), HOTEL_DATA_SCHEMA),
+        apply_schema(_chunk([], []), HOTEL_DATA_SCHEMA),
+        apply_schema(_chunk(['서울 호텔', '부산 호텔'], [3, 4]), HOTEL_DATA_SCHEMA),
+    ]
+    df = concat_frames(parts)
+
+    assert isinstance(df['hotel_name'].dtype, pd.CategoricalDtype)
+    assert df['hotel_name'].tolist() == ['제주 호텔', '부산 호텔', '서울 호텔', '부산 호텔']
+    assert df['total_deposit'].tolist() == [1, 2, 3, 4]
+    # 카테고리 정렬 = 문자열 정렬
+    assert df.sort_values('hotel_name')['hotel_name'].tolist() == sorted(df['hotel_name'])
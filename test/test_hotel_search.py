@@ -0,0 +1,172 @@
+# test_hotel_search.py
+"""숙소 검색 검증
+- n-gram 색인 검색 결과가 기존 LIKE 조건과 같은지 확인 (대소문자/공백/숙소코드)
+- 색인 경로와 DB LIKE 경로의 search_hotels 결과 비교 (합성 SQLite DB)
+- idx 워터마크 증분 갱신
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy import event, text
+
+from config import configdb
+from utils import dimension_cache, hotel_index, hotel_search
+from utils.hotel_index import HotelIndex
+
+TODAY = date(2025, 3, 1)
+# conftest.synthetic_db 설정
+SYNTHETIC_DB = {'orders': 400, 'days': 30, 'products': 200, 'seed': 9, 'today': TODAY}
+
+
+def _like_match(df, term):
+    """기존 SQL WHERE 조건 (대소문자 무시)"""
+    clean = term.strip().lower()
+    key = clean.replace(' ', '')
+    names = df['name_kr'].fillna('').str.lower()
+    codes = df['product_code'].fillna('').str.lower()
+    mask = names.str.contains(clean, regex=False) | codes.str.contains(clean, regex=False) \
+        | names.str.replace(' ', '').str.contains(key, regex=False)
+    return sorted(df.loc[mask, 'idx'].tolist())
+
+
+def test_index_matches_like_conditions():
+    df = pd.DataFrame({
+        'idx': [1, 2, 3, 4, 5, 6],
+        'product_code': ['HTL001', 'htl002', None, 'AB 12', 'X1', 'X2'],
+        'name_kr': ['힐튼 서울', '힐튼서울 남산', '서울 힐튼 호텔', 'Grand Hyatt', None, '그랜드 하얏트 서울'],
+    })
+    index = HotelIndex.build(df.iloc[:3])
+    index = HotelIndex.build(df.iloc[3:], base=index)
+
+    for term in ['힐튼 서울', '힐튼서울', '서울', 'htl00', 'HTL002', 'grand hy', 'b 1', 'ab12', '없는숙소', '울 힐']:
+        assert sorted(index.find(term)) == _like_match(df, term), term
+
+
+def test_search_with_index_matches_like_query(synthetic_db, monkeypatch):
+    monkeypatch.setattr(hotel_search, 'HOTEL_SEARCH_CACHE_SIZE', 0)
+    monkeypatch.setattr(hotel_index, 'HOTEL_INDEX_ENABLED', False)
+    terms = ['서울', '호텔 1', '호텔1', 'h0001', '부산 호텔 12', '없는숙소']
+    expected = {term: hotel_search.search_hotels(term, limit=15) for term in terms}
+    assert expected['서울']
+
+    monkeypatch.setattr(hotel_index, 'HOTEL_INDEX_ENABLED', True)
+    hotel_index._rebuild()
+    hotel_index._load_active()
+    assert hotel_index.get_hotel_index() is not None
+    assert hotel_index.get_active_hotels() is not None
+    for term in terms:
+        assert hotel_search.search_hotels(term, limit=15) == expected[term], term
+
+
+def test_index_adds_new_products_incrementally(synthetic_db, monkeypatch):
+    hotel_index._rebuild()
+    index = hotel_index.get_hotel_index()
+    assert index.find('신규호텔') == []
+
+    with configdb.get_db_connection().begin() as conn:
+        conn.execute(text("INSERT INTO product (idx, product_code, name_kr, reg_date) "
+                          "VALUES (9001, 'N9001', '신규 호텔', '2025-02-28 00:00:00')"))
+    monkeypatch.setattr(hotel_index, 'HOTEL_INDEX_REFRESH_SECONDS', 0)
+
+    refreshed = hotel_index.get_hotel_index()
+    assert refreshed is not index
+    assert refreshed.max_idx == 9001
+    assert refreshed.find('신규호텔') == [9001]
+    # 이전 색인은 변경되지 않음
+    assert index.find('신규호텔') == []
+
+
+def test_search_in_memory_skips_database(synthetic_db, monkeypatch):
+    hotel_index._rebuild()
+    hotel_index._load_active()
+    active = hotel_index.get_active_hotels()
+    results = hotel_search.search_hotels('호텔', limit=200)
+    assert results
+    assert all(hotel['has_recent_booking'] == int(hotel['idx'] in active['booked']) for hotel in results)
+
+    # 집합 로드 이후 등록된 숙소(idx > max_idx)는 신규 호텔로 검색됨
+    with configdb.get_db_connection().begin() as conn:
+        conn.execute(text("INSERT INTO product (idx, product_code, name_kr, reg_date) "
+                          "VALUES (9002, 'N9002', '신규 호텔', '2025-02-28 00:00:00')"))
+    monkeypatch.setattr(hotel_index, 'HOTEL_INDEX_REFRESH_SECONDS', 0)
+    hotel_index.get_hotel_index()
+    monkeypatch.setattr(hotel_search, 'get_db_connection', lambda: pytest.fail('DB 조회 발생'))
+    assert hotel_search.search_hotels('신규 호텔') == [
+        {'idx': 9002, 'product_code': 'N9002', 'name_kr': '신규 호텔', 'has_recent_booking': 0}
+    ]
+
+
+def test_search_cache_refines_prefix_results(synthetic_db, monkeypatch):
+    monkeypatch.setattr(hotel_index, 'HOTEL_INDEX_ENABLED', False)
+    terms = ['서울 호텔 1', '서울호텔 12', '서울 호텔 없음']
+    monkeypatch.setattr(hotel_search, 'HOTEL_SEARCH_CACHE_SIZE', 0)
+    expected = {term: hotel_search.search_hotels(term, limit=5) for term in terms}
+    assert expected['서울 호텔 1']
+
+    monkeypatch.setattr(hotel_search, 'HOTEL_SEARCH_CACHE_SIZE', 16)
+    hotel_search.search_hotels('서울', limit=5)  # 짧은 검색어: 후보를 넉넉히 가져와 보관
+    monkeypatch.setattr(hotel_search, '_fetch_hotels', lambda *args: pytest.fail('검색 실행'))
+    for term in terms:
+        assert hotel_search.search_hotels(term, limit=5) == expected[term], term
+    assert hotel_search.search_hotels('서울', limit=5) == hotel_search.search_hotels('서울 ', limit=5)
+
+    stats = hotel_search.get_search_cache_stats()
+    assert (stats['miss'], stats['refine'], stats['hit']) == (1, 3, 2)
+
+
+def test_search_cache_falls_back_when_prefix_results_are_truncated(synthetic_db, monkeypatch):
+    monkeypatch.setattr(hotel_index, 'HOTEL_INDEX_ENABLED', False)
+    monkeypatch.setattr(hotel_search, 'HOTEL_SEARCH_CACHE_SIZE', 0)
+    expected = hotel_search.search_hotels('호텔 19', limit=3)
+    assert expected
+
+    monkeypatch.setattr(hotel_search, 'HOTEL_SEARCH_CACHE_SIZE', 16)
+    monkeypatch.setattr(hotel_search, 'HOTEL_SEARCH_PREFIX_LIMIT', 3)
+    hotel_search.search_hotels('호텔', limit=3)
+    # 잘린 결과(3개)를 거르면 limit개가 안 되므로 다시 검색
+    assert hotel_search.search_hotels('호텔 19', limit=3) == expected
+    assert hotel_search.get_search_cache_stats()['miss'] == 2
+
+
+def _count_product_queries(engine):
+    queries = []
+
+    def record(conn, cursor, statement, parameters, *args):
+        # pandas가 SQLite에서 보내는 테이블 확인(PRAGMA)은 제외
+        if statement.lstrip().startswith('SELECT') and 'FROM product' in statement:
+            queries.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', record)
+    return queries
+
+
+def test_get_hotels_by_ids_loads_selection_in_one_query(synthetic_db, monkeypatch):
+    queries = _count_product_queries(configdb.get_db_connection())
+    ids = list(range(120, 70, -1)) + [99999, 120]  # 50개 + 없는 숙소 + 중복
+
+    hotels = hotel_search.get_hotels_by_ids(ids)
+    assert [hotel['idx'] for hotel in hotels] == list(range(120, 70, -1))
+    assert hotels[0]['product_code'] == 'H000120' and hotels[0]['reg_date'] is not None
+    assert len(queries) == 1
+
+    # 캐시된 숙소 및 없는 숙소는 다시 조회하지 않음
+    assert hotel_search.get_hotel_by_id(75)['name_kr'] == hotels[45]['name_kr']
+    assert hotel_search.get_hotel_by_id(99999) is None
+    assert len(queries) == 1
+
+    # 만료 후에는 요청한 숙소와 캐시의 다른 만료 숙소를 한 번에 다시 채움
+    monkeypatch.setattr(dimension_cache, 'DIMENSION_CACHE_TTL', 0)
+    hotel_search.get_hotels_by_ids([1])
+    assert len(queries) == 2
+    # idx 목록은 SQL 문자열이 아닌 바인딩 값으로 전달됨
+    statement, parameters = queries[-1]
+    assert '99999' not in statement
+    refilled = {int(pid) for pid in parameters}
+    assert refilled == {1, 99999, *range(71, 121)}
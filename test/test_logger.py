@@ -0,0 +1,90 @@
+# test_logger.py
+"""로깅 모듈 검증
+- 큐 + 백그라운드 기록 스레드로 파일에 기록 (메시지 문자열 조합도 기록 스레드에서)
+- 꺼진 레벨은 인자를 문자열로 만들지 않음
+- log_error는 통합 로그와 에러 로그에 함께 기록
+- JSON 접근 로그는 ACCESS_LOG_JSON일 때만 한 줄에 JSON 하나로 기록
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+
+import pytest
+
+from utils import logger
+
+
+class _Probe:
+    """str() 된 스레드 기록"""
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return 'probe'
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, '_log_dir', tmp_path)
+    monkeypatch.setattr(logger, '_app_name', f"test_{tmp_path.name}")
+    yield tmp_path
+    logger.flush_logs()
+
+
+def test_messages_are_built_and_written_off_the_caller_thread(log_dir):
+    probe = _Probe()
+    logger.log_access("INFO", "데이터 조회", admin_id="tester", action="fetch", 숙소수=3, probe=probe)
+    assert probe.threads == []
+
+    logger.flush_logs()
+    assert probe.threads and threading.current_thread().name not in probe.threads
+    content = (log_dir / f"{logger._app_name}.log").read_text(encoding='utf-8')
+    assert "[INFO    ] [APP] [ACCESS] 데이터 조회: admin_id=tester, action=fetch, 숙소수=3, probe=probe" in content
+
+
+def test_disabled_level_costs_nothing(log_dir):
+    probe = _Probe()
+    assert not logger.is_log_enabled("DEBUG")
+    logger.log_auth("DEBUG", "인증 체크 실패 상세", probe=probe)
+    logger.log_app("DEBUG", "디버그", probe=probe)
+    logger.flush_logs()
+    assert probe.threads == []
+    assert "디버그" not in (log_dir / f"{logger._app_name}.log").read_text(encoding='utf-8')
+
+
+def test_log_error_writes_unified_and_error_logs(log_dir):
+    logger.log_error("ERROR", "조회 실패", exception=ValueError("bad"), admin_id="tester")
+    logger.log_error("WARNING", "검증 경고", exception=KeyError("k"))
+    logger.flush_logs()
+
+    unified = (log_dir / f"{logger._app_name}.log").read_text(encoding='utf-8')
+    errors = (log_dir / f"{logger._app_name}_error.log").read_text(encoding='utf-8')
+    expected = "[ERROR] 조회 실패: admin_id=tester, 사유=잘못된 값 | Exception: ValueError: bad"
+    assert expected in unified and expected in errors
+    assert "검증 경고" in unified and "검증 경고" not in errors
+
+
+def test_log_event_writes_json_lines_when_enabled(log_dir, monkeypatch):
+    logger.log_event('search', admin_id='tester', elapsed_ms=12.5)
+    monkeypatch.setattr(logger, 'ACCESS_LOG_JSON', True)
+    logger.log_event('search', admin_id='tester', start_date='2025-03-01', days=7, rows=None,
+                     elapsed_ms=1234.5, timings={'detail_1': 1100.0})
+    logger.log_event('search', status='error', error='TimeoutError')
+    logger.flush_logs()
+
+    lines = (log_dir / f"{logger._app_name}_access.jsonl").read_text(encoding='utf-8').splitlines()
+    events = [json.loads(line) for line in lines]
+    assert len(events) == 2
+    assert events[0]['app'] == logger._app_name and events[0]['ts']
+    assert {key: events[0][key] for key in ('action', 'status', 'admin_id', 'days', 'elapsed_ms', 'timings')} == {
+        'action': 'search', 'status': 'success', 'admin_id': 'tester', 'days': 7,
+        'elapsed_ms': 1234.5, 'timings': {'detail_1': 1100.0}
+    }
+    assert 'rows' not in events[0]
+    assert events[1]['status'] == 'error' and events[1]['error'] == 'TimeoutError'
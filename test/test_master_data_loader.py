@@ -0,0 +1,114 @@
+# test_master_data_loader.py
+"""master_data.xlsx 로더 검증
+- 한 번 열어 모든 시트 매핑 로드 / JSON 저장본 재사용
+- 워크북 크기나 수정시각이 바뀌면 다시 파싱, 감시 스레드의 스냅샷 교체
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import pytest
+from openpyxl import Workbook
+
+from config import channel_mapping, master_data_loader
+
+
+def _write_workbook(path, channels):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'date_types'
+    sheet.append(['date_types_en', 'date_types_kr'])
+    sheet.append(['useDate', '이용일'])
+    sheet.append(['orderDate', ' 구매일 '])
+    sheet = workbook.create_sheet('order_status')
+    sheet.append(['status_en', 'status_kr'])
+    sheet.append(['confirm', '확정'])
+    sheet.append([None, '빈 코드'])
+    sheet.append(['cancel', '취소'])
+    sheet = workbook.create_sheet('channels')
+    sheet.append(['ID', 'channels', '비고'])
+    for row in channels:
+        sheet.append(row)
+    workbook.save(path)
+
+
+@pytest.fixture
+def workbook_path(tmp_path, monkeypatch):
+    path = tmp_path / 'master_data.xlsx'
+    _write_workbook(path, [[1, '익스피디아'], [2.0, '호텔베드'], [3, '익스피디아'], [None, '무시']])
+    monkeypatch.setattr(master_data_loader, '_excel_path', str(path))
+    master_data_loader.clear_master_data_cache()
+    yield path
+    master_data_loader.clear_master_data_cache()
+
+
+def test_loads_all_sheets_and_writes_sidecar(workbook_path):
+    assert master_data_loader.get_date_type_options() == ['전체', 'useDate', 'orderDate']
+    assert master_data_loader.get_date_type_display_name('orderDate') == '구매일'
+    assert master_data_loader.get_all_order_status_codes() == ['confirm', 'cancel']
+    assert channel_mapping.get_channel_ids_by_name('익스피디아') == [1, 3]
+    assert channel_mapping.get_channel_name_by_id('2') == '호텔베드'
+    assert (workbook_path.parent / 'master_data.cache.json').exists()
+
+
+def test_sidecar_is_reused_until_workbook_changes(workbook_path, monkeypatch):
+    master_data_loader.load_master_data()
+    master_data_loader.clear_master_data_cache()
+
+    parse = master_data_loader._parse_workbook
+    monkeypatch.setattr(master_data_loader, '_parse_workbook', lambda: pytest.fail('워크북을 다시 파싱함'))
+    assert channel_mapping.get_channel_name_by_id(2) == '호텔베드'
+
+    _write_workbook(workbook_path, [[2, '다보'], [7, '아고다']])
+    master_data_loader.clear_master_data_cache()
+    monkeypatch.setattr(master_data_loader, '_parse_workbook', parse)
+    assert channel_mapping.get_channel_name_by_id(2) == '다보'
+    assert channel_mapping.get_channel_ids_by_name('익스피디아') == []
+
+
+def test_missing_workbook_returns_empty_mappings(tmp_path, monkeypatch):
+    monkeypatch.setattr(master_data_loader, '_excel_path', str(tmp_path / 'missing.xlsx'))
+    master_data_loader.clear_master_data_cache()
+    try:
+        assert master_data_loader.get_date_type_options() == ['전체']
+        assert channel_mapping.load_master_data_mapping() == ({}, {})
+    finally:
+        master_data_loader.clear_master_data_cache()
+
+
+def test_check_swaps_snapshot_and_keeps_previous_on_failure(workbook_path, monkeypatch):
+    before = master_data_loader.load_master_data()
+    assert master_data_loader.check_master_data() is False
+
+    _write_workbook(workbook_path, [[2, '다보']])
+    parse = master_data_loader._parse_workbook
+    monkeypatch.setattr(master_data_loader, '_parse_workbook', lambda: 1 / 0)
+    assert master_data_loader.check_master_data() is False
+    assert master_data_loader.load_master_data() is before
+
+    monkeypatch.setattr(master_data_loader, '_parse_workbook', parse)
+    assert master_data_loader.check_master_data() is True
+    after = master_data_loader.load_master_data()
+    assert after is not before
+    assert after['meta']['source'] == 'workbook'
+    assert after['meta']['load_seconds'] >= 0
+    # 이전 스냅샷을 들고 있던 쪽은 그대로 이전 값을 봄
+    assert before['channel_id_to_name'] == {1: '익스피디아', 2: '호텔베드', 3: '익스피디아'}
+    assert channel_mapping.get_channel_name_by_id(2) == '다보'
+
+
+def test_watcher_reloads_in_background(workbook_path):
+    master_data_loader.load_master_data()
+    master_data_loader.start_master_data_watcher(interval=0.05)
+    try:
+        _write_workbook(workbook_path, [[5, '아고다']])
+        deadline = time.time() + 5
+        while channel_mapping.get_channel_name_by_id(5) != '아고다' and time.time() < deadline:
+            time.sleep(0.05)
+        assert channel_mapping.get_channel_name_by_id(5) == '아고다'
+    finally:
+        master_data_loader.stop_master_data_watcher()
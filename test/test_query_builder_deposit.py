@@ -0,0 +1,387 @@
+# test_query_builder_deposit.py
+"""입금가(order_item) 집계 쿼리 검증
+- 합성 데이터를 SQLite에 적재한 뒤 쿼리 빌더 결과와 pandas로 직접 계산한 값을 비교
+- order_item을 order_product 1건당 한 번만 집계해도 입금가/수익/수익률이 동일한지 확인
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import importlib.util
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+
+def _load_module(name, filename):
+    """점이 있는 파일명의 모듈 로드"""
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'utils', filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+query_builder_v1_5 = _load_module("query_builder_v1_5", "query_builder_v1.5.py")
+query_builder_hotel = _load_module("query_builder_hotel", "query_builder_hotel.py")
+
+TODAY = date.today()
+START_DATE = TODAY - timedelta(days=30)
+END_DATE = TODAY - timedelta(days=1)
+
+CONFIRMED = ['confirm', 'complete', 'pending']
+CANCELLED = ['cancel', 'cancelWait', 'fail']
+
+def _build_dataset(seed=7, n_orders=400):
+    """합성 예약 데이터 생성"""
+    rng = random.Random(seed)
+
+    common_code = pd.DataFrame([
+        {'idx': 1, 'parent_idx': 1, 'code_id': 10, 'code_name': '트립닷컴'},
+        {'idx': 2, 'parent_idx': 1, 'code_id': 20, 'code_name': '아고다'},
+        {'idx': 3, 'parent_idx': 1, 'code_id': 20, 'code_name': '아고다(중복)'},
+        {'idx': 4, 'parent_idx': 2, 'code_id': 30, 'code_name': '다른 그룹'},
+    ])
+    products = pd.DataFrame([
+        {'idx': i, 'product_code': f'H{i:04d}', 'name_kr': f'호텔{i}'} for i in range(1, 9)
+    ])
+    rateplans = pd.DataFrame([
+        {'idx': 1, 'sale_type': 'b2c'},
+        {'idx': 2, 'sale_type': 'b2b'},
+        {'idx': 3, 'sale_type': None},
+    ])
+
+    order_products, order_items, order_pays = [], [], []
+    op_idx = item_idx = 0
+    for order_no in range(n_orders):
+        created = datetime.combine(TODAY - timedelta(days=rng.randint(0, 35)), datetime.min.time()) \
+            + timedelta(minutes=rng.randint(0, 24 * 60 - 1))
+        channel_idx, order_type = rng.choice([(10, 'expedia'), (20, 'hotelbeds'), (30, 'dabo'), (40, 'hiot')])
+        for _ in range(rng.randint(1, 2)):
+            op_idx += 1
+            product_idx = rng.randint(1, 8)
+            terms = rng.choice([1, 2, 3, None])
+            pay_idx = op_idx if rng.random() < 0.9 else None
+            order_products.append({
+                'idx': op_idx,
+                'order_num': f'ORD{order_no:05d}',
+                'order_type': order_type,
+                'order_channel_idx': channel_idx,
+                'order_product_status': rng.choice(CONFIRMED + CANCELLED),
+                'create_date': created.strftime('%Y-%m-%d %H:%M:%S'),
+                'checkin_date': (created.date() + timedelta(days=rng.randint(0, 20))).isoformat(),
+                'terms': terms,
+                'room_cnt': rng.choice([1, 1, 2, None]),
+                'product_idx': product_idx,
+                'product_name': f'호텔{product_idx}',
+                'rateplan_idx': rng.choice([1, 2, 3, None]),
+                'order_pay_idx': pay_idx,
+            })
+            if pay_idx:
+                order_pays.append({'idx': pay_idx, 'total_amount': rng.randint(50, 500) * 1000})
+            # order_item은 숙박일수만큼 생성 (일부는 누락)
+            if rng.random() < 0.95:
+                for _ in range(terms or 1):
+                    item_idx += 1
+                    order_items.append({
+                        'idx': item_idx,
+                        'order_product_idx': op_idx,
+                        'due_price': rng.randint(30, 300) * 1000,
+                    })
+
+    return {
+        'common_code': common_code,
+        'product': products,
+        'product_rateplan': rateplans,
+        'order_product': pd.DataFrame(order_products),
+        'order_item': pd.DataFrame(order_items),
+        'order_pay': pd.DataFrame(order_pays),
+    }
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return _build_dataset()
+
+
+def fix_status_codes(monkeypatch, *modules):
+    """master_data.xlsx 의존성 제거 (전체 상태 조회, 확정/취소 그룹 고정)"""
+    for module in modules:
+        monkeypatch.setattr(module, 'get_all_order_status_codes', lambda: CONFIRMED + CANCELLED)
+        monkeypatch.setattr(
+            module, 'get_status_codes_by_group',
+            lambda group: {'확정': CONFIRMED, '취소': CANCELLED}.get(group, [])
+        )
+
+
+@pytest.fixture(scope='module')
+def engine(dataset, monkeypatch_module, make_sqlite_engine):
+    fix_status_codes(monkeypatch_module, query_builder_v1_5, query_builder_hotel)
+    return make_sqlite_engine(dataset, TODAY)
+
+
+@pytest.fixture(scope='module')
+def monkeypatch_module():
+    mp = pytest.MonkeyPatch()
+    yield mp
+    mp.undo()
+
+
+def _expected_rows(dataset, date_type):
+    """pandas로 직접 계산한 기준값 (order_product 1건 단위)"""
+    op = dataset['order_product'].copy()
+
+    if date_type == 'useDate':
+        op['booking_date'] = op['checkin_date']
+        in_range = (op['checkin_date'] >= START_DATE.isoformat()) & (op['checkin_date'] <= END_DATE.isoformat())
+    else:
+        op['booking_date'] = op['create_date'].str[:10]
+        in_range = (op['booking_date'] >= START_DATE.isoformat()) & (op['booking_date'] <= END_DATE.isoformat())
+    op = op[in_range & (op['create_date'] < TODAY.isoformat())]
+
+    due = dataset['order_item'].groupby('order_product_idx')['due_price'].sum()
+    op['deposit'] = op['idx'].map(due).fillna(0) * op['room_cnt'].fillna(1)
+    pay = dataset['order_pay'].set_index('idx')['total_amount']
+    op['purchase'] = op['order_pay_idx'].map(pay).fillna(0)
+    rooms = op['terms'].fillna(1) * op['room_cnt'].fillna(0)
+    op['total_rooms'] = rooms
+    op['confirmed_rooms'] = rooms.where(op['order_product_status'].isin(CONFIRMED), 0)
+    op['cancelled_rooms'] = rooms.where(op['order_product_status'].isin(CANCELLED), 0)
+
+    sale_types = dataset['product_rateplan'].set_index('idx')['sale_type']
+    op['sale_type'] = op['rateplan_idx'].map(sale_types).fillna('')
+    return op
+
+
+def _assert_measures(actual, expected):
+    """합계 및 파생 지표 비교"""
+    for col in ['total_rooms', 'confirmed_rooms', 'cancelled_rooms', 'total_deposit', 'total_purchase']:
+        assert actual[col].astype(float).tolist() == pytest.approx(expected[col].astype(float).tolist()), col
+
+    profit = expected['total_purchase'] - expected['total_deposit']
+    assert actual['total_profit'].astype(float).tolist() == pytest.approx(profit.astype(float).tolist())
+
+    profit_rate = (profit / expected['total_deposit'] * 100).where(expected['total_deposit'] != 0, 0)
+    assert actual['profit_rate'].astype(float).tolist() == pytest.approx(profit_rate.astype(float).tolist())
+
+    cancel_rate = (expected['cancelled_rooms'] / expected['total_rooms'] * 100).where(expected['total_rooms'] != 0, 0)
+    assert actual['cancellation_rate'].astype(float).tolist() == pytest.approx(cancel_rate.astype(float).tolist())
+
+
+@pytest.mark.parametrize('date_type', ['orderDate', 'useDate'])
+def test_integrated_query_deposit_matches_row_level_sum(dataset, engine, date_type):
+    query = query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, date_type, '전체', '전체')
+    actual = pd.read_sql(query, engine)
+
+    rows = _expected_rows(dataset, date_type)
+    expected = rows.groupby(['booking_date', 'order_channel_idx', 'sale_type']).agg(
+        booking_count=('order_num', 'nunique'),
+        total_rooms=('total_rooms', 'sum'),
+        confirmed_rooms=('confirmed_rooms', 'sum'),
+        cancelled_rooms=('cancelled_rooms', 'sum'),
+        total_deposit=('deposit', 'sum'),
+        total_purchase=('purchase', 'sum'),
+    ).reset_index()
+
+    actual = actual.sort_values(['booking_date', 'channel_idx', 'sale_type']).reset_index(drop=True)
+    expected = expected.sort_values(['booking_date', 'order_channel_idx', 'sale_type']).reset_index(drop=True)
+
+    assert len(actual) == len(expected)
+    assert actual['booking_count'].tolist() == expected['booking_count'].tolist()
+    _assert_measures(actual, expected)
+
+
+@pytest.mark.parametrize('date_type', ['orderDate', 'useDate'])
+def test_hotel_statistics_query_deposit_matches_row_level_sum(dataset, engine, date_type):
+    hotel_ids = [1, 2, 3, 5]
+    query = query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, hotel_ids, date_type, '전체', '전체')
+    actual = pd.read_sql(query, engine)
+
+    rows = _expected_rows(dataset, date_type)
+    rows = rows[rows['product_idx'].isin(hotel_ids)]
+    expected = rows.groupby(['booking_date', 'product_idx', 'order_channel_idx', 'sale_type']).agg(
+        booking_count=('order_num', 'nunique'),
+        total_rooms=('total_rooms', 'sum'),
+        confirmed_rooms=('confirmed_rooms', 'sum'),
+        cancelled_rooms=('cancelled_rooms', 'sum'),
+        total_deposit=('deposit', 'sum'),
+        total_purchase=('purchase', 'sum'),
+    ).reset_index()
+
+    actual = actual.sort_values(['booking_date', 'hotel_idx', 'channel_idx', 'sale_type']).reset_index(drop=True)
+    expected = expected.sort_values(['booking_date', 'product_idx', 'order_channel_idx', 'sale_type']).reset_index(drop=True)
+
+    assert len(actual) == len(expected)
+    assert actual['booking_count'].tolist() == expected['booking_count'].tolist()
+    _assert_measures(actual, expected)
+
+
+def test_summary_and_trend_revenue_match_row_level_sum(dataset, engine):
+    rows = _expected_rows(dataset, 'orderDate')
+
+    summary = pd.read_sql(query_builder_v1_5.build_summary_query(START_DATE, END_DATE, 'orderDate', '전체', '전체'), engine)
+    assert float(summary.iloc[0]['total_revenue']) == pytest.approx(rows['deposit'].sum())
+    assert int(summary.iloc[0]['total_bookings']) == rows['order_num'].nunique()
+
+    trend = pd.read_sql(query_builder_v1_5.build_daily_trend_query(START_DATE, END_DATE, 'orderDate', '전체', '전체'), engine)
+    expected = rows.groupby('booking_date')['deposit'].sum()
+    assert trend.set_index('date')['revenue'].astype(float).to_dict() == pytest.approx(expected.astype(float).to_dict())
+
+    hotel_summary = pd.read_sql(
+        query_builder_hotel.build_hotel_summary_query(START_DATE, END_DATE, [1, 2], 'orderDate', '전체', '전체'), engine
+    )
+    hotel_rows = rows[rows['product_idx'].isin([1, 2])]
+    assert float(hotel_summary.iloc[0]['total_revenue']) == pytest.approx(hotel_rows['deposit'].sum())
+
+
+@pytest.mark.parametrize('date_type', ['orderDate', 'useDate'])
+@pytest.mark.parametrize('sale_type', ['전체', 'b2b'])
+def test_summary_derived_from_detail_matches_summary_query(dataset, engine, date_type, sale_type):
+    data_fetcher_v1_5 = _load_module("data_fetcher_v1_5", "data_fetcher_v1.5.py")
+    data_fetcher_hotel = _load_module("data_fetcher_hotel", "data_fetcher_hotel.py")
+
+    detail = pd.read_sql(
+        query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, date_type, '전체', sale_type), engine)
+    summary = pd.read_sql(
+        query_builder_v1_5.build_summary_query(START_DATE, END_DATE, date_type, '전체', sale_type), engine).iloc[0]
+
+    derived = data_fetcher_v1_5.summarize_channel_data(detail)
+    assert derived['total_bookings'] == int(summary['total_bookings'])
+    assert derived['total_revenue'] == pytest.approx(float(summary['total_revenue']))
+    assert derived['channel_count'] == int(summary['channel_count'])
+    assert derived['active_days'] == int(summary['active_days'])
+
+    hotel_ids = [1, 2, 3, 5]
+    detail = pd.read_sql(
+        query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, hotel_ids, date_type, '전체', sale_type),
+        engine)
+    summary = pd.read_sql(
+        query_builder_hotel.build_hotel_summary_query(START_DATE, END_DATE, hotel_ids, date_type, '전체', sale_type),
+        engine).iloc[0]
+
+    derived = data_fetcher_hotel.summarize_hotel_data(detail)
+    assert derived['total_bookings'] == int(summary['total_bookings'])
+    assert derived['total_revenue'] == pytest.approx(float(summary['total_revenue']))
+    assert derived['hotel_count'] == int(summary['hotel_count'])
+    assert derived['active_days'] == int(summary['active_days'])
+
+
+def test_summary_prefers_exact_total_bookings_attr(dataset, engine):
+    data_fetcher_v1_5 = _load_module("data_fetcher_v1_5", "data_fetcher_v1.5.py")
+    data_fetcher_hotel = _load_module("data_fetcher_hotel", "data_fetcher_hotel.py")
+
+    # 롤업 조회 결과에는 원본 테이블 고유 예약건수가 attrs로 함께 전달됨
+    detail = pd.read_sql(query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, 'useDate'), engine)
+    detail.attrs['total_bookings'] = 3
+    assert data_fetcher_v1_5.summarize_channel_data(detail)['total_bookings'] == 3
+
+    detail = pd.read_sql(
+        query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, [1, 2], 'useDate'), engine)
+    assert data_fetcher_hotel.summarize_hotel_data(detail)['total_bookings'] == int(detail['order_count'].sum())
+    detail.attrs['total_bookings'] = 3
+    assert data_fetcher_hotel.summarize_hotel_data(detail)['total_bookings'] == 3
+
+
+@pytest.mark.parametrize('date_type', ['orderDate', 'useDate'])
+def test_fetchers_run_single_detail_query_with_labels(synthetic_db, date_type):
+    # 작업 스레드가 같은 DB를 보도록 파일 SQLite(synthetic_db) 사용
+    data_fetcher_v1_5 = _load_module("data_fetcher_v1_5", "data_fetcher_v1.5.py")
+    data_fetcher_hotel = _load_module("data_fetcher_hotel", "data_fetcher_hotel.py")
+    start, end = date(2025, 2, 1), date(2025, 2, 28)
+    hotel_ids = [1, 2, 3, 5]
+
+    channel = data_fetcher_v1_5.fetch_channel_data(start, end, None, date_type)
+    hotel = data_fetcher_hotel.fetch_hotel_data(start, end, hotel_ids, date_type)
+
+    # 상세 쿼리는 기간을 나누지 않고 한 번만 실행되며, 라벨 조회와 동시에 실행됨
+    assert {t['label'] for t in channel.attrs['query_timings']} == {'channel_labels', 'detail'}
+    assert {t['label'] for t in hotel.attrs['query_timings']} == {'channel_labels', 'hotel_labels', 'detail'}
+
+    single = pd.read_sql(data_fetcher_v1_5.build_integrated_query(start, end, None, date_type), synthetic_db)
+    assert not single.empty
+    assert channel['booking_date'].astype(str).tolist() == single['booking_date'].astype(str).tolist()
+    for col in ['booking_count', 'order_count', 'total_rooms', 'total_deposit', 'total_purchase']:
+        assert channel[col].astype(float).tolist() == pytest.approx(single[col].astype(float).tolist()), col
+
+    single = pd.read_sql(
+        data_fetcher_hotel.build_hotel_statistics_query(start, end, hotel_ids, date_type), synthetic_db)
+    assert not single.empty
+    assert int(hotel['order_count'].sum()) == int(single['order_count'].sum())
+    assert float(hotel['total_deposit'].sum()) == pytest.approx(float(single['total_deposit'].sum()))
+
+
+@pytest.mark.parametrize('sale_type', ['전체', 'b2b'])
+def test_detail_queries_read_order_product_once(sale_type):
+    # 입금가 집계와 주문번호 대표 행 선택이 같은 order_product 조회에서 계산됨
+    for query in (
+        query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, 'useDate', '전체', sale_type),
+        query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, [1, 2], 'orderDate', '전체', sale_type),
+    ):
+        assert query.text.count('order_product op') == 1
+        assert 'oi_sum' not in query.text and 'first_op' not in query.text
+
+
+def test_query_templates_are_reused_across_dates(engine):
+    first = query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, 'orderDate')
+    second = query_builder_v1_5.build_integrated_query(
+        START_DATE + timedelta(days=1), END_DATE - timedelta(days=1), None, 'orderDate')
+
+    # 기간이 달라도 SQL 본문은 같고 바인딩 값만 다름
+    assert first.text == second.text
+    assert first.compile().params['start_date'] != second.compile().params['start_date']
+    assert query_builder_v1_5._integrated_template.cache_info().hits > 0
+
+    hotel_a = query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, [1, 2], 'useDate')
+    hotel_b = query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, [3, 4, 5], 'useDate')
+    assert hotel_a.text == hotel_b.text
+    assert len(pd.read_sql(hotel_b, engine)['hotel_idx'].unique()) <= 3
+
+
+def test_channel_performance_query_groups_without_date(engine):
+    detail = pd.read_sql(query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, 'orderDate'), engine)
+    performance = pd.read_sql(
+        query_builder_v1_5.build_channel_performance_query(START_DATE, END_DATE, 'orderDate'), engine)
+
+    assert 'booking_date' not in performance.columns
+    assert not performance.duplicated(['channel_idx', 'sale_type']).any()
+    assert float(performance['total_deposit'].sum()) == pytest.approx(float(detail['total_deposit'].sum()))
+
+
+@pytest.mark.parametrize('selected', [None, [], ['전체'], ['전체', '트립닷컴']])
+def test_all_channels_query_has_no_channel_predicate(selected):
+    for build in (query_builder_v1_5.build_integrated_query, query_builder_v1_5.build_rollup_integrated_query):
+        query = build(START_DATE, END_DATE, selected, 'orderDate')
+        assert ':channel_idxs' not in query.text and ':channel_order_types' not in query.text
+        assert 'channel_idxs' not in query.compile().params
+        assert query.text == build(START_DATE, END_DATE, None, 'orderDate').text
+
+
+@pytest.mark.parametrize('selected', [['트립닷컴'], ['dabo'], ['트립닷컴', 'hiot']])
+def test_channel_filter_is_applied_in_sql(dataset, engine, monkeypatch, selected):
+    from utils import dimension_cache
+    import config.channel_mapping
+
+    monkeypatch.setattr(dimension_cache, 'get_db_connection', lambda: engine)
+    monkeypatch.setattr(config.channel_mapping, 'load_master_data_mapping', lambda: ({}, {}))
+    dimension_cache.clear_dimension_cache()
+    try:
+        everything = dimension_cache.attach_channel_labels(pd.read_sql(
+            query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, 'orderDate'), engine))
+        filtered = dimension_cache.attach_channel_labels(pd.read_sql(
+            query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, selected, 'orderDate'), engine))
+    finally:
+        dimension_cache.clear_dimension_cache()
+
+    # common_code 채널(idx 10)과 common_code에 없는 채널(order_type 라벨) 모두 SQL에서 걸러짐
+    keys = ['booking_date', 'channel_idx', 'sale_type']
+    expected = everything[everything['channel_name'].isin(selected)].sort_values(keys).reset_index(drop=True)
+    filtered = filtered.sort_values(keys).reset_index(drop=True)
+    assert set(filtered['channel_name']) == set(selected)
+    assert filtered['channel_idx'].tolist() == expected['channel_idx'].tolist()
+    for col in ['booking_count', 'hotel_count', 'total_rooms', 'total_deposit', 'total_purchase']:
+        assert filtered[col].astype(float).tolist() == pytest.approx(expected[col].astype(float).tolist()), col
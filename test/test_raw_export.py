@@ -0,0 +1,132 @@
+# test_raw_export.py
+"""원본 데이터(CSV/Parquet) 내보내기 검증
+- 합성 SQLite DB에서 서버 측 커서 구간 조회 결과가 fetch_* 결과와 같은지 확인
+- gzip CSV / Parquet 파일 내용 확인
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import codecs
+import gzip
+import importlib.util
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from config import configdb
+from utils.dimension_cache import clear_dimension_cache
+from utils.export_engine import HOTEL_REPORT_COLUMNS, PYARROW_AVAILABLE, write_report_csv, write_report_parquet
+from utils.frame_schema import concat_frames
+
+TODAY = date(2025, 3, 1)
+# conftest.synthetic_db 설정
+SYNTHETIC_DB = {'orders': 600, 'days': 30, 'products': 30, 'seed': 5, 'today': TODAY}
+KEYS = ['booking_date', 'hotel_idx', 'channel_idx', 'sale_type']
+
+
+def _sorted(df, keys):
+    return df.sort_values(keys, kind='stable').reset_index(drop=True)
+
+
+def test_iter_hotel_data_matches_fetch(synthetic_db):
+    from utils.data_fetcher_hotel import fetch_hotel_data, iter_hotel_data
+
+    chunks = list(iter_hotel_data('2025-02-01', '2025-02-28', chunk_rows=25))
+    assert len(chunks) > 1
+    streamed = concat_frames(chunks)
+    fetched = fetch_hotel_data('2025-02-01', '2025-02-28')
+
+    assert list(streamed.columns) == list(fetched.columns)
+    pd.testing.assert_frame_equal(_sorted(streamed, KEYS), _sorted(fetched, KEYS))
+
+
+def test_fetch_hotel_data_keeps_rows_without_product(synthetic_db):
+    from sqlalchemy import text
+    from utils.data_fetcher_hotel import fetch_hotel_data
+
+    before = fetch_hotel_data('2025-02-01', '2025-02-28')
+    with synthetic_db.begin() as conn:
+        conn.execute(text("UPDATE order_product SET product_idx = NULL WHERE idx = "
+                          "(SELECT MIN(idx) FROM order_product WHERE create_date >= '2025-02-01')"))
+    clear_dimension_cache()
+
+    # product_idx가 NULL인 행이 있어도 전체 결과가 비지 않음
+    fetched = fetch_hotel_data('2025-02-01', '2025-02-28')
+    assert not fetched.empty
+    assert str(fetched['hotel_idx'].dtype) == 'Int64'
+    assert fetched['hotel_idx'].isna().sum() == 1
+    assert fetched['total_rooms'].sum() == before['total_rooms'].sum()
+
+
+def test_iter_channel_data_applies_channel_filter(synthetic_db):
+    _path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'utils', 'data_fetcher_v1.5.py')
+    spec = importlib.util.spec_from_file_location('data_fetcher_v1_5', _path)
+    data_fetcher = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(data_fetcher)
+
+    streamed = concat_frames(list(data_fetcher.iter_channel_data('2025-02-01', '2025-02-28', ['호텔베드'],
+                                                                 chunk_rows=4)))
+    fetched = data_fetcher.fetch_channel_data('2025-02-01', '2025-02-28', ['호텔베드'])
+
+    assert not streamed.empty
+    assert set(streamed['channel_name']) == {'호텔베드'}
+    keys = ['booking_date', 'channel_idx', 'sale_type']
+    pd.testing.assert_frame_equal(_sorted(streamed, keys), _sorted(fetched, keys))
+
+
+def test_csv_export_writes_raw_values(synthetic_db):
+    from utils.data_fetcher_hotel import iter_hotel_data
+
+    fetched = concat_frames(list(iter_hotel_data('2025-02-01', '2025-02-07', chunk_rows=10)))
+    data = write_report_csv(iter_hotel_data('2025-02-01', '2025-02-07', chunk_rows=10), HOTEL_REPORT_COLUMNS)
+    raw = gzip.decompress(data.getvalue())
+    assert raw.startswith(codecs.BOM_UTF8)
+
+    result = pd.read_csv(BytesIO(raw), encoding='utf-8-sig', keep_default_na=False)
+    assert list(result.columns)[:3] == ['구매일(예약일)', '숙소명', '숙소코드']
+    assert len(result) == len(fetched)
+    assert result['총 입금가'].sum() == fetched['total_deposit'].sum()
+    assert result['수익률 (%)'].tolist() == pytest.approx(fetched['profit_rate'].tolist())
+
+
+def test_csv_export_without_rows_writes_header():
+    data = write_report_csv(iter([]), HOTEL_REPORT_COLUMNS, 'useDate')
+    header = gzip.decompress(data.getvalue()).decode('utf-8-sig').splitlines()
+    assert header == [','.join(['이용일(체크인)'] + [col['label'] for col in HOTEL_REPORT_COLUMNS[1:]])]
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason='pyarrow 미설치')
+def test_parquet_export_keeps_types():
+    import pyarrow.parquet as pq
+    chunk = pd.DataFrame({
+        'booking_date': pd.to_datetime(['2025-01-02', '2025-01-01']),
+        'hotel_name': ['서울 호텔', None],
+        'total_deposit': [1200, 0],
+        'profit_rate': [12.5, 0.0],
+    })
+    table = pq.read_table(BytesIO(write_report_parquet(iter([chunk, chunk]), HOTEL_REPORT_COLUMNS).getvalue()))
+
+    assert table.num_rows == 4
+    assert str(table.schema.field('구매일(예약일)').type) == 'date32[day]'
+    assert str(table.schema.field('총 입금가').type) == 'int64'
+    assert table.column('수익률 (%)').to_pylist() == [12.5, 0.0, 12.5, 0.0]
+
+
+def test_streaming_fetch_matches_buffered_fetch(synthetic_db, monkeypatch):
+    from utils import data_fetcher_hotel, query_executor
+
+    monkeypatch.setattr(query_executor, 'STREAM_CHUNK_ROWS', 9)
+    monkeypatch.setattr(data_fetcher_hotel, 'HOTEL_FETCH_STREAMING', True)
+    streamed = data_fetcher_hotel.fetch_hotel_data('2025-02-01', '2025-02-28')
+    monkeypatch.setattr(data_fetcher_hotel, 'HOTEL_FETCH_STREAMING', False)
+    buffered = data_fetcher_hotel.fetch_hotel_data('2025-02-01', '2025-02-28')
+
+    assert len(streamed) > 9
+    pd.testing.assert_frame_equal(streamed, buffered)
+    assert streamed.attrs['peak_memory_bytes'] > 0
+    assert buffered.attrs['peak_memory_bytes'] > 0
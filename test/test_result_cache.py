@@ -0,0 +1,125 @@
+# test_result_cache.py
+"""조회 결과 디스크 캐시 검증
+- 파라미터 정규화 키, 마감/진행 기간 TTL, 적중/미적중 카운터, 용량 제한 삭제
+- master_data가 다시 로드되면(워크북 버전 변경) 이전 결과를 사용하지 않음
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from utils import result_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'RESULT_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(result_cache, 'RESULT_CACHE_ENABLED', True)
+    result_cache.clear_result_cache()
+    return tmp_path
+
+
+def _fetcher(calls):
+    @result_cache.cached_result(name='fetch_test')
+    def fetch(start_date, end_date, selected_ids=None, date_type='orderDate'):
+        calls.append((start_date, end_date))
+        df = pd.DataFrame({'booking_date': [end_date], 'booking_count': [len(calls)]})
+        df.attrs['query_timings'] = [{'label': 'detail', 'wait': 0.0, 'elapsed': 0.1}]
+        df.attrs['peak_memory_bytes'] = 1024
+        df.attrs['total_bookings'] = 7
+        return df
+    return fetch
+
+
+def test_identical_parameters_hit_disk_cache():
+    calls = []
+    fetch = _fetcher(calls)
+    end = date.today() - timedelta(days=1)
+
+    first = fetch(end - timedelta(days=6), end, [3, 1, 2])
+    # 날짜 형식/목록 순서/기본값 생략 여부가 달라도 같은 키
+    second = fetch(str(end - timedelta(days=6)), pd.Timestamp(end), selected_ids=[1, 2, 3], date_type='orderDate')
+
+    assert len(calls) == 1
+    assert second['booking_count'].tolist() == first['booking_count'].tolist()
+    assert second.attrs['query_timings'][0]['label'] == 'cache'
+    # 조회 통계는 지우고 결과 값(total_bookings)은 유지
+    assert 'peak_memory_bytes' not in second.attrs
+    assert second.attrs['total_bookings'] == 7
+
+    fetch(end - timedelta(days=6), end, [1, 2], 'useDate')
+    assert len(calls) == 2
+
+    stats = result_cache.get_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['writes'], stats['entries']) == (1, 2, 2, 2)
+
+
+def test_master_data_reload_changes_key(monkeypatch):
+    from config import master_data_loader
+
+    calls = []
+    fetch = _fetcher(calls)
+    end = date.today() - timedelta(days=1)
+    snapshot = dict(master_data_loader.load_master_data())
+
+    monkeypatch.setattr(master_data_loader, '_snapshot', {**snapshot, 'meta': {'workbook': [1, 100]}})
+    fetch(end - timedelta(days=6), end)
+    fetch(end - timedelta(days=6), end)
+    assert len(calls) == 1
+
+    # 워크북이 수정되어 감시 스레드가 스냅샷을 교체한 경우
+    monkeypatch.setattr(master_data_loader, '_snapshot', {**snapshot, 'meta': {'workbook': [2, 120]}})
+    fetch(end - timedelta(days=6), end)
+    assert len(calls) == 2
+
+
+def test_ttl_depends_on_whether_range_is_closed(monkeypatch):
+    today = date.today()
+    assert result_cache.ttl_for_range(today - timedelta(days=1)) == result_cache.RESULT_CACHE_TTL_CLOSED
+    assert result_cache.ttl_for_range(today) == result_cache.RESULT_CACHE_TTL_OPEN
+    assert result_cache.ttl_for_range(today + timedelta(days=30)) == result_cache.RESULT_CACHE_TTL_OPEN
+
+    # 만료된 항목은 다시 조회
+    monkeypatch.setattr(result_cache, 'RESULT_CACHE_TTL_OPEN', -1)
+    calls = []
+    fetch = _fetcher(calls)
+    fetch(today - timedelta(days=6), today)
+    fetch(today - timedelta(days=6), today)
+    assert len(calls) == 2
+
+
+def test_empty_results_are_not_cached():
+    calls = []
+
+    @result_cache.cached_result()
+    def fetch(start_date, end_date):
+        calls.append(1)
+        return pd.DataFrame()
+
+    fetch('2025-01-01', '2025-01-07')
+    fetch('2025-01-01', '2025-01-07')
+    assert len(calls) == 2
+    assert result_cache.get_cache_stats()['entries'] == 0
+
+
+def test_eviction_keeps_total_size_bounded(cache_dir):
+    payload = 'x' * 20000
+    for i in range(5):
+        result_cache.put(f'key{i}', payload, ttl=60)
+        # 먼저 저장한 항목이 가장 오래 사용하지 않은 항목이 되도록 시각 조정
+        os.utime(cache_dir / f'key{i}.pkl', (time.time() - 100 + i, time.time() - 100 + i))
+    # key0 사용 -> 최근 사용으로 갱신
+    assert result_cache.get('key0') == (True, payload)
+
+    result_cache._evict(max_bytes=3 * 21000)
+
+    remaining = sorted(p.stem for p in cache_dir.glob('*.pkl'))
+    assert remaining == ['key0', 'key3', 'key4']
+    assert result_cache.get_cache_stats()['evictions'] == 2
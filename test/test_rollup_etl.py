@@ -0,0 +1,199 @@
+# test_rollup_etl.py
+"""롤업 테이블 ETL 검증
+- 합성 데이터를 SQLite에 적재 후 롤업 테이블을 생성하고,
+  롤업 조회 쿼리 결과가 원본 테이블 조회 결과와 같은지 확인
+- 예약 상태 변경 후 증분 갱신 결과도 원본과 같은지 확인
+- 구매일/체크인일이 바뀐 예약은 이전 날짜의 롤업 행도 다시 계산되는지 확인
+- common_code에 없는 채널은 idx가 같아도 order_type별로 따로 집계되는지 확인
+- 롤업 조회 시 요약 통계용 고유 예약건수 쿼리가 원본 조회와 같은지 확인
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from test_query_builder_deposit import (
+    query_builder_v1_5,
+    query_builder_hotel,
+    _build_dataset,
+    fix_status_codes,
+    TODAY,
+    START_DATE,
+    END_DATE,
+    CONFIRMED,
+    CANCELLED,
+)
+from utils import rollup_etl
+
+KEYS = ['booking_date', 'channel_idx', 'order_type', 'sale_type']
+HOTEL_KEYS = ['booking_date', 'hotel_idx', 'channel_idx', 'order_type', 'sale_type']
+HOTEL_IDS = [1, 2, 3, 5]
+
+
+@pytest.fixture
+def engine(monkeypatch, make_sqlite_engine):
+    dataset = _build_dataset(seed=11)
+    # 변경 감지 컬럼 (생성 시각으로 초기화)
+    dataset['order_product']['update_date'] = dataset['order_product']['create_date']
+
+    fix_status_codes(monkeypatch, query_builder_v1_5, query_builder_hotel, rollup_etl)
+    return make_sqlite_engine(dataset, TODAY)
+
+
+def _read_sorted(query, engine, keys):
+    df = pd.read_sql(query, engine)
+    df['booking_date'] = pd.to_datetime(df['booking_date'])
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+def _assert_same(rollup, live, keys, date_type):
+    assert len(rollup) == len(live)
+    # 구매일 기준 + 숙소 필터 없음: 주문번호의 모든 행이 같은 날짜이므로 대표 행 수가 그룹별로 일치
+    if date_type == 'orderDate' and 'hotel_idx' not in keys:
+        assert rollup['order_count'].tolist() == live['order_count'].tolist()
+    for col in keys + ['order_type', 'channel_code']:
+        assert rollup[col].tolist() == live[col].tolist(), col
+    for col in ['booking_count', 'total_rooms', 'confirmed_rooms', 'cancelled_rooms', 'total_deposit',
+                'total_purchase', 'total_profit', 'profit_rate', 'cancellation_rate']:
+        assert rollup[col].astype(float).tolist() == pytest.approx(live[col].astype(float).tolist()), col
+
+
+def _assert_rollup_matches_live(engine):
+    for date_type in ('orderDate', 'useDate'):
+        live = _read_sorted(
+            query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, date_type), engine, KEYS)
+        rollup = _read_sorted(
+            query_builder_v1_5.build_rollup_integrated_query(START_DATE, END_DATE, None, date_type), engine, KEYS)
+        _assert_same(rollup, live, KEYS, date_type)
+
+        live = _read_sorted(
+            query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, HOTEL_IDS, date_type),
+            engine, HOTEL_KEYS)
+        rollup = _read_sorted(
+            query_builder_hotel.build_rollup_hotel_statistics_query(START_DATE, END_DATE, HOTEL_IDS, date_type),
+            engine, HOTEL_KEYS)
+        _assert_same(rollup, live, HOTEL_KEYS, date_type)
+
+
+def test_full_rollup_matches_live_queries(engine):
+    result = rollup_etl.run_rollup(engine=engine)
+
+    assert result['mode'] == 'full'
+    _assert_rollup_matches_live(engine)
+
+
+def test_incremental_rollup_picks_up_status_changes(engine):
+    rollup_etl.run_rollup(engine=engine)
+
+    # 일부 예약을 취소로 변경 (변경 시각은 마지막 실행 이후)
+    with engine.begin() as conn:
+        changed = conn.execute(text(
+            "UPDATE order_product SET order_product_status = 'cancel', update_date = '2999-01-01 00:00:00' "
+            "WHERE idx % 7 = 0 AND order_product_status IN ('confirm', 'complete', 'pending')"
+        )).rowcount
+    assert changed > 0
+
+    result = rollup_etl.run_rollup(engine=engine)
+
+    assert result['mode'] == 'incremental'
+    assert 0 < result['orderDate']['ranges']
+    _assert_rollup_matches_live(engine)
+
+
+def test_incremental_rollup_rebuilds_previous_dates_of_moved_rows(engine):
+    rollup_etl.run_rollup(engine=engine)
+
+    # 일부 주문의 구매일/체크인일을 다른 날짜로 이동 (이전 날짜에는 더 이상 집계되면 안 됨)
+    moved_day = (END_DATE - timedelta(days=3)).isoformat()
+    with engine.begin() as conn:
+        moved = conn.execute(text(
+            f"UPDATE order_product SET create_date = '{moved_day} 12:00:00', checkin_date = '{moved_day}', "
+            "update_date = '2999-01-01 00:00:00' "
+            "WHERE order_num IN (SELECT order_num FROM order_product "
+            f"WHERE idx % 5 = 0 AND DATE(create_date) <> '{moved_day}' AND create_date < '{TODAY.isoformat()}')"
+        )).rowcount
+    assert moved > 0
+
+    result = rollup_etl.run_rollup(engine=engine)
+
+    assert result['mode'] == 'incremental'
+    assert result['orderDate']['ranges'] > 1
+    _assert_rollup_matches_live(engine)
+
+
+def test_unmapped_channels_sharing_idx_keep_their_order_types(engine, monkeypatch):
+    from utils import dimension_cache
+    import config.channel_mapping
+
+    # common_code에 없는 두 채널(dabo, hiot)이 같은 idx로 들어온 경우
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE order_product SET order_channel_idx = 50 WHERE order_type IN ('dabo', 'hiot')"))
+    rollup_etl.run_rollup(engine=engine)
+    _assert_rollup_matches_live(engine)
+
+    monkeypatch.setattr(dimension_cache, 'get_db_connection', lambda: engine)
+    monkeypatch.setattr(config.channel_mapping, 'load_master_data_mapping', lambda: ({}, {}))
+    dimension_cache.clear_dimension_cache()
+    try:
+        frames = {
+            'live': pd.read_sql(
+                query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, 'orderDate'), engine),
+            'rollup': pd.read_sql(
+                query_builder_v1_5.build_rollup_integrated_query(START_DATE, END_DATE, None, 'orderDate'), engine),
+            'hotel': pd.read_sql(
+                query_builder_hotel.build_hotel_statistics_query(START_DATE, END_DATE, None, 'orderDate'), engine),
+            'hotel_rollup': pd.read_sql(
+                query_builder_hotel.build_rollup_hotel_statistics_query(START_DATE, END_DATE, None, 'orderDate'),
+                engine),
+        }
+        frames = {name: dimension_cache.attach_channel_labels(df) for name, df in frames.items()}
+    finally:
+        dimension_cache.clear_dimension_cache()
+
+    op = pd.read_sql("SELECT * FROM order_product", engine)
+    op = op[(op['create_date'] >= START_DATE.isoformat()) & (op['create_date'] < TODAY.isoformat())]
+    expected_rooms = (op['terms'].fillna(1) * op['room_cnt'].fillna(0)).groupby(op['order_type']).sum()
+
+    for name, df in frames.items():
+        shared = df[df['channel_idx'] == 50]
+        assert set(shared['channel_name']) == {'dabo', 'hiot'}, name
+        # 행마다 하나의 order_type만 포함 (라벨과 일치)
+        assert (shared['channel_code'] == shared['channel_name']).all(), name
+        rooms = shared.groupby('channel_name')['total_rooms'].sum().astype(float)
+        assert rooms.to_dict() == pytest.approx(expected_rooms[['dabo', 'hiot']].astype(float).to_dict()), name
+
+
+@pytest.mark.parametrize('date_type', ['orderDate', 'useDate'])
+@pytest.mark.parametrize('sale_type', ['전체', 'b2b'])
+def test_booking_count_query_matches_live_total(engine, date_type, sale_type):
+    rollup_etl.run_rollup(engine=engine)
+
+    # 롤업 조회 시 요약 통계 예약건수로 쓰는 값은 원본 상세 쿼리의 order_count 합계(기간 전체 고유 건수)와 같음
+    live = pd.read_sql(
+        query_builder_v1_5.build_integrated_query(START_DATE, END_DATE, None, date_type, '전체', sale_type), engine)
+    count = pd.read_sql(
+        query_builder_v1_5.build_booking_count_query(START_DATE, END_DATE, None, date_type, '전체', sale_type), engine)
+    assert int(count.iloc[0]['total_bookings']) == int(live['order_count'].sum())
+
+    live = pd.read_sql(query_builder_hotel.build_hotel_statistics_query(
+        START_DATE, END_DATE, HOTEL_IDS, date_type, '전체', sale_type), engine)
+    count = pd.read_sql(query_builder_hotel.build_hotel_booking_count_query(
+        START_DATE, END_DATE, HOTEL_IDS, date_type, '전체', sale_type), engine)
+    assert int(count.iloc[0]['total_bookings']) == int(live['order_count'].sum())
+
+
+def test_date_ranges_merges_contiguous_days():
+    days = pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-05']).date
+
+    assert rollup_etl._date_ranges(days) == [
+        (days[0], days[2]),
+        (days[3], days[3]),
+    ]
+    assert len(rollup_etl._date_ranges(pd.date_range('2025-01-01', '2025-03-01').date, chunk_days=31)) == 2
@@ -0,0 +1,173 @@
+# utils/access_log_report.py
+"""JSON 접근 로그 지연시간 분석
+- logs/{앱}_access.jsonl 및 로테이션된 파일(.jsonl.1, .jsonl.2, ...)을 읽어
+  작업별 / 작업 × 조회 기간 길이별 / 작업 × 일별 elapsed_ms의 p50/p95/p99를 출력
+- 배포 전후 일별 추이를 비교해 성능 저하를 확인하는 용도 (ACCESS_LOG_JSON=true 필요)
+
+사용법:
+    python utils/access_log_report.py                         # 기본 로그 디렉토리, 전체 앱
+    python utils/access_log_report.py --app hotel --since 2025-03-01
+    python utils/access_log_report.py --log-dir /var/log/app --action search --output latency.json
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import glob
+import json
+
+import pandas as pd
+
+# 조회 기간 길이 구간 (일수 상한, 라벨)
+DAY_BUCKETS = [(1, '1일'), (7, '2~7일'), (31, '8~31일'), (92, '32~92일'), (None, '93일 이상')]
+
+PERCENTILES = {'p50': 0.5, 'p95': 0.95, 'p99': 0.99}
+
+
+def find_log_files(log_dir, app=None):
+    """접근 로그 파일 목록 (로테이션된 파일 포함, 오래된 파일부터)"""
+    pattern = f"{app}_access.jsonl*" if app else "*access.jsonl*"
+    paths = glob.glob(os.path.join(log_dir, pattern))
+
+    def age(path):
+        suffix = path.rsplit('.jsonl', 1)[1].lstrip('.')
+        return -int(suffix) if suffix.isdigit() else 0
+
+    return sorted(paths, key=lambda path: (os.path.basename(path).split('.jsonl')[0], age(path)))
+
+
+def load_events(paths):
+    """
+    JSON 줄을 DataFrame으로 읽음 (JSON이 아닌 줄은 건너뜀)
+
+    Returns:
+        pandas DataFrame (ts는 datetime, 없는 항목은 NaN)
+    """
+    events = []
+    skipped = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    skipped += 1
+    if skipped:
+        print(f"⚠️ JSON이 아닌 줄 {skipped}개 건너뜀")
+
+    df = pd.DataFrame(events)
+    if not df.empty:
+        df['ts'] = pd.to_datetime(df['ts'], errors='coerce')
+    return df
+
+
+def _day_bucket(days):
+    if pd.isna(days):
+        return '기간 없음'
+    for limit, label in DAY_BUCKETS:
+        if limit is None or days <= limit:
+            return label
+    return DAY_BUCKETS[-1][1]
+
+
+def _latency(grouped):
+    """그룹별 건수 / p50 / p95 / p99 / 최대 (ms)"""
+    elapsed = grouped['elapsed_ms']
+    result = pd.DataFrame({'count': elapsed.size()})
+    for name, q in PERCENTILES.items():
+        result[name] = elapsed.quantile(q)
+    result['max'] = elapsed.max()
+    return result.round(1)
+
+
+def summarize(df, action=None, status='success', since=None):
+    """
+    지연시간 분위수 집계
+
+    Args:
+        df: load_events 결과
+        action: 특정 작업만 (None이면 전체)
+        status: 'success' / 'error' / None(전체)
+        since: 이 날짜 이후 로그만 (YYYY-MM-DD)
+
+    Returns:
+        dict: {'by_action', 'by_range', 'by_day'} (각각 pandas DataFrame)
+    """
+    if df.empty or 'elapsed_ms' not in df.columns:
+        empty = pd.DataFrame(columns=['count', *PERCENTILES, 'max'])
+        return {'by_action': empty, 'by_range': empty, 'by_day': empty}
+
+    df = df[df['elapsed_ms'].notna()]
+    if action:
+        df = df[df['action'] == action]
+    if status:
+        df = df[df['status'] == status]
+    if since:
+        df = df[df['ts'] >= pd.Timestamp(since)]
+
+    days = df['days'] if 'days' in df.columns else pd.Series(float('nan'), index=df.index)
+    bucket_order = [label for _, label in DAY_BUCKETS] + ['기간 없음']
+    df = df.assign(
+        day=df['ts'].dt.date,
+        range=pd.Categorical(days.map(_day_bucket), categories=bucket_order, ordered=True)
+    )
+
+    return {
+        'by_action': _latency(df.groupby('action')),
+        'by_range': _latency(df.groupby(['action', 'range'], observed=True)),
+        'by_day': _latency(df.groupby(['action', 'day'])),
+    }
+
+
+def _print_table(title, table):
+    print(f"\n📊 {title}")
+    if table.empty:
+        print("  (기록 없음)")
+        return
+    print(table.to_string())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='JSON 접근 로그 지연시간 분석 (p50/p95/p99)')
+    parser.add_argument('--log-dir', help='로그 디렉토리 (기본값: 앱 로그 디렉토리)')
+    parser.add_argument('--app', help='앱 이름 (channels / hotel, 기본값: 전체)')
+    parser.add_argument('--action', help='작업 이름 (search / excel_download / raw_export)')
+    parser.add_argument('--status', default='success', help="상태 (success / error / all, 기본값: success)")
+    parser.add_argument('--since', help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--output', help='결과 JSON 경로')
+    args = parser.parse_args(argv)
+
+    log_dir = args.log_dir
+    if not log_dir:
+        from utils.logger import _log_dir
+        log_dir = str(_log_dir)
+
+    paths = find_log_files(log_dir, args.app)
+    if not paths:
+        print(f"❌ 접근 로그 파일이 없습니다: {log_dir} (ACCESS_LOG_JSON=true로 기록)")
+        return 1
+    print(f"📂 로그 파일 {len(paths)}개: {', '.join(os.path.basename(path) for path in paths)}")
+
+    status = None if args.status == 'all' else args.status
+    result = summarize(load_events(paths), action=args.action, status=status, since=args.since)
+    _print_table("작업별 지연시간 (ms)", result['by_action'])
+    _print_table("작업 × 조회 기간별 지연시간 (ms)", result['by_range'])
+    _print_table("작업 × 일별 지연시간 (ms)", result['by_day'])
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({name: json.loads(table.reset_index().to_json(orient='records', force_ascii=False,
+                                                                   date_format='iso'))
+                       for name, table in result.items()}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,20 @@
 # utils/auth.py
-"""인증 모듈 - 사용자 로그인 및 세션 관리"""
+"""인증 모듈 - 사용자 로그인 및 세션 관리
+- 로그인 시 HMAC 서명 + 만료 시각이 들어간 인증 토큰을 쿠키(auth_token)에 저장
+- 새로고침 시 첫 스크립트 실행에서 요청 쿠키의 토큰을 서버에서 검증하여 세션 복원
+  (DB 조회 및 JavaScript 리다이렉트 없음)
+- 로그아웃 시 사용자별 로그아웃 시각을 서버에 기록하여, 그 전에 발급된 토큰은 쿠키가 남아 있어도 거부
+"""
 
 import os
 import sys
+import base64
+import hmac
+import secrets
+import tempfile
+import time
 from datetime import datetime, timedelta
+from http.cookies import SimpleCookie
 from typing import Dict, Optional
 import bcrypt
 import hashlib
@@ -15,12 +26,214 @@ if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
 from config.configdb import get_db_connection
-from utils.logger import log_auth, log_error
+from utils.logger import is_log_enabled, log_auth, log_error
 
 # 세션 타임아웃 설정 (초)
 SESSION_TIMEOUT_SECONDS = 3600  # 1시간
 SESSION_WARNING_SECONDS = 300   # 5분 전 경고
 
+# 인증 토큰 쿠키 설정
+AUTH_COOKIE_NAME = 'auth_token'
+AUTH_TOKEN_TTL_SECONDS = int(os.getenv('AUTH_TOKEN_TTL_SECONDS', 86400))  # 1일 (쿠키 유효기간과 동일)
+# 사용자별 로그아웃 시각 기록 디렉토리 (서버 여러 대면 공유 저장소 경로 지정)
+AUTH_LOGOUT_DIR = os.getenv('AUTH_LOGOUT_DIR') or os.path.join(_project_root, '.auth_logout')
+# 서명 키 파일이 비어 있을 때 (다른 프로세스가 쓰는 중) 다시 읽는 횟수/간격
+_SECRET_READ_RETRIES = 20
+_SECRET_READ_INTERVAL = 0.05
+
+
+def _load_token_secret() -> bytes:
+    """
+    토큰 서명 키
+
+    .env의 AUTH_TOKEN_SECRET을 사용하고, 없으면 프로젝트 루트의 .auth_secret 파일
+    (최초 1회 생성, 권한 600)을 사용합니다. 파일도 만들 수 없으면 프로세스별 임시 키를 사용합니다
+    (재시작 후에는 다시 로그인 필요).
+
+    키는 임시 파일에 다 쓴 뒤 하드 링크로 .auth_secret에 올리므로 다른 프로세스가 빈 파일을 읽지 않고,
+    동시에 시작한 프로세스 중 먼저 올린 키 하나만 사용됩니다 (이미 있으면 덮어쓰지 않음).
+    """
+    secret = os.getenv('AUTH_TOKEN_SECRET')
+    if secret:
+        return secret.encode('utf-8')
+
+    secret_path = os.path.join(_project_root, '.auth_secret')
+    try:
+        if not os.path.exists(secret_path):
+            fd, tmp_path = tempfile.mkstemp(dir=_project_root, prefix='.auth_secret.')  # 권한 600
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(secrets.token_hex(32))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.link(tmp_path, secret_path)
+            except FileExistsError:
+                pass
+            finally:
+                os.unlink(tmp_path)
+
+        # 이전 방식으로 만드는 중인 파일 등은 내용이 생길 때까지 다시 읽음
+        for _ in range(_SECRET_READ_RETRIES):
+            with open(secret_path, 'r') as f:
+                secret = f.read().strip()
+            if secret:
+                return secret.encode('utf-8')
+            time.sleep(_SECRET_READ_INTERVAL)
+        print("⚠️ 인증 토큰 서명 키 파일이 비어 있음, 프로세스 임시 키 사용")
+    except OSError as e:
+        print(f"⚠️ 인증 토큰 서명 키 파일 사용 불가 ({e}), 프로세스 임시 키 사용")
+    return secrets.token_bytes(32)
+
+
+_TOKEN_SECRET = _load_token_secret()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_TOKEN_SECRET, payload.encode('ascii'), hashlib.sha256).digest())
+
+
+def create_auth_token(admin_id: str, now: Optional[float] = None) -> str:
+    """
+    인증 토큰 생성 ("admin_id(base64url).만료시각.서명", 쿠키 값으로 그대로 사용 가능)
+
+    Args:
+        admin_id: 로그인한 사용자 ID
+        now: 기준 시각 (기본값: 현재 시각)
+    """
+    expires = int((time.time() if now is None else now) + AUTH_TOKEN_TTL_SECONDS)
+    payload = f"{_b64encode(str(admin_id).encode('utf-8'))}.{expires}"
+    return f"{payload}.{_sign(payload)}"
+
+
+def _logout_path(admin_id: str) -> str:
+    """사용자별 로그아웃 시각 파일 경로 (파일명은 admin_id 해시)"""
+    name = hashlib.sha256(str(admin_id).encode('utf-8')).hexdigest()
+    return os.path.join(AUTH_LOGOUT_DIR, name)
+
+
+def _last_logout(admin_id: str) -> Optional[int]:
+    """사용자의 마지막 로그아웃 시각 (기록이 없으면 None)"""
+    try:
+        with open(_logout_path(admin_id), 'r') as f:
+            return int(f.read().strip())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log_error("WARNING", "로그아웃 기록 읽기 실패", exception=e, admin_id=admin_id)
+        return None
+
+
+def revoke_auth_tokens(admin_id: str, now: Optional[float] = None) -> bool:
+    """
+    사용자에게 지금까지 발급된 인증 토큰을 모두 무효화 (로그아웃 시각 기록)
+
+    쿠키 삭제는 브라우저에 맡기므로, 복사해 둔 토큰이나 삭제되지 않은 쿠키로도 세션을 복원할 수 없도록
+    서버에서 로그아웃 시각 이전에 발급된 토큰을 거부합니다. 같은 사용자의 다른 브라우저 세션도 함께 만료됩니다.
+    기록은 임시 파일에 쓴 뒤 os.replace로 교체합니다 (읽는 쪽은 이전 값 또는 새 값만 봄).
+
+    Returns:
+        bool: 기록 성공 여부
+    """
+    logout_at = int(time.time() if now is None else now)
+    try:
+        os.makedirs(AUTH_LOGOUT_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=AUTH_LOGOUT_DIR, prefix='.tmp.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(logout_at))
+            os.replace(tmp_path, _logout_path(admin_id))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+    except OSError as e:
+        log_error("ERROR", "로그아웃 기록 실패", exception=e, admin_id=admin_id)
+        return False
+
+
+def verify_auth_token(token: Optional[str], now: Optional[float] = None) -> Optional[str]:
+    """
+    인증 토큰 검증
+
+    Returns:
+        str: 서명이 맞고, 만료되지 않았고, 발급 후 로그아웃하지 않았으면 admin_id, 아니면 None
+    """
+    try:
+        encoded_id, expires, signature = token.split('.')
+        if not hmac.compare_digest(signature, _sign(f"{encoded_id}.{expires}")):
+            return None
+        if int(expires) <= (time.time() if now is None else now):
+            return None
+        admin_id = _b64decode(encoded_id).decode('utf-8') or None
+    except (AttributeError, ValueError, UnicodeError):
+        return None
+
+    # 발급 시각(만료 시각 - 유효 시간)이 마지막 로그아웃 시각 이전이면 거부
+    last_logout = _last_logout(admin_id) if admin_id else None
+    if last_logout is not None and int(expires) - AUTH_TOKEN_TTL_SECONDS <= last_logout:
+        return None
+    return admin_id
+
+
+def get_request_cookies() -> Dict[str, str]:
+    """
+    현재 세션 요청의 쿠키 (첫 스크립트 실행부터 사용 가능)
+
+    st.context.cookies가 있으면(Streamlit 1.37+) 사용하고,
+    없으면 WebSocket 연결 요청 헤더의 Cookie를 읽습니다.
+    """
+    try:
+        import streamlit as st
+        if hasattr(st, 'context') and hasattr(st.context, 'cookies'):
+            cookies = st.context.cookies
+            return cookies.to_dict() if hasattr(cookies, 'to_dict') else dict(cookies)
+
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+        headers = _get_websocket_headers() or {}
+        cookie_header = headers.get('Cookie') or headers.get('cookie') or ''
+        parsed = SimpleCookie()
+        parsed.load(cookie_header)
+        return {name: morsel.value for name, morsel in parsed.items()}
+    except Exception as e:
+        log_error("WARNING", "요청 쿠키 읽기 실패", exception=e)
+        return {}
+
+
+def restore_auth_from_token(session_state, cookies: Optional[Dict[str, str]] = None) -> bool:
+    """
+    요청 쿠키의 인증 토큰으로 세션 상태 복원
+
+    Args:
+        session_state: st.session_state
+        cookies: 요청 쿠키 (기본값: get_request_cookies())
+
+    Returns:
+        bool: 복원 성공 여부
+    """
+    if cookies is None:
+        cookies = get_request_cookies()
+    token = cookies.get(AUTH_COOKIE_NAME)
+    if not token:
+        return False
+
+    admin_id = verify_auth_token(token)
+    if not admin_id:
+        log_auth("WARNING", "인증 토큰 검증 실패 (서명 불일치, 만료 또는 로그아웃)", ip=get_user_ip())
+        return False
+
+    session_state['authenticated'] = True
+    session_state['admin_id'] = admin_id
+    log_auth("INFO", "쿠키에서 인증 정보 복원 (서명 토큰)", admin_id=admin_id)
+    return True
+
 
 def get_user_ip() -> Optional[str]:
     """사용자 IP 주소 가져오기 (Streamlit)"""
@@ -254,8 +467,9 @@ def is_authenticated(session_state) -> bool:
     has_admin_id_key = 'admin_id' in session_state
     admin_id_value = session_state.get('admin_id') if has_admin_id_key else None
     
-    # 디버깅 로그 (너무 많이 찍히지 않도록 조건부)
-    if not has_authenticated_key or not authenticated_value or not has_admin_id_key or not admin_id_value:
+    # 디버깅 로그 (너무 많이 찍히지 않도록 조건부, DEBUG 로그가 꺼져 있으면 인자도 만들지 않음)
+    if (not has_authenticated_key or not authenticated_value or not has_admin_id_key or not admin_id_value) \
+            and is_log_enabled("DEBUG"):
         log_auth("DEBUG", "인증 체크 실패 상세", 
                  has_authenticated_key=has_authenticated_key,
                  authenticated_value=authenticated_value,
@@ -274,12 +488,16 @@ def is_authenticated(session_state) -> bool:
 
 
 def logout(session_state):
-    """로그아웃"""
+    """로그아웃 (세션 정보 삭제 및 이 사용자에게 발급된 인증 토큰 무효화)"""
     admin_id = session_state.get('admin_id', 'unknown')
     ip = get_user_ip()
     
     log_auth("INFO", "로그아웃", admin_id=admin_id, ip=ip)
     
+    # 쿠키 삭제와 관계없이 서버에서 토큰 거부
+    if session_state.get('admin_id'):
+        revoke_auth_tokens(session_state.get('admin_id'))
+    
     # 세션 정보 삭제
     if 'authenticated' in session_state:
         del session_state.authenticated
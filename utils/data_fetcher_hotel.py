@@ -10,8 +10,17 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
-from sqlalchemy import text
 from config.configdb import get_db_connection
+from utils.dimension_cache import (
+    attach_channel_labels,
+    attach_hotel_labels,
+    get_channel_names,
+    get_product_labels
+)
+from utils.rollup_etl import USE_ROLLUP_TABLE
+from utils.query_executor import MemoryTracker, frame_bytes, read_sql_chunks, run_concurrently
+from utils.frame_schema import HOTEL_DATA_SCHEMA, apply_schema, concat_frames
+from utils.result_cache import cached_result
 # 점이 있는 파일명은 직접 import 불가하므로 importlib 사용
 import importlib.util
 _query_builder_path = os.path.join(os.path.dirname(__file__), 'query_builder_hotel.py')
@@ -22,16 +31,112 @@ spec.loader.exec_module(query_builder_hotel)
 
 from query_builder_hotel import (  # type: ignore
     build_hotel_statistics_query,
+    build_rollup_hotel_statistics_query,
+    build_hotel_booking_count_query,
     build_hotel_summary_query
 )
 
+# 상세 쿼리를 서버 측 커서로 구간별 조회(STREAM_CHUNK_ROWS)하여 바로 정리할지 여부 (.env에서 조정 가능)
+# false면 전체 결과를 한 번에 읽은 뒤 정리
+HOTEL_FETCH_STREAMING = os.getenv('HOTEL_FETCH_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+
+# fetch_hotel_data 반환 컬럼 순서
+HOTEL_DATA_COLUMNS = [
+    'booking_date', 'hotel_name', 'hotel_idx', 'hotel_code', 'channel_name', 'channel_idx',
+    'channel_code', 'sale_type', 'booking_count', 'order_count', 'total_rooms', 'confirmed_rooms',
+    'cancelled_rooms', 'cancellation_rate', 'total_deposit', 'total_purchase',
+    'total_profit', 'profit_rate'
+]
+
+
+def _normalize_hotel_data(df):
+    """조회 결과(전체 또는 구간) 라벨 부여, 반환 컬럼 순서 및 저장 타입(HOTEL_DATA_SCHEMA) 적용"""
+    # 숙소명/숙소코드/채널명은 집계 후 캐시에서 부여 (정수 키로만 GROUP BY)
+    df = attach_hotel_labels(df)
+    df = attach_channel_labels(df)
+    return apply_schema(df.reindex(columns=HOTEL_DATA_COLUMNS), HOTEL_DATA_SCHEMA)
+
+
+def _read_hotel_detail(query, engine, tracker):
+    """
+    상세 쿼리 조회 후 정리된 DataFrame 목록 반환
+    
+    스트리밍 모드에서는 서버 측 커서에서 구간을 읽을 때마다 타입 정리/라벨 부여를 하므로
+    클라이언트에 원본 결과 전체가 쌓이지 않습니다. 구간은 호출한 쪽에서 한 번에 합치며,
+    보유 메모리는 tracker에 기록합니다.
+    """
+    chunks = read_sql_chunks(query, engine) if HOTEL_FETCH_STREAMING else [pd.read_sql(query, engine)]
+    
+    parts = []
+    for chunk in chunks:
+        raw_bytes = frame_bytes(chunk)
+        tracker.add(raw_bytes)
+        part = _normalize_hotel_data(chunk)
+        tracker.add(frame_bytes(part))
+        tracker.release(raw_bytes)
+        parts.append(part)
+    return parts
+
+
+def _concat_tracked(parts, tracker):
+    """구간 DataFrame을 합침 (합치는 동안에는 구간과 결과가 함께 메모리에 있음)"""
+    if len(parts) == 1:
+        return parts[0]
+    held = tracker.current
+    tracker.add(held)
+    df = concat_frames(parts)
+    tracker.release(held)
+    return df
+
+
+def _read_rollup_hotel_data(engine, start_date, end_date, selected_hotel_ids, date_type, sale_type, tracker):
+    """롤업 테이블 조회 (구간 DataFrame 목록, 실패 시 None 반환 - 원본 테이블로 조회)"""
+    try:
+        query = build_rollup_hotel_statistics_query(
+            start_date, 
+            end_date, 
+            selected_hotel_ids=selected_hotel_ids,
+            date_type=date_type,
+            order_status='전체',
+            sale_type=sale_type
+        )
+        return _read_hotel_detail(query, engine, tracker)
+    except Exception as e:
+        print(f"⚠️ 롤업 테이블 조회 실패, 원본 테이블로 조회합니다: {e}")
+        return None
+
 
+def _read_booking_count(engine, start_date, end_date, selected_hotel_ids, date_type, sale_type):
+    """원본 테이블 기준 조회 기간 고유 예약건수 (실패 시 None 반환 - order_count 합계 사용)"""
+    try:
+        query = build_hotel_booking_count_query(
+            start_date, 
+            end_date, 
+            selected_hotel_ids=selected_hotel_ids,
+            date_type=date_type,
+            order_status='전체',
+            sale_type=sale_type
+        )
+        return int(pd.read_sql(query, engine).iloc[0]['total_bookings'] or 0)
+    except Exception as e:
+        print(f"⚠️ 예약건수 조회 실패, 롤업 order_count 합계를 사용합니다: {e}")
+        return None
+
+
+@cached_result()
 def fetch_hotel_data(start_date, end_date, selected_hotel_ids=None,
                      date_type='orderDate', order_status='전체', sale_type='전체'):
     """
     숙소별 예약 데이터 조회
     날짜별 + 숙소별 + 채널별 집계
     
+    숙소/채널 라벨 캐시 로드와 상세 쿼리는 서로 독립적이므로 공유 executor에서 동시에 실행합니다.
+    HOTEL_FETCH_STREAMING이면 상세 결과를 서버 측 커서로 나누어 읽으며 바로 정리합니다.
+    작업별 소요 시간은 df.attrs['query_timings'], 조회 중 보유한 DataFrame 메모리 최대값은
+    df.attrs['peak_memory_bytes']에 기록됩니다.
+    롤업 테이블을 사용하면 요약 통계용 고유 예약건수를 원본 테이블에서 함께 조회하여
+    df.attrs['total_bookings']에 기록합니다 (롤업 order_count는 날짜별 대표 행 기준이므로).
+    
     Args:
         start_date: 시작일
         end_date: 종료일  
@@ -46,32 +151,62 @@ def fetch_hotel_data(start_date, end_date, selected_hotel_ids=None,
     try:
         engine = get_db_connection()
         
-        # 쿼리 실행 (order_status는 항상 '전체'로 고정)
-        query = build_hotel_statistics_query(
-            start_date, 
-            end_date, 
-            selected_hotel_ids=selected_hotel_ids,
-            date_type=date_type,
-            order_status='전체',  # 항상 '전체'로 고정
-            sale_type=sale_type
-        )
+        # 상세 쿼리와 독립적인 라벨 조회 (선택된 숙소는 미리 알 수 있으므로 함께 로드)
+        tasks = {'channel_labels': get_channel_names}
+        if selected_hotel_ids:
+            tasks['hotel_labels'] = (get_product_labels, (selected_hotel_ids,))
         
-        df = pd.read_sql(query, engine)
+        parts = None
+        total_bookings = None
+        timings = []
+        tracker = MemoryTracker()
+        
+        # 롤업 테이블 사용 시 일별 집계 행만 조회 (실패하면 원본 테이블로 조회)
+        # 요약 통계 예약건수는 기간 전체 고유 건수가 필요하므로 원본 테이블에서 동시에 조회
+        if USE_ROLLUP_TABLE:
+            tasks['detail'] = (
+                _read_rollup_hotel_data,
+                (engine, start_date, end_date, selected_hotel_ids, date_type, sale_type, tracker)
+            )
+            tasks['total_bookings'] = (
+                _read_booking_count,
+                (engine, start_date, end_date, selected_hotel_ids, date_type, sale_type)
+            )
+            results, timings = run_concurrently(tasks)
+            parts = results['detail']
+            if parts is not None:
+                total_bookings = results['total_bookings']
+            tasks = {}
+        
+        if parts is None:
+            # 상세 쿼리는 전체 기간을 한 번에 조회 (order_status는 항상 '전체'로 고정)
+            query = build_hotel_statistics_query(
+                start_date, 
+                end_date, 
+                selected_hotel_ids=selected_hotel_ids,
+                date_type=date_type,
+                order_status='전체',  # 항상 '전체'로 고정
+                sale_type=sale_type
+            )
+            tasks['detail'] = (_read_hotel_detail, (query, engine, tracker))
+            
+            results, detail_timings = run_concurrently(tasks)
+            timings += detail_timings
+            parts = results['detail']
+        
+        df = _concat_tracked(parts, tracker)
         
-        # 데이터 타입 정리
         if not df.empty:
-            df['booking_date'] = pd.to_datetime(df['booking_date'])
-            df['hotel_idx'] = df['hotel_idx'].astype(int)
-            df['booking_count'] = df['booking_count'].astype(int)
-            df['total_rooms'] = df['total_rooms'].fillna(0).astype(int)
-            df['confirmed_rooms'] = df['confirmed_rooms'].fillna(0).astype(int)
-            df['cancelled_rooms'] = df['cancelled_rooms'].fillna(0).astype(int)
-            df['cancellation_rate'] = df['cancellation_rate'].fillna(0).round(1)  # 소수점 1자리
-            df['total_deposit'] = df['total_deposit'].fillna(0).round(0).astype(int)
-            df['total_purchase'] = df['total_purchase'].fillna(0).round(0).astype(int)
-            df['total_profit'] = df['total_profit'].fillna(0).round(0).astype(int)
-            df['profit_rate'] = df['profit_rate'].fillna(0).round(1)  # 소수점 1자리
+            df = df.sort_values(
+                ['booking_date', 'hotel_name', 'channel_name'],
+                ascending=[False, True, True],
+                kind='stable'
+            ).reset_index(drop=True)
         
+        df.attrs['query_timings'] = timings
+        df.attrs['peak_memory_bytes'] = tracker.peak
+        if total_bookings is not None:
+            df.attrs['total_bookings'] = total_bookings
         return df
         
     except Exception as e:
@@ -81,6 +216,95 @@ def fetch_hotel_data(start_date, end_date, selected_hotel_ids=None,
         return pd.DataFrame()
 
 
+def iter_hotel_data(start_date, end_date, selected_hotel_ids=None,
+                    date_type='orderDate', sale_type='전체', chunk_rows=None):
+    """
+    숙소별 예약 데이터를 서버 측 커서에서 구간별로 조회 (CSV/Parquet 내보내기용)
+    
+    fetch_hotel_data와 같은 컬럼/값을 반환하지만 전체 DataFrame을 만들지 않습니다.
+    행 순서는 쿼리의 날짜 내림차순이며, 같은 날짜 안의 숙소/채널 순서는 정렬하지 않습니다.
+    조회 오류는 호출한 쪽으로 그대로 전달됩니다 (결과 캐시 미사용).
+    
+    Args:
+        start_date: 시작일
+        end_date: 종료일
+        selected_hotel_ids: 선택된 숙소 ID 리스트 (None이면 전체)
+        date_type: 날짜유형 ('useDate', 'orderDate')
+        sale_type: 판매유형 ('전체', 'b2c', 'b2b')
+        chunk_rows: 구간 행 수 (None이면 STREAM_CHUNK_ROWS)
+    
+    Yields:
+        pandas DataFrame: 구간별 조회 결과
+    """
+    engine = get_db_connection()
+    
+    # 롤업 테이블 사용 시 첫 구간을 가져올 때까지 실패하면 원본 테이블로 조회
+    if USE_ROLLUP_TABLE:
+        try:
+            query = build_rollup_hotel_statistics_query(
+                start_date, 
+                end_date, 
+                selected_hotel_ids=selected_hotel_ids,
+                date_type=date_type,
+                order_status='전체',
+                sale_type=sale_type
+            )
+            chunks = read_sql_chunks(query, engine, chunk_rows)
+            first = next(chunks, None)
+        except Exception as e:
+            print(f"⚠️ 롤업 테이블 조회 실패, 원본 테이블로 조회합니다: {e}")
+            chunks = None
+        
+        if chunks is not None:
+            if first is not None:
+                yield _normalize_hotel_data(first)
+            for chunk in chunks:
+                yield _normalize_hotel_data(chunk)
+            return
+    
+    query = build_hotel_statistics_query(
+        start_date, 
+        end_date, 
+        selected_hotel_ids=selected_hotel_ids,
+        date_type=date_type,
+        order_status='전체',  # 항상 '전체'로 고정
+        sale_type=sale_type
+    )
+    for chunk in read_sql_chunks(query, engine, chunk_rows):
+        yield _normalize_hotel_data(chunk)
+
+
+def summarize_hotel_data(df):
+    """
+    숙소별 상세 데이터(fetch_hotel_data 결과)에서 요약 통계 계산
+    별도 요약 쿼리 없이 한 번의 조회 결과로 요약 시트/화면 값을 만듦
+    
+    total_bookings는 df.attrs['total_bookings'](롤업 조회 시 원본 테이블 고유 건수)가 있으면 그 값,
+    없으면 order_count 합계입니다.
+    
+    Args:
+        df: fetch_hotel_data 결과
+    
+    Returns:
+        dict: fetch_hotel_summary_stats와 같은 형식의 요약 통계
+    """
+    if df is None or df.empty:
+        return {
+            'total_bookings': 0,
+            'total_revenue': 0,
+            'hotel_count': 0,
+            'active_days': 0
+        }
+    
+    return {
+        'total_bookings': int(df.attrs.get('total_bookings', df['order_count'].sum())),
+        'total_revenue': float(df['total_deposit'].sum()),
+        'hotel_count': int(df['hotel_idx'].nunique()),
+        'active_days': int(df['booking_date'].nunique())
+    }
+
+
+@cached_result()
 def fetch_hotel_summary_stats(start_date, end_date, selected_hotel_ids=None,
                               date_type='orderDate', order_status='전체', sale_type='전체'):
     """
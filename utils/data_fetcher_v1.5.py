@@ -7,8 +7,12 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
-from sqlalchemy import text
 from config.configdb import get_db_connection
+from utils.dimension_cache import attach_channel_labels, get_channel_names, resolve_channel_filter
+from utils.rollup_etl import USE_ROLLUP_TABLE
+from utils.query_executor import read_sql_chunks, run_concurrently
+from utils.frame_schema import CHANNEL_DATA_SCHEMA, apply_schema
+from utils.result_cache import cached_result
 # 점이 있는 파일명은 직접 import 불가하므로 importlib 사용
 import importlib.util
 _query_builder_path = os.path.join(os.path.dirname(__file__), 'query_builder_v1.5.py')
@@ -19,16 +23,77 @@ spec.loader.exec_module(query_builder_v1_5)
 
 from query_builder_v1_5 import (  # type: ignore
     build_integrated_query, 
+    build_rollup_integrated_query,
+    build_booking_count_query,
     build_summary_query,
     build_daily_trend_query,
     build_channel_performance_query
 )
 
+# fetch_channel_data 반환 컬럼 순서
+CHANNEL_DATA_COLUMNS = [
+    'booking_date', 'channel_name', 'channel_idx', 'channel_code', 'sale_type',
+    'booking_count', 'order_count', 'hotel_count', 'total_rooms', 'confirmed_rooms', 'cancelled_rooms',
+    'cancellation_rate', 'total_deposit', 'total_purchase', 'total_profit', 'profit_rate'
+]
+
+def _normalize_channel_data(df, channel_filter=None):
+    """조회 결과(전체 또는 구간) 채널명 부여, 반환 컬럼 순서 및 저장 타입(CHANNEL_DATA_SCHEMA) 적용"""
+    # 채널명은 집계 후 common_code 캐시에서 부여 (정수 키로만 GROUP BY)
+    df = attach_channel_labels(df)
+    df = apply_schema(df.reindex(columns=CHANNEL_DATA_COLUMNS), CHANNEL_DATA_SCHEMA)
+    
+    if not df.empty:
+        # SQL 필터는 키 기준이므로, 부여된 채널명으로 한 번 더 확인
+        # (common_code에 있는 채널이 다른 채널의 order_type과 겹치는 경우 등)
+        if channel_filter:
+            df = df[df['channel_name'].isin(channel_filter['channel_names'])]
+    return df
+
+def _read_rollup_channel_data(engine, start_date, end_date, selected_channels, date_type, sale_type):
+    """롤업 테이블 조회 (실패 시 None 반환 - 원본 테이블로 조회)"""
+    try:
+        query = build_rollup_integrated_query(
+            start_date, 
+            end_date, 
+            selected_channels=selected_channels,
+            date_type=date_type,
+            order_status='전체',
+            sale_type=sale_type
+        )
+        return pd.read_sql(query, engine)
+    except Exception as e:
+        print(f"⚠️ 롤업 테이블 조회 실패, 원본 테이블로 조회합니다: {e}")
+        return None
+
+def _read_booking_count(engine, start_date, end_date, selected_channels, date_type, sale_type):
+    """원본 테이블 기준 조회 기간 고유 예약건수 (실패 시 None 반환 - order_count 합계 사용)"""
+    try:
+        query = build_booking_count_query(
+            start_date, 
+            end_date, 
+            selected_channels=selected_channels,
+            date_type=date_type,
+            order_status='전체',
+            sale_type=sale_type
+        )
+        return int(pd.read_sql(query, engine).iloc[0]['total_bookings'] or 0)
+    except Exception as e:
+        print(f"⚠️ 예약건수 조회 실패, 롤업 order_count 합계를 사용합니다: {e}")
+        return None
+
+@cached_result()
 def fetch_channel_data(start_date, end_date, selected_channels=None,
                       date_type='orderDate', order_status='전체', sale_type='전체'):
     """
     채널별 예약 데이터 조회
     
+    선택된 채널은 조회 전에 order_channel_idx / order_type 키로 변환하여 WHERE 조건으로 적용합니다.
+    채널 라벨 캐시 로드와 상세 쿼리는 서로 독립적이므로 공유 executor에서 동시에 실행합니다.
+    작업별 소요 시간은 df.attrs['query_timings']에 기록됩니다.
+    롤업 테이블을 사용하면 요약 통계용 고유 예약건수를 원본 테이블에서 함께 조회하여
+    df.attrs['total_bookings']에 기록합니다 (롤업 order_count는 날짜별 대표 행 기준이므로).
+    
     Args:
         start_date: 시작일
         end_date: 종료일  
@@ -43,82 +108,54 @@ def fetch_channel_data(start_date, end_date, selected_channels=None,
     try:
         engine = get_db_connection()
         
-        # 채널명 매핑: master_data.xlsx와 common_code를 활용한 정확한 매핑
-        valid_channel_names = set()
-        if selected_channels and '전체' not in selected_channels:
-            # master_data.xlsx의 매핑 데이터 로드
-            try:
-                from config.channel_mapping import load_master_data_mapping, get_channel_ids_by_name
-                channel_id_to_name, channel_name_to_ids = load_master_data_mapping()
-            except:
-                channel_id_to_name = {}
-                channel_name_to_ids = {}
-            
-            # 1. common_code에서 선택된 채널의 code_name과 code_id 가져오기
-            query_mapping = """
-            SELECT 
-                cc.code_name,
-                cc.code_id
-            FROM common_code cc
-            WHERE cc.parent_idx = 1
-                AND cc.code_name IN ({})
-            """.format(','.join([f"'{c}'" for c in selected_channels]))
-            
-            try:
-                df_mapping = pd.read_sql(query_mapping, engine)
-                if not df_mapping.empty:
-                    valid_channel_names.update(df_mapping['code_name'].tolist())
-                    
-                    # master_data.xlsx의 매핑을 활용하여 추가 채널명 찾기
-                    for _, row in df_mapping.iterrows():
-                        code_id = row['code_id']
-                        code_name = row['code_name']
-                        if code_id in channel_id_to_name:
-                            master_name = channel_id_to_name[code_id]
-                            if master_name != code_name:
-                                valid_channel_names.add(master_name)
-            except:
-                pass
-            
-            # 2. channels.py의 채널명 추가
-            from config.channels import CHANNEL_CONFIG
-            for config in CHANNEL_CONFIG['order_product'].values():
-                if config['name'] in selected_channels:
-                    valid_channel_names.add(config['name'])
-            
-            # 3. 선택된 채널명 자체도 추가
-            valid_channel_names.update(selected_channels)
+        # 선택된 채널 -> SQL 필터 키 (채널 라벨 캐시 사용, None이면 전체 채널)
+        channel_filter = resolve_channel_filter(selected_channels)
+        query_channels = selected_channels if channel_filter else None
         
-        # 쿼리 실행 (order_status는 항상 '전체'로 고정)
-        query = build_integrated_query(
-            start_date, 
-            end_date, 
-            selected_channels=None,  # 쿼리 내에서 필터링
-            date_type=date_type,
-            order_status='전체',  # 항상 '전체'로 고정
-            sale_type=sale_type
-        )
+        # 상세 쿼리와 독립적인 조회 작업
+        tasks = {'channel_labels': get_channel_names}
         
-        df = pd.read_sql(query, engine)
+        df = None
+        total_bookings = None
+        timings = []
         
-        # 데이터 타입 정리
-        if not df.empty:
-            df['booking_date'] = pd.to_datetime(df['booking_date'])
-            df['booking_count'] = df['booking_count'].astype(int)
-            df['hotel_count'] = df['hotel_count'].astype(int)
-            df['total_rooms'] = df['total_rooms'].fillna(0).astype(int)
-            df['confirmed_rooms'] = df['confirmed_rooms'].fillna(0).astype(int)
-            df['cancelled_rooms'] = df['cancelled_rooms'].fillna(0).astype(int)
-            df['cancellation_rate'] = df['cancellation_rate'].fillna(0).round(1)  # 소수점 1자리
-            df['total_deposit'] = df['total_deposit'].fillna(0).round(0).astype(int)
-            df['total_purchase'] = df['total_purchase'].fillna(0).round(0).astype(int)
-            df['total_profit'] = df['total_profit'].fillna(0).round(0).astype(int)
-            df['profit_rate'] = df['profit_rate'].fillna(0).round(1)  # 소수점 1자리
+        # 롤업 테이블 사용 시 일별 집계 행만 조회 (실패하면 원본 테이블로 조회)
+        # 요약 통계 예약건수는 기간 전체 고유 건수가 필요하므로 원본 테이블에서 동시에 조회
+        if USE_ROLLUP_TABLE:
+            tasks['detail'] = (_read_rollup_channel_data,
+                               (engine, start_date, end_date, query_channels, date_type, sale_type))
+            tasks['total_bookings'] = (_read_booking_count,
+                                       (engine, start_date, end_date, query_channels, date_type, sale_type))
+            results, timings = run_concurrently(tasks)
+            df = results.pop('detail')
+            if df is not None:
+                total_bookings = results['total_bookings']
+            tasks = {}
+        else:
+            results = {}
+        
+        if df is None:
+            # 상세 쿼리는 전체 기간을 한 번에 조회 (order_status는 항상 '전체'로 고정)
+            query = build_integrated_query(
+                start_date, 
+                end_date, 
+                selected_channels=query_channels,
+                date_type=date_type,
+                order_status='전체',  # 항상 '전체'로 고정
+                sale_type=sale_type
+            )
+            tasks['detail'] = (pd.read_sql, (query, engine))
             
-            # 채널 필터링 (선택된 채널이 있고 '전체'가 아닌 경우)
-            if selected_channels and '전체' not in selected_channels and valid_channel_names:
-                df = df[df['channel_name'].isin(valid_channel_names)]
+            detail_results, detail_timings = run_concurrently(tasks)
+            results.update(detail_results)
+            timings += detail_timings
+            df = results['detail']
+        
+        df = _normalize_channel_data(df, channel_filter)
         
+        df.attrs['query_timings'] = timings
+        if total_bookings is not None:
+            df.attrs['total_bookings'] = total_bookings
         return df
         
     except Exception as e:
@@ -127,6 +164,99 @@ def fetch_channel_data(start_date, end_date, selected_channels=None,
         traceback.print_exc()
         return pd.DataFrame()
 
+def iter_channel_data(start_date, end_date, selected_channels=None,
+                      date_type='orderDate', sale_type='전체', chunk_rows=None):
+    """
+    채널별 예약 데이터를 서버 측 커서에서 구간별로 조회 (CSV/Parquet 내보내기용)
+    
+    fetch_channel_data와 같은 컬럼/값/순서(날짜 내림차순)를 반환하지만 전체 DataFrame을 만들지 않습니다.
+    조회 오류는 호출한 쪽으로 그대로 전달됩니다 (결과 캐시 미사용).
+    
+    Args:
+        start_date: 시작일
+        end_date: 종료일
+        selected_channels: 선택된 채널 리스트
+        date_type: 날짜유형 ('useDate', 'orderDate')
+        sale_type: 판매유형 ('전체', 'b2c', 'b2b')
+        chunk_rows: 구간 행 수 (None이면 STREAM_CHUNK_ROWS)
+    
+    Yields:
+        pandas DataFrame: 구간별 조회 결과
+    """
+    engine = get_db_connection()
+    channel_filter = resolve_channel_filter(selected_channels)
+    query_channels = selected_channels if channel_filter else None
+    
+    # 롤업 테이블 사용 시 첫 구간을 가져올 때까지 실패하면 원본 테이블로 조회
+    if USE_ROLLUP_TABLE:
+        try:
+            query = build_rollup_integrated_query(
+                start_date, 
+                end_date, 
+                selected_channels=query_channels,
+                date_type=date_type,
+                order_status='전체',
+                sale_type=sale_type
+            )
+            chunks = read_sql_chunks(query, engine, chunk_rows)
+            first = next(chunks, None)
+        except Exception as e:
+            print(f"⚠️ 롤업 테이블 조회 실패, 원본 테이블로 조회합니다: {e}")
+            chunks = None
+        
+        if chunks is not None:
+            if first is not None:
+                yield _normalize_channel_data(first, channel_filter)
+            for chunk in chunks:
+                yield _normalize_channel_data(chunk, channel_filter)
+            return
+    
+    query = build_integrated_query(
+        start_date, 
+        end_date, 
+        selected_channels=query_channels,
+        date_type=date_type,
+        order_status='전체',  # 항상 '전체'로 고정
+        sale_type=sale_type
+    )
+    for chunk in read_sql_chunks(query, engine, chunk_rows):
+        yield _normalize_channel_data(chunk, channel_filter)
+
+def summarize_channel_data(df):
+    """
+    채널별 상세 데이터(fetch_channel_data 결과)에서 요약 통계 계산
+    별도 요약 쿼리 없이 한 번의 조회 결과로 요약 시트/화면 값을 만듦
+    전체 채널(selected_channels=None)로 조회한 결과이면 fetch_summary_stats와 같은 값이며,
+    채널을 선택해 조회한 결과이면 선택한 채널만의 요약입니다 (앱은 이때 fetch_summary_stats 사용)
+    
+    - total_bookings: df.attrs['total_bookings'](롤업 조회 시 원본 테이블 고유 건수)가 있으면 그 값,
+      없으면 order_count 합계 (주문번호별 대표 행만 1로 집계되어 중복 없음)
+    - channel_count: channel_code(order_type 목록)의 고유 개수
+    
+    Args:
+        df: fetch_channel_data 결과
+    
+    Returns:
+        dict: fetch_summary_stats와 같은 형식의 요약 통계
+    """
+    if df is None or df.empty:
+        return {
+            'total_bookings': 0,
+            'total_revenue': 0,
+            'channel_count': 0,
+            'active_days': 0
+        }
+    
+    channel_codes = df['channel_code'].dropna().astype(str).str.split(', ').explode()
+    
+    return {
+        'total_bookings': int(df.attrs.get('total_bookings', df['order_count'].sum())),
+        'total_revenue': float(df['total_deposit'].sum()),
+        'channel_count': int(channel_codes[channel_codes != ''].nunique()),
+        'active_days': int(df['booking_date'].nunique())
+    }
+
+@cached_result()
 def fetch_summary_stats(start_date, end_date, date_type='orderDate', order_status='전체', sale_type='전체'):
     """
     요약 통계 조회
@@ -288,6 +418,9 @@ def fetch_channel_performance(start_date, end_date, date_type='orderDate', order
             df['total_purchase'] = df['total_purchase'].fillna(0).round(0).astype(int)
             df['total_profit'] = df['total_profit'].fillna(0).round(0).astype(int)
             df['profit_rate'] = df['profit_rate'].fillna(0).round(1)
+        
+        df = attach_channel_labels(df)
+        df = df.drop(columns=['order_type'], errors='ignore')
             
         return df
         
@@ -0,0 +1,246 @@
+# utils/dimension_cache.py
+"""디멘션(라벨) 캐시 모듈
+- 채널명: common_code (parent_idx = 1) code_id -> code_name
+- 숙소명/숙소코드/등록일: product idx -> name_kr, product_code, reg_date
+- 통계 쿼리는 정수 키로만 집계하고, 사람이 읽는 라벨은 조회 후 이 캐시에서 붙임
+- TTL이 지나면 다음 조회 시 DB에서 다시 읽음 (실패 시 이전 값 유지)
+- 숙소는 요청한 idx 중 없거나 만료된 idx와 캐시의 다른 만료 항목을 한 번의 쿼리로 다시 채움
+  (product에 없는 idx도 TTL 동안 기억하여 반복 조회하지 않음)
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+import pandas as pd
+from sqlalchemy import bindparam, text
+from config.configdb import get_db_connection
+
+# 캐시 유지 시간 (초)
+DIMENSION_CACHE_TTL = int(os.getenv('DIMENSION_CACHE_TTL', 600))
+# 숙소 한 번 조회 시 IN 목록 최대 길이 (이보다 많이 요청하면 나누어 조회)
+PRODUCT_BATCH_SIZE = int(os.getenv('PRODUCT_BATCH_SIZE', 1000))
+
+# 채널 라벨 캐시
+_channel_names = None
+_channel_loaded_at = 0.0
+
+# 숙소 라벨 캐시 (idx -> {'product_code', 'name_kr', 'reg_date', 'loaded_at'}, product에 없는 idx는 None 라벨)
+_products = {}
+
+_lock = threading.Lock()
+
+# 숙소 라벨 조회 (idx 목록은 expanding 바인딩 파라미터)
+_PRODUCT_LABEL_QUERY = text("""
+    SELECT
+        idx,
+        product_code,
+        name_kr,
+        reg_date
+    FROM product
+    WHERE idx IN :ids
+""").bindparams(bindparam('ids', expanding=True))
+
+
+def get_channel_names(force_refresh=False):
+    """
+    채널 code_id -> code_name 매핑 반환
+
+    같은 code_id가 여러 번 등록된 경우 common_code.idx가 가장 작은 이름을 사용합니다.
+
+    Returns:
+        dict: {code_id(int): code_name(str)}
+    """
+    global _channel_names, _channel_loaded_at
+
+    if not force_refresh and _channel_names is not None \
+            and time.time() - _channel_loaded_at < DIMENSION_CACHE_TTL:
+        return _channel_names
+
+    with _lock:
+        if not force_refresh and _channel_names is not None \
+                and time.time() - _channel_loaded_at < DIMENSION_CACHE_TTL:
+            return _channel_names
+
+        try:
+            engine = get_db_connection()
+            query = """
+            SELECT
+                cc.code_id,
+                cc.code_name
+            FROM common_code cc
+            WHERE cc.parent_idx = 1
+                AND cc.code_name IS NOT NULL
+            ORDER BY cc.idx
+            """
+            df = pd.read_sql(query, engine)
+
+            channel_names = {}
+            for code_id, code_name in zip(df['code_id'], df['code_name']):
+                if pd.isna(code_id):
+                    continue
+                # 먼저 나온 이름(idx가 작은 값) 우선
+                channel_names.setdefault(int(code_id), str(code_name))
+
+            _channel_names = channel_names
+            _channel_loaded_at = time.time()
+        except Exception as e:
+            print(f"❌ 채널 라벨 조회 오류: {e}")
+            if _channel_names is None:
+                return {}
+
+    return _channel_names
+
+
+def resolve_channel_filter(selected_channels):
+    """
+    선택된 채널명 -> SQL 채널 필터 키
+
+    조회 결과의 channel_name은 common_code 이름(order_channel_idx 기준)이고,
+    common_code에 없는 채널은 order_type이므로 두 키를 함께 반환합니다.
+    - master_data.xlsx channels 시트에서 같은 ID로 등록된 다른 채널명도 같은 채널로 취급
+    - config.channels의 채널명은 해당 order_type으로 변환
+
+    Args:
+        selected_channels: 선택된 채널명 리스트 (None/빈 리스트/'전체' 포함이면 필터 없음)
+
+    Returns:
+        dict: {'channel_idxs': [int], 'order_types': [str], 'channel_names': set} 또는 None
+    """
+    if not selected_channels or '전체' in selected_channels:
+        return None
+
+    selected = set(selected_channels)
+    channel_names = get_channel_names()
+
+    # master_data.xlsx의 매핑 데이터 (모듈 캐시)
+    try:
+        from config.channel_mapping import load_master_data_mapping
+        channel_id_to_name, _ = load_master_data_mapping()
+    except Exception:
+        channel_id_to_name = {}
+
+    valid_names = set(selected)
+    for code_id, code_name in channel_names.items():
+        if code_name in selected and code_id in channel_id_to_name:
+            valid_names.add(channel_id_to_name[code_id])
+
+    order_types = set(valid_names)
+    from config.channels import CHANNEL_CONFIG
+    for order_type, config in CHANNEL_CONFIG['order_product'].items():
+        if config['name'] in selected:
+            order_types.add(order_type)
+
+    return {
+        'channel_idxs': sorted(code_id for code_id, code_name in channel_names.items() if code_name in valid_names),
+        'order_types': sorted(order_types),
+        'channel_names': valid_names
+    }
+
+
+def _expired(pid, now):
+    return pid not in _products or now - _products[pid]['loaded_at'] >= DIMENSION_CACHE_TTL
+
+
+def _refill_products(missing, now):
+    """
+    없거나 만료된 숙소 idx를 다시 읽음 (_lock 안에서 호출)
+
+    IN 목록 한도가 남으면 캐시의 다른 만료 항목도 함께 넣어 다시 채우므로,
+    같은 숙소들을 반복 조회할 때 만료가 하나씩 흩어져 쿼리가 여러 번 나가지 않습니다.
+    """
+    wanted = set(missing)
+    stale = [pid for pid in _products if pid not in wanted and _expired(pid, now)]
+    ids = missing + stale[:max(0, PRODUCT_BATCH_SIZE - len(missing))]
+
+    engine = get_db_connection()
+    # IN 목록이 너무 길어지지 않도록 나누어 조회
+    for offset in range(0, len(ids), PRODUCT_BATCH_SIZE):
+        chunk = ids[offset:offset + PRODUCT_BATCH_SIZE]
+        df = pd.read_sql(_PRODUCT_LABEL_QUERY.bindparams(ids=[int(pid) for pid in chunk]), engine)
+        loaded_at = time.time()
+        found = set()
+        for idx, product_code, name_kr, reg_date in zip(df['idx'], df['product_code'], df['name_kr'], df['reg_date']):
+            found.add(int(idx))
+            _products[int(idx)] = {
+                'product_code': product_code if pd.notna(product_code) else None,
+                'name_kr': name_kr if pd.notna(name_kr) else None,
+                'reg_date': pd.Timestamp(reg_date).to_pydatetime() if pd.notna(reg_date) else None,
+                'loaded_at': loaded_at
+            }
+        # product에 없는 idx (삭제된 숙소 등)
+        for pid in chunk:
+            if pid not in found:
+                _products[pid] = {'product_code': None, 'name_kr': None, 'reg_date': None,
+                                  'loaded_at': loaded_at, 'missing': True}
+
+
+def get_product_labels(product_ids):
+    """
+    숙소 idx -> 라벨 정보 반환 (캐시에 없거나 만료된 idx만 한 번에 조회)
+
+    Args:
+        product_ids: 숙소 ID 목록
+
+    Returns:
+        dict: {idx: {'product_code': str, 'name_kr': str, 'reg_date': datetime}} (product에 없는 idx 제외)
+    """
+    ids = {int(pid) for pid in product_ids if pd.notna(pid)}
+    if not ids:
+        return {}
+
+    if any(_expired(pid, time.time()) for pid in ids):
+        with _lock:
+            # 다른 스레드가 먼저 채웠으면 조회하지 않음
+            now = time.time()
+            missing = sorted(pid for pid in ids if _expired(pid, now))
+            if missing:
+                try:
+                    _refill_products(missing, now)
+                except Exception as e:
+                    print(f"❌ 숙소 라벨 조회 오류: {e}")
+
+    return {pid: _products[pid] for pid in ids if pid in _products and not _products[pid].get('missing')}
+
+
+def attach_channel_labels(df, idx_col='channel_idx', fallback_col='order_type'):
+    """
+    채널 idx 기준으로 channel_name 컬럼 추가
+
+    common_code에 없는 채널은 order_type을 채널명으로 사용합니다 (기존 쿼리의 COALESCE와 동일).
+    """
+    if df.empty:
+        df['channel_name'] = pd.Series(dtype=object)
+        return df
+
+    labels = df[idx_col].map(get_channel_names())
+    if fallback_col in df.columns:
+        labels = labels.fillna(df[fallback_col])
+    df['channel_name'] = labels
+    return df
+
+
+def attach_hotel_labels(df, idx_col='hotel_idx'):
+    """숙소 idx 기준으로 hotel_name, hotel_code 컬럼 추가"""
+    if df.empty:
+        df['hotel_name'] = pd.Series(dtype=object)
+        df['hotel_code'] = pd.Series(dtype=object)
+        return df
+
+    labels = get_product_labels(df[idx_col].unique())
+    df['hotel_name'] = df[idx_col].map({pid: info['name_kr'] for pid, info in labels.items()})
+    df['hotel_code'] = df[idx_col].map({pid: info['product_code'] for pid, info in labels.items()})
+    return df
+
+
+def clear_dimension_cache():
+    """캐시 초기화 (마스터 변경 직후 강제 갱신용)"""
+    global _channel_names, _channel_loaded_at
+
+    with _lock:
+        _channel_names = None
+        _channel_loaded_at = 0.0
+        _products.clear()
@@ -0,0 +1,130 @@
+# utils/excel_writer.py
+"""엑셀 스트리밍 작성 모듈
+- openpyxl write-only 모드로 행을 만들면서 바로 시트에 기록 (전체 셀 객체를 메모리에 두지 않음)
+- DataFrame은 구간(chunk)별로 변환하여 기록하므로 전체 문자열 사본을 만들지 않음
+- 숫자/비율은 문자열로 바꾸지 않고 숫자 셀로 기록, 표시 형식은 컬럼 단위 서식(number_format)으로 지정
+- 컬럼 정의/값 변환/열 너비 계산은 utils/export_engine.py에서 담당
+"""
+
+import os
+from io import BytesIO
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.utils import get_column_letter
+
+# 스트리밍 모드 사용 여부 (.env에서 조정 가능, false면 pd.ExcelWriter 사용)
+EXCEL_STREAMING = os.getenv('EXCEL_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+EXCEL_CHUNK_ROWS = int(os.getenv('EXCEL_CHUNK_ROWS', 5000))  # 한 번에 변환할 행 수
+EXCEL_MAX_COLUMN_WIDTH = 50
+
+# 엑셀 표시 형식 (천단위 구분 정수 / 소수점 1자리 백분율)
+THOUSANDS_FORMAT = '#,##0'
+PERCENT_FORMAT = '0.0%'
+
+# pandas to_excel 헤더와 같은 스타일
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style='thin'),) * 4)
+_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+
+def apply_number_formats(worksheet, columns, number_formats):
+    """
+    일반 워크시트(pd.ExcelWriter 경로)의 데이터 셀에 컬럼별 표시 형식 지정
+
+    Args:
+        worksheet: openpyxl 워크시트 (1행은 헤더)
+        columns: 헤더 목록
+        number_formats: {컬럼: 표시 형식}
+    """
+    for idx, col in enumerate(columns, 1):
+        number_format = number_formats.get(col)
+        if not number_format:
+            continue
+        for (cell,) in worksheet.iter_rows(min_row=2, min_col=idx, max_col=idx):
+            cell.number_format = number_format
+
+
+def dataframe_rows(df, formatters=None, chunk_rows=None):
+    """
+    DataFrame 행을 구간별로 변환하며 순서대로 반환
+
+    Args:
+        df: 원본 DataFrame (수정하지 않음)
+        formatters: {컬럼: Series -> Series 변환 함수}
+        chunk_rows: 구간 크기 (None이면 EXCEL_CHUNK_ROWS)
+
+    Yields:
+        tuple: 행 값 (결측은 None)
+    """
+    chunk_rows = chunk_rows or EXCEL_CHUNK_ROWS
+    formatters = formatters or {}
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows].copy()
+        for col, formatter in formatters.items():
+            if col in chunk.columns:
+                chunk[col] = formatter(chunk[col])
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def _header_cells(worksheet, columns):
+    cells = []
+    for name in columns:
+        cell = WriteOnlyCell(worksheet, value=name)
+        cell.font = _HEADER_FONT
+        cell.border = _HEADER_BORDER
+        cell.alignment = _HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+
+def _styled_cells(worksheet, columns, number_formats):
+    """표시 형식이 있는 컬럼마다 서식을 한 번만 지정한 셀 {열 위치: WriteOnlyCell}"""
+    cells = {}
+    for idx, col in enumerate(columns):
+        if number_formats.get(col):
+            cell = WriteOnlyCell(worksheet)
+            cell.number_format = number_formats[col]
+            cells[idx] = cell
+    return cells
+
+
+def write_streaming_workbook(sheets):
+    """
+    write-only 워크북 생성
+
+    Args:
+        sheets: [{'name': 시트명, 'columns': 헤더 목록, 'rows': 행 iterable,
+                  'widths': 열 너비 목록(선택), 'number_formats': {컬럼: 표시 형식}(선택)}]
+
+    Returns:
+        BytesIO: 엑셀 파일 바이너리 데이터
+    """
+    workbook = Workbook(write_only=True)
+
+    for sheet in sheets:
+        worksheet = workbook.create_sheet(title=sheet['name'])
+        # write-only 시트는 행을 기록하기 전에 열 너비를 지정해야 함
+        for idx, width in enumerate(sheet.get('widths') or [], 1):
+            if width:
+                worksheet.column_dimensions[get_column_letter(idx)].width = width
+        worksheet.append(_header_cells(worksheet, sheet['columns']))
+
+        # append()는 행을 즉시 기록하므로 서식 셀을 행마다 재사용 (셀 스타일 등록은 컬럼당 1회)
+        styled = _styled_cells(worksheet, sheet['columns'], sheet.get('number_formats') or {})
+        for row in sheet['rows']:
+            if styled:
+                row = list(row)
+                for idx, cell in styled.items():
+                    if row[idx] is not None:
+                        cell.value = row[idx]
+                        row[idx] = cell
+            worksheet.append(row)
+
+    output = BytesIO()
+    workbook.save(output)
+    output.seek(0)
+    return output
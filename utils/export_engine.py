@@ -0,0 +1,400 @@
+# utils/export_engine.py
+"""보고서 내보내기 엔진
+- 채널별/숙소별 보고서 컬럼 정의(원본 컬럼, 한글명, 값 유형, 열 너비 방식)를 한 곳에서 관리
+- 화면 미리보기(문자열 표시)와 엑셀(숫자 셀 + 표시 형식)이 같은 정의를 사용
+- 열 너비는 컬럼 단위 벡터 연산(최댓값/최솟값, 고유값 문자열 길이)으로 계산, 열 개수 제한 없음
+- gzip CSV / Parquet 내보내기는 조회 구간(DataFrame iterator)을 받아 바로 기록 (전체 DataFrame 미생성)
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gzip
+import io
+import pandas as pd
+from io import BytesIO
+from openpyxl.utils import get_column_letter
+from utils.excel_writer import (
+    EXCEL_STREAMING,
+    EXCEL_MAX_COLUMN_WIDTH,
+    THOUSANDS_FORMAT,
+    PERCENT_FORMAT,
+    dataframe_rows,
+    apply_number_formats,
+    write_streaming_workbook
+)
+
+# Parquet 내보내기 (선택사항)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pq = None
+
+CSV_GZIP_LEVEL = int(os.getenv('CSV_GZIP_LEVEL', 6))  # gzip 압축 수준 (1: 빠름 ~ 9: 작음)
+PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'snappy')
+
+# 문자열 컬럼 너비 계산 시 사용할 최대 고유값 수 (초과 시 고정 시드 표본)
+EXPORT_WIDTH_SAMPLE_ROWS = int(os.getenv('EXPORT_WIDTH_SAMPLE_ROWS', 20000))
+
+EMPTY_MESSAGE = '조회된 데이터가 없습니다.'
+
+
+def date_column_label(date_type):
+    """날짜유형별 날짜 컬럼명"""
+    return '구매일(예약일)' if date_type == 'orderDate' else '이용일(체크인)'
+
+
+def to_date_text(series):
+    """'YYYY-MM-DD' 문자열"""
+    return pd.to_datetime(series).dt.strftime('%Y-%m-%d')
+
+
+def to_number(series):
+    """숫자 셀 값 (결측은 0, 표시 형식은 THOUSANDS_FORMAT)"""
+    return pd.to_numeric(series, errors='coerce').fillna(0)
+
+
+def to_ratio(series):
+    """백분율 값(12.3)을 엑셀 비율 값(0.123)으로 변환 (표시 형식은 PERCENT_FORMAT)"""
+    return to_number(series) / 100
+
+
+def to_thousands_text(series):
+    """화면 표시용 천단위 구분 정수 문자열 (결측은 '0')"""
+    return to_number(series).astype('int64').map('{:,}'.format)
+
+
+def to_percent_text(series):
+    """화면 표시용 소수점 1자리 % 문자열 (결측은 '0.0%')"""
+    return to_number(series).map('{:.1f}%'.format)
+
+
+# 값 유형별 변환 (엑셀 값, 엑셀 표시 형식, 화면 표시 문자열, 기본 열 너비 방식, Parquet 타입)
+DTYPES = {
+    'date': {'excel': to_date_text, 'number_format': None, 'display': to_date_text, 'width': 10,
+             'arrow': 'date32'},
+    'int': {'excel': to_number, 'number_format': THOUSANDS_FORMAT, 'display': to_thousands_text, 'width': 'extremes',
+            'arrow': 'int64'},
+    'rate': {'excel': to_ratio, 'number_format': PERCENT_FORMAT, 'display': to_percent_text, 'width': 'extremes',
+             'arrow': 'float64'},
+    'text': {'excel': None, 'number_format': None, 'display': None, 'width': 'sample', 'arrow': 'string'},
+}
+
+
+def column(source, label, dtype='text', width=None, display=True):
+    """
+    보고서 컬럼 정의
+
+    Args:
+        source: 조회 결과 컬럼명
+        label: 한글 컬럼명 (None이면 날짜유형별 날짜 컬럼명)
+        dtype: 'date', 'int', 'rate', 'text'
+        width: 열 너비 방식 - 정수(고정 글자 수), 'extremes'(최댓값/최솟값 표시 길이),
+               'text'(전체 고유값 문자열 길이), 'sample'(고유값 표본 문자열 길이), None이면 유형별 기본값
+        display: 화면 미리보기 표시 여부
+    """
+    return {
+        'source': source,
+        'label': label,
+        'dtype': dtype,
+        'width': DTYPES[dtype]['width'] if width is None else width,
+        'display': display
+    }
+
+
+# 채널별 보고서 (채널코드는 내부용으로 제외)
+CHANNEL_REPORT_COLUMNS = [
+    column('booking_date', None, 'date'),
+    column('channel_name', '채널명'),
+    column('sale_type', '판매유형'),
+    column('hotel_count', '판매숙소수', 'int'),
+    column('booking_count', '예약건수', 'int'),
+    column('total_rooms', '총객실수', 'int'),
+    column('confirmed_rooms', '확정객실수', 'int'),
+    column('cancelled_rooms', '취소객실수', 'int'),
+    column('cancellation_rate', '취소율', 'rate'),
+    column('total_deposit', '총 입금가', 'int'),
+    column('total_purchase', '총 실구매가', 'int'),
+    column('total_profit', '총 수익', 'int'),
+    column('profit_rate', '수익률 (%)', 'rate'),
+]
+
+# 숙소별 보고서 (숙소코드는 엑셀에만 포함)
+HOTEL_REPORT_COLUMNS = [
+    column('booking_date', None, 'date'),
+    column('hotel_name', '숙소명'),
+    column('hotel_code', '숙소코드', display=False),
+    column('channel_name', '채널명'),
+    column('sale_type', '판매유형'),
+    column('booking_count', '예약건수', 'int'),
+    column('total_rooms', '총객실수', 'int'),
+    column('confirmed_rooms', '확정객실수', 'int'),
+    column('cancelled_rooms', '취소객실수', 'int'),
+    column('cancellation_rate', '취소율', 'rate'),
+    column('total_deposit', '총 입금가', 'int'),
+    column('total_purchase', '총 실구매가', 'int'),
+    column('total_profit', '총 수익', 'int'),
+    column('profit_rate', '수익률 (%)', 'rate'),
+]
+
+
+def resolve_columns(df, columns, date_type, display=False):
+    """
+    DataFrame에 존재하는 컬럼 정의만 정의 순서대로 반환 (label은 날짜유형 반영)
+
+    Args:
+        display: True면 화면 미리보기 표시 컬럼만
+    """
+    date_label = date_column_label(date_type)
+    return [
+        {**col, 'label': col['label'] or date_label}
+        for col in columns
+        if col['source'] in df.columns and (col['display'] or not display)
+    ]
+
+
+def export_frame(df, columns):
+    """원본 컬럼을 선택하고 한글 컬럼명을 적용한 DataFrame (값 변환 전)"""
+    return df[[col['source'] for col in columns]].set_axis([col['label'] for col in columns], axis=1)
+
+
+def _display_length(value, number_format):
+    """표시 형식을 적용했을 때 엑셀에 보이는 문자열 길이"""
+    if number_format == PERCENT_FORMAT:
+        return len(f"{value * 100:.1f}%")
+    return len(f"{value:,.0f}")
+
+
+def column_width(series, col):
+    """
+    열 너비 계산 (행 전체를 문자열로 변환하지 않음)
+
+    Args:
+        series: 값 변환 전 컬럼 데이터
+        col: resolve_columns()의 컬럼 정의
+    """
+    width = col['width']
+    if series.empty:
+        length = 0
+    elif isinstance(width, int):
+        length = width
+    elif width == 'extremes':
+        dtype = DTYPES[col['dtype']]
+        values = dtype['excel'](series) if dtype['excel'] else to_number(series)
+        length = max(_display_length(values.max(), dtype['number_format']),
+                     _display_length(values.min(), dtype['number_format']))
+    else:
+        # 같은 값은 한 번만 길이 계산 (숙소명/채널명은 행 수보다 고유값이 훨씬 적음)
+        values = series.drop_duplicates()
+        if width == 'sample' and len(values) > EXPORT_WIDTH_SAMPLE_ROWS:
+            values = values.sample(EXPORT_WIDTH_SAMPLE_ROWS, random_state=0)
+        length = int(values.astype(object).fillna('').astype(str).str.len().max())
+    return min(max(length, len(str(col['label']))) + 2, EXCEL_MAX_COLUMN_WIDTH)
+
+
+def display_frame(df, columns, date_type, rows=None):
+    """
+    화면 미리보기용 DataFrame (상위 rows개만 문자열 표시 형식으로 변환)
+
+    Args:
+        df: 조회 결과 DataFrame
+        columns: 보고서 컬럼 정의 (CHANNEL_REPORT_COLUMNS / HOTEL_REPORT_COLUMNS)
+        date_type: 'orderDate' 또는 'useDate'
+        rows: 표시할 행 수 (None이면 전체)
+    """
+    resolved = resolve_columns(df, columns, date_type, display=True)
+    source = df if rows is None else df.head(rows)
+    result = export_frame(source, resolved)
+    for col in resolved:
+        converter = DTYPES[col['dtype']]['display']
+        if converter:
+            result[col['label']] = converter(result[col['label']])
+    return result
+
+
+def _excel_sheet(df, columns, date_type):
+    """데이터 시트 구성 (컬럼명, 값 변환 전 DataFrame, 값 변환 함수, 표시 형식, 열 너비)"""
+    resolved = resolve_columns(df, columns, date_type)
+    data = export_frame(df, resolved)
+    return {
+        'columns': [col['label'] for col in resolved],
+        'frame': data,
+        'formatters': {col['label']: DTYPES[col['dtype']]['excel']
+                       for col in resolved if DTYPES[col['dtype']]['excel']},
+        'number_formats': {col['label']: DTYPES[col['dtype']]['number_format']
+                           for col in resolved if DTYPES[col['dtype']]['number_format']},
+        'widths': [column_width(data[col['label']], col) for col in resolved]
+    }
+
+
+def _write_streaming(df, columns, date_type, sheet_name, summary_rows):
+    """write-only 모드로 행을 구간별로 변환하며 기록 (메모리 사용량이 행 수와 무관)"""
+    sheets = []
+    if summary_rows:
+        sheets.append({'name': '요약', 'columns': ['항목', '값'], 'rows': summary_rows})
+
+    if not df.empty:
+        sheet = _excel_sheet(df, columns, date_type)
+        sheets.append({
+            'name': sheet_name,
+            'columns': sheet['columns'],
+            'rows': dataframe_rows(sheet['frame'], sheet['formatters']),
+            'widths': sheet['widths'],
+            'number_formats': sheet['number_formats']
+        })
+    else:
+        # 데이터가 없을 때 빈 시트 생성
+        sheets.append({'name': sheet_name, 'columns': ['메시지'], 'rows': [[EMPTY_MESSAGE]]})
+
+    return write_streaming_workbook(sheets)
+
+
+def _write_standard(df, columns, date_type, sheet_name, summary_rows):
+    """pd.ExcelWriter로 전체 시트를 메모리에 만든 뒤 저장"""
+    output = BytesIO()
+
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        # 요약 통계 시트 추가 (선택사항)
+        if summary_rows:
+            pd.DataFrame(summary_rows, columns=['항목', '값']).to_excel(writer, sheet_name='요약', index=False)
+
+        # 메인 데이터 시트
+        if not df.empty:
+            sheet = _excel_sheet(df, columns, date_type)
+            data = sheet['frame'].copy()
+
+            # 날짜 문자열 / 숫자·비율 값 변환 (숫자는 숫자 셀로 기록)
+            for col, formatter in sheet['formatters'].items():
+                data[col] = formatter(data[col])
+
+            data.to_excel(writer, sheet_name=sheet_name, index=False)
+
+            # 표시 형식 및 열 너비 설정
+            worksheet = writer.sheets[sheet_name]
+            apply_number_formats(worksheet, sheet['columns'], sheet['number_formats'])
+            for idx, width in enumerate(sheet['widths'], 1):
+                worksheet.column_dimensions[get_column_letter(idx)].width = width
+        else:
+            # 데이터가 없을 때 빈 시트 생성
+            pd.DataFrame({'메시지': [EMPTY_MESSAGE]}).to_excel(writer, sheet_name=sheet_name, index=False)
+
+    output.seek(0)
+    return output
+
+
+def write_report_workbook(df, columns, date_type='orderDate', sheet_name='구매일', summary_rows=None, streaming=None):
+    """
+    보고서 DataFrame을 엑셀 파일로 변환
+
+    Args:
+        df: 조회 결과 DataFrame
+        columns: 보고서 컬럼 정의 (CHANNEL_REPORT_COLUMNS / HOTEL_REPORT_COLUMNS)
+        date_type: 'orderDate' 또는 'useDate'
+        sheet_name: 데이터 시트 이름
+        summary_rows: 요약 시트 행 [[항목, 값], ...] (None이면 요약 시트 없음)
+        streaming: True면 write-only 스트리밍, None이면 EXCEL_STREAMING 설정
+
+    Returns:
+        BytesIO: 엑셀 파일 바이너리 데이터
+    """
+    if EXCEL_STREAMING if streaming is None else streaming:
+        return _write_streaming(df, columns, date_type, sheet_name, summary_rows)
+    return _write_standard(df, columns, date_type, sheet_name, summary_rows)
+
+
+def _resolve_all(columns, date_type):
+    """조회 결과가 없을 때 사용할 전체 컬럼 정의 (헤더/스키마용)"""
+    return resolve_columns(pd.DataFrame(columns=[col['source'] for col in columns]), columns, date_type)
+
+
+def _raw_frame(chunk, resolved):
+    """CSV/Parquet용 원본 값 DataFrame (날짜는 'YYYY-MM-DD', 숫자는 그대로, 비율은 % 값, 라벨은 문자열)"""
+    frame = export_frame(chunk, resolved).copy()
+    for col in resolved:
+        if col['dtype'] == 'date':
+            frame[col['label']] = to_date_text(frame[col['label']])
+        elif col['dtype'] in ('int', 'rate'):
+            frame[col['label']] = to_number(frame[col['label']])
+        else:
+            frame[col['label']] = frame[col['label']].astype(object)
+    return frame
+
+
+def write_report_csv(chunks, columns, date_type='orderDate'):
+    """
+    조회 구간을 gzip 압축 CSV로 바로 기록 (UTF-8 BOM 포함, 엑셀에서 한글이 깨지지 않음)
+
+    Args:
+        chunks: DataFrame iterator (iter_channel_data / iter_hotel_data)
+        columns: 보고서 컬럼 정의 (CHANNEL_REPORT_COLUMNS / HOTEL_REPORT_COLUMNS)
+        date_type: 'orderDate' 또는 'useDate'
+
+    Returns:
+        BytesIO: .csv.gz 파일 바이너리 데이터
+    """
+    output = BytesIO()
+    resolved = None
+
+    with io.TextIOWrapper(gzip.GzipFile(fileobj=output, mode='wb', compresslevel=CSV_GZIP_LEVEL),
+                          encoding='utf-8-sig', newline='') as writer:
+        for chunk in chunks:
+            header = resolved is None
+            if header:
+                resolved = resolve_columns(chunk, columns, date_type)
+            _raw_frame(chunk, resolved).to_csv(writer, header=header, index=False)
+
+        # 조회 결과가 없으면 헤더만 기록
+        if resolved is None:
+            writer.write(','.join(col['label'] for col in _resolve_all(columns, date_type)) + '\n')
+
+    output.seek(0)
+    return output
+
+
+def write_report_parquet(chunks, columns, date_type='orderDate'):
+    """
+    조회 구간을 Parquet row group으로 바로 기록 (pyarrow 필요)
+
+    Args:
+        chunks: DataFrame iterator (iter_channel_data / iter_hotel_data)
+        columns: 보고서 컬럼 정의 (CHANNEL_REPORT_COLUMNS / HOTEL_REPORT_COLUMNS)
+        date_type: 'orderDate' 또는 'useDate'
+
+    Returns:
+        BytesIO: .parquet 파일 바이너리 데이터
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)")
+
+    sink = pa.BufferOutputStream()
+    writer = None
+
+    def _open(resolved):
+        schema = pa.schema([(col['label'], getattr(pa, DTYPES[col['dtype']]['arrow'])()) for col in resolved])
+        return pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION), schema
+
+    try:
+        for chunk in chunks:
+            if writer is None:
+                resolved = resolve_columns(chunk, columns, date_type)
+                writer, schema = _open(resolved)
+            frame = _raw_frame(chunk, resolved)
+            for col in resolved:
+                if col['dtype'] == 'date':
+                    frame[col['label']] = pd.to_datetime(frame[col['label']]).dt.date
+            writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+
+        # 조회 결과가 없으면 스키마만 기록
+        if writer is None:
+            writer, _ = _open(_resolve_all(columns, date_type))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return BytesIO(sink.getvalue().to_pybytes())
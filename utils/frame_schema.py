@@ -0,0 +1,108 @@
+# utils/frame_schema.py
+"""조회 결과 DataFrame 스키마 (컬럼별 저장 타입)
+- 같은 값이 반복되는 라벨(채널명/채널코드/판매유형/숙소명/숙소코드)은 category
+- 건수/객실수는 int32, 금액은 int64, 비율은 소수점 1자리 float64, 정수 키는 nullable Int64
+- 조회 구간(chunk)을 읽을 때마다 apply_schema로 한 번에 변환하고,
+  구간은 concat_frames로 카테고리를 합쳐 이어 붙임 (pd.concat은 카테고리가 다르면 object로 되돌림)
+"""
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# 값 유형별 저장 타입과 결측 처리 (fill: 결측 대체값, decimals: 반올림 자리수)
+KINDS = {
+    'date': {'dtype': 'datetime64[ns]'},
+    # 정수 키는 NULL이 있어도 변환되도록 nullable 정수 (예: product_idx가 없는 예약)
+    'key': {'dtype': 'Int64'},
+    'label': {'dtype': 'category'},
+    'count': {'dtype': 'int32', 'fill': 0},
+    'money': {'dtype': 'int64', 'fill': 0, 'decimals': 0},
+    'rate': {'dtype': 'float64', 'fill': 0, 'decimals': 1},
+}
+
+# 채널별 조회 결과 (channel_idx는 채널 미지정 주문이 NULL이므로 변환하지 않음)
+CHANNEL_DATA_SCHEMA = {
+    'booking_date': 'date',
+    'channel_name': 'label',
+    'channel_code': 'label',
+    'sale_type': 'label',
+    'booking_count': 'count',
+    'order_count': 'count',
+    'hotel_count': 'count',
+    'total_rooms': 'count',
+    'confirmed_rooms': 'count',
+    'cancelled_rooms': 'count',
+    'cancellation_rate': 'rate',
+    'total_deposit': 'money',
+    'total_purchase': 'money',
+    'total_profit': 'money',
+    'profit_rate': 'rate',
+}
+
+# 숙소별 조회 결과
+HOTEL_DATA_SCHEMA = {
+    'booking_date': 'date',
+    'hotel_name': 'label',
+    'hotel_idx': 'key',
+    'hotel_code': 'label',
+    'channel_name': 'label',
+    'channel_code': 'label',
+    'sale_type': 'label',
+    'booking_count': 'count',
+    'order_count': 'count',
+    'total_rooms': 'count',
+    'confirmed_rooms': 'count',
+    'cancelled_rooms': 'count',
+    'cancellation_rate': 'rate',
+    'total_deposit': 'money',
+    'total_purchase': 'money',
+    'total_profit': 'money',
+    'profit_rate': 'rate',
+}
+
+
+def apply_schema(df, schema):
+    """
+    스키마에 있는 컬럼을 저장 타입으로 변환 (결측 대체 → 반올림 → 타입 변환을 각각 한 번에 적용)
+
+    Args:
+        df: 조회 결과 DataFrame (전체 또는 구간)
+        schema: {컬럼: 값 유형} (CHANNEL_DATA_SCHEMA / HOTEL_DATA_SCHEMA)
+
+    Returns:
+        pandas DataFrame
+    """
+    kinds = {col: KINDS[kind] for col, kind in schema.items() if col in df.columns}
+    fills = {col: kind['fill'] for col, kind in kinds.items() if 'fill' in kind}
+    decimals = {col: kind['decimals'] for col, kind in kinds.items() if 'decimals' in kind}
+    dates = [col for col, kind in kinds.items() if kind['dtype'].startswith('datetime')]
+
+    for col in dates:
+        df[col] = pd.to_datetime(df[col])
+    # 라벨 카테고리는 문자열 정렬 순서 (카테고리 기준 정렬이 문자열 정렬과 같도록)
+    return df.fillna(fills).round(decimals).astype(
+        {col: kind['dtype'] for col, kind in kinds.items() if col not in dates}
+    )
+
+
+def concat_frames(parts):
+    """
+    구간 DataFrame을 이어 붙임 (category 컬럼은 전체 구간의 카테고리를 합쳐 유지)
+
+    Args:
+        parts: apply_schema로 변환한 DataFrame 목록 (각 구간의 카테고리는 변경됨)
+
+    Returns:
+        pandas DataFrame
+    """
+    parts = [part for part in parts if not part.empty] or list(parts[:1])
+    if len(parts) == 1:
+        return parts[0]
+
+    for col in parts[0].columns:
+        if not all(isinstance(part[col].dtype, pd.CategoricalDtype) for part in parts):
+            continue
+        categories = union_categoricals([part[col] for part in parts], sort_categories=True).categories
+        for part in parts:
+            part[col] = part[col].cat.set_categories(categories)
+    return pd.concat(parts, ignore_index=True)
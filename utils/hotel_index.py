@@ -0,0 +1,335 @@
+# utils/hotel_index.py
+"""숙소 검색용 메모리 n-gram 색인 및 최근 활동 숙소 집합
+- product 전체의 숙소명/숙소코드(공백 제거, 소문자)를 2-gram 역색인으로 보관 (gram -> 정렬된 위치 배열)
+- 검색어의 2-gram 위치 배열 교집합으로 후보를 찾고, 기존 LIKE 조건(부분 문자열)으로 다시 확인
+- 앱 시작 시 백그라운드에서 생성하고, 이후 idx 기준 증분 갱신(신규 등록 숙소)과
+  주기적 전체 재생성(숙소명/코드 변경 반영)을 하며 색인은 통째로 교체
+- 최근 180일 예약 숙소 / 최근 90일 등록 숙소 idx 집합을 주기적으로 백그라운드에서 다시 읽음
+  (검색 시 order_product 조회 없이 검색 대상 제한 및 정렬)
+- 색인/집합이 준비되기 전(콜드 스타트)에는 None을 반환하므로 호출한 쪽에서 DB 검색을 사용
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from config.configdb import get_db_connection
+
+# 색인 사용 여부 및 갱신 주기 (.env에서 조정 가능)
+HOTEL_INDEX_ENABLED = os.getenv('HOTEL_INDEX_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+HOTEL_INDEX_REFRESH_SECONDS = int(os.getenv('HOTEL_INDEX_REFRESH_SECONDS', 60))  # 신규 숙소 증분 갱신
+HOTEL_INDEX_REBUILD_SECONDS = int(os.getenv('HOTEL_INDEX_REBUILD_SECONDS', 21600))  # 전체 재생성
+HOTEL_ACTIVE_REFRESH_SECONDS = int(os.getenv('HOTEL_ACTIVE_REFRESH_SECONDS', 600))  # 최근 활동 숙소 집합
+
+# 2-gram은 두 글자의 유니코드 코드값(21비트)을 합친 정수, 위치는 22비트 (최대 약 400만 숙소)
+_CODEPOINT_BITS = 21
+_POSITION_BITS = 22
+
+# 현재 색인 (교체는 참조 대입 한 번)
+_index = None
+_lock = threading.Lock()
+_building = threading.Event()
+
+# 최근 활동 숙소 집합 {'booked', 'new', 'max_idx', 'loaded_at'}
+_active = None
+_active_loading = threading.Event()
+
+
+def normalize(text):
+    """색인/검색 키 (공백 제거, 소문자 - MySQL 기본 collation처럼 대소문자 구분 없음)"""
+    return str(text).replace(' ', '').lower()
+
+
+def gram_pairs(keys):
+    """
+    키 목록 전체의 (2-gram 정수, 키 번호) 배열 (문자열을 한 번에 코드값 배열로 변환하여 계산)
+
+    Returns:
+        tuple: (np.uint64 gram 배열, np.int64 키 번호 배열)
+    """
+    if not keys:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    # 키 사이에 구분 문자(\x00)를 넣어 이어 붙이고, 구분 문자가 포함된 gram은 제외
+    codepoints = np.frombuffer('\x00'.join(keys).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    owners = np.repeat(np.arange(len(keys)), [len(key) + 1 for key in keys])[:len(codepoints)]
+    valid = (codepoints[:-1] != 0) & (codepoints[1:] != 0)
+    codes = (codepoints[:-1] << np.uint64(_CODEPOINT_BITS)) | codepoints[1:]
+    return codes[valid], owners[:-1][valid]
+
+
+class HotelIndex:
+    """숙소 n-gram 색인 (생성 후 변경하지 않음, 증분 갱신은 새 객체를 반환)"""
+
+    # 위치(0부터)별 숙소 정보 목록
+    _FIELDS = ('ids', 'names', 'codes', 'names_key', 'codes_lower')
+
+    def __init__(self, fields, postings, built_at=None):
+        for name in self._FIELDS:
+            setattr(self, name, fields[name])
+        self.postings = postings
+        self.max_idx = max(self.ids) if self.ids else 0
+        self.built_at = built_at or time.time()
+        self.refreshed_at = time.time()
+
+    @classmethod
+    def build(cls, df, base=None):
+        """
+        product 조회 결과로 색인 생성
+
+        Args:
+            df: idx, product_code, name_kr 컬럼 DataFrame
+            base: 기존 색인 (지정하면 df의 숙소를 뒤에 추가한 새 색인)
+        """
+        names = df['name_kr'].astype(object).where(df['name_kr'].notna(), '').astype(str)
+        codes = df['product_code'].astype(object).where(df['product_code'].notna(), '').astype(str)
+        codes_lower = codes.str.lower()
+        added = {
+            'ids': df['idx'].astype('int64').tolist(),
+            'names': names.tolist(),
+            'codes': codes.tolist(),
+            'names_key': names.str.lower().str.replace(' ', '', regex=False).tolist(),
+            'codes_lower': codes_lower.tolist(),
+        }
+        start = len(base.ids) if base else 0
+
+        # (gram, 위치)를 하나의 정수로 합쳐 중복 제거/정렬 후 gram별로 나눔
+        count = len(added['ids'])
+        gram_codes, owners = gram_pairs(added['names_key'] + codes_lower.str.replace(' ', '', regex=False).tolist())
+        positions = (start + owners % max(count, 1)).astype(np.uint64)
+        pairs = np.unique((gram_codes << np.uint64(_POSITION_BITS)) | positions)
+        pair_grams = pairs >> np.uint64(_POSITION_BITS)
+        pair_positions = (pairs & np.uint64((1 << _POSITION_BITS) - 1)).astype(np.uint32)
+        bounds = np.flatnonzero(np.diff(pair_grams)) + 1
+
+        # 위치는 항상 뒤에 추가되므로 기존 배열 뒤에 붙여도 정렬 유지
+        postings = dict(base.postings) if base else {}
+        for gram, new in zip(pair_grams[np.r_[0, bounds]].tolist() if len(pairs) else [],
+                             np.split(pair_positions, bounds)):
+            postings[gram] = np.concatenate([postings[gram], new]) if gram in postings else new
+
+        fields = {name: getattr(base, name) + added[name] for name in cls._FIELDS} if base else added
+        return cls(fields, postings, built_at=base.built_at if base else None)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, search_term):
+        """
+        기존 LIKE 검색과 같은 조건으로 일치하는 숙소 idx 목록 반환
+        (숙소명 또는 숙소코드에 검색어 포함, 또는 공백 제거 숙소명에 공백 제거 검색어 포함)
+        """
+        return [self.ids[pos] for pos in self.find_positions(search_term)]
+
+    def find_positions(self, search_term):
+        """find()와 같은 조건으로 일치하는 색인 위치 목록 반환 (숙소명/숙소코드는 names/codes[위치])"""
+        term = search_term.strip().lower()
+        key = normalize(term)
+        if not key:
+            return []
+
+        if len(key) < 2:
+            # 2-gram이 없는 1글자 검색어는 전체 확인
+            candidates = range(len(self.ids))
+        else:
+            arrays = []
+            for gram in np.unique(gram_pairs([key])[0]).tolist():
+                positions = self.postings.get(gram)
+                if positions is None:
+                    return []
+                arrays.append(positions)
+
+            # 가장 짧은 배열부터, 남은 후보만 이진 탐색으로 다음 배열에 있는지 확인
+            arrays.sort(key=len)
+            candidates = arrays[0]
+            for positions in arrays[1:]:
+                found = np.minimum(np.searchsorted(positions, candidates), len(positions) - 1)
+                candidates = candidates[positions[found] == candidates]
+                if not len(candidates):
+                    return []
+            candidates = candidates.tolist()
+
+        # 숙소명에 검색어가 있으면 공백 제거 숙소명에도 공백 제거 검색어가 있으므로 두 조건만 확인
+        names_key, codes_lower = self.names_key, self.codes_lower
+        return [pos for pos in candidates if key in names_key[pos] or term in codes_lower[pos]]
+
+
+def _read_products(min_idx=0):
+    engine = get_db_connection()
+    query = f"""
+    SELECT
+        idx,
+        product_code,
+        name_kr
+    FROM product
+    WHERE idx > {int(min_idx)}
+    ORDER BY idx
+    """
+    return pd.read_sql(query, engine)
+
+
+def _rebuild():
+    """전체 재생성 후 교체 (백그라운드 스레드)"""
+    global _index
+
+    try:
+        started = time.perf_counter()
+        index = HotelIndex.build(_read_products())
+        with _lock:
+            _index = index
+        print(f"✅ 숙소 검색 색인 생성: {len(index):,}개 숙소, {len(index.postings):,}개 gram "
+              f"({time.perf_counter() - started:.2f}s)")
+    except Exception as e:
+        print(f"❌ 숙소 검색 색인 생성 오류: {e}")
+    finally:
+        _building.clear()
+
+
+def _start_rebuild():
+    """백그라운드 전체 재생성 시작 (이미 진행 중이면 무시)"""
+    with _lock:
+        if _building.is_set():
+            return
+        _building.set()
+    threading.Thread(target=_rebuild, name='hotel-index-build', daemon=True).start()
+
+
+def _refresh(index):
+    """idx 워터마크 이후 신규 숙소만 조회하여 추가 (다른 스레드가 갱신 중이면 현재 색인 사용)"""
+    global _index
+
+    if not _lock.acquire(blocking=False):
+        return index
+    try:
+        if _index is not index:
+            return _index
+        df = _read_products(index.max_idx)
+        refreshed = HotelIndex.build(df, base=index) if not df.empty else index
+        refreshed.refreshed_at = time.time()
+        _index = refreshed
+        return refreshed
+    except Exception as e:
+        print(f"⚠️ 숙소 검색 색인 증분 갱신 실패, 기존 색인을 사용합니다: {e}")
+        index.refreshed_at = time.time()
+        return index
+    finally:
+        _lock.release()
+
+
+def get_hotel_index():
+    """
+    검색에 사용할 색인 반환
+
+    색인이 아직 없으면 백그라운드 생성을 시작하고 None을 반환합니다 (호출한 쪽은 DB 검색 사용).
+    증분 갱신 주기가 지났으면 신규 숙소를 추가하고, 전체 재생성 주기가 지났으면
+    기존 색인을 계속 사용하면서 백그라운드에서 다시 만듭니다.
+    """
+    if not HOTEL_INDEX_ENABLED:
+        return None
+
+    index = _index
+    if index is None:
+        _start_rebuild()
+        return None
+
+    now = time.time()
+    if now - index.built_at >= HOTEL_INDEX_REBUILD_SECONDS:
+        _start_rebuild()
+    if now - index.refreshed_at >= HOTEL_INDEX_REFRESH_SECONDS:
+        index = _refresh(index)
+    return index
+
+
+def _load_active():
+    """최근 활동 숙소 집합 조회 후 교체 (백그라운드 스레드)"""
+    global _active
+
+    try:
+        started = time.perf_counter()
+        engine = get_db_connection()
+        # 기존 검색 쿼리의 LEFT JOIN 조건과 같은 기간 (DB 기준 날짜)
+        booked = pd.read_sql("""
+        SELECT DISTINCT product_idx
+        FROM order_product
+        WHERE create_date >= DATE_SUB(CURDATE(), INTERVAL 180 DAY)
+           OR (
+               checkin_date >= DATE_SUB(CURDATE(), INTERVAL 180 DAY)
+               AND checkin_date <= DATE_ADD(CURDATE(), INTERVAL 180 DAY)
+           )
+        """, engine)
+        new = pd.read_sql("""
+        SELECT idx
+        FROM product
+        WHERE reg_date >= DATE_SUB(CURDATE(), INTERVAL 90 DAY)
+        """, engine)
+        max_idx = pd.read_sql("SELECT MAX(idx) AS max_idx FROM product", engine)['max_idx'].iloc[0]
+
+        active = {
+            'booked': frozenset(booked['product_idx'].dropna().astype('int64').tolist()),
+            'new': frozenset(new['idx'].astype('int64').tolist()),
+            'max_idx': int(max_idx) if pd.notna(max_idx) else 0,
+            'loaded_at': time.time()
+        }
+        _active = active
+        print(f"✅ 최근 활동 숙소 집합 갱신: 예약 {len(active['booked']):,}개, 신규 등록 {len(active['new']):,}개 "
+              f"({time.perf_counter() - started:.2f}s)")
+    except Exception as e:
+        print(f"❌ 최근 활동 숙소 조회 오류: {e}")
+    finally:
+        _active_loading.clear()
+
+
+def _start_active_load():
+    """백그라운드 최근 활동 숙소 조회 시작 (이미 진행 중이면 무시)"""
+    with _lock:
+        if _active_loading.is_set():
+            return
+        _active_loading.set()
+    threading.Thread(target=_load_active, name='hotel-active-load', daemon=True).start()
+
+
+def get_active_hotels():
+    """
+    최근 활동 숙소 집합 반환
+
+    Returns:
+        dict: {'booked': 최근 180일 예약(구매일 또는 이용일 ±180일) 숙소 idx 집합,
+               'new': 최근 90일 등록 숙소 idx 집합,
+               'max_idx': 조회 시점 최대 숙소 idx (이후 등록된 숙소는 신규로 간주),
+               'loaded_at': 조회 시각}
+        아직 조회 전이면 None (백그라운드 조회 시작), 주기가 지났으면 기존 집합을 반환하며 다시 조회
+    """
+    if not HOTEL_INDEX_ENABLED:
+        return None
+
+    active = _active
+    if active is None or time.time() - active['loaded_at'] >= HOTEL_ACTIVE_REFRESH_SECONDS:
+        _start_active_load()
+    return active
+
+
+def is_new_hotel(active, idx):
+    """최근 90일 등록 숙소 여부 (집합 조회 이후 등록된 숙소 포함)"""
+    return idx in active['new'] or idx > active['max_idx']
+
+
+def start_hotel_index():
+    """앱 시작 시 색인/최근 활동 숙소 생성 시작 (첫 검색 전에 준비되도록, 여러 번 호출해도 한 번만 생성)"""
+    if HOTEL_INDEX_ENABLED and _index is None:
+        _start_rebuild()
+    if HOTEL_INDEX_ENABLED and _active is None:
+        _start_active_load()
+
+
+def clear_hotel_index():
+    """색인/최근 활동 숙소 초기화 (테스트/강제 재생성용)"""
+    global _index, _active
+
+    with _lock:
+        _index = None
+        _active = None
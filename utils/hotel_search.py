@@ -1,8 +1,12 @@
 # utils/hotel_search.py
 """숙소 검색 기능 모듈
 - 최근 180일 예약이 있는 숙소 또는 신규 등록 숙소 검색
-- LIKE 검색 (숙소명, 숙소코드, 공백 제거 검색)
-- 성능 최적화: 검색 범위 제한
+- 숙소명/숙소코드/공백 제거 숙소명 부분 일치 검색
+- 메모리 n-gram 색인과 최근 활동 숙소 집합(utils/hotel_index.py)으로 검색/정렬
+  (준비 전에는 기존 LIKE 검색)
+- 프로세스 단위 검색 결과 LRU 캐시: 검색어를 이어 입력하면("힐튼" → "힐튼 서울")
+  앞부분 검색어의 캐시 결과를 걸러서 응답 (짧은 검색어는 후보를 넉넉히 가져와 보관)
+- 숙소 ID 목록 일괄 조회 (숙소 디멘션 캐시, utils/dimension_cache.py)
 """
 
 import sys
@@ -10,14 +14,139 @@ import os
 # 프로젝트 루트 디렉토리를 path에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
 import pandas as pd
 from config.configdb import get_db_connection
+from utils.dimension_cache import get_product_labels
+from utils.hotel_index import get_active_hotels, get_hotel_index, is_new_hotel
+from utils.logger import log_app
+
+# 검색 결과 캐시 설정 (.env에서 조정 가능, HOTEL_SEARCH_CACHE_SIZE=0이면 캐시 사용 안 함)
+HOTEL_SEARCH_CACHE_SIZE = int(os.getenv('HOTEL_SEARCH_CACHE_SIZE', 256))  # 보관할 검색어 수
+HOTEL_SEARCH_CACHE_TTL = int(os.getenv('HOTEL_SEARCH_CACHE_TTL', 60))  # 검색 결과 유효 시간 (초)
+HOTEL_SEARCH_PREFIX_CHARS = int(os.getenv('HOTEL_SEARCH_PREFIX_CHARS', 3))  # 이 길이 이하 검색어는
+HOTEL_SEARCH_PREFIX_LIMIT = int(os.getenv('HOTEL_SEARCH_PREFIX_LIMIT', 200))  # 이만큼 가져와 보관
+HOTEL_SEARCH_STATS_EVERY = int(os.getenv('HOTEL_SEARCH_STATS_EVERY', 100))  # 적중률 로그 주기 (검색 횟수)
+
+# 검색어(정리된 키) -> {'results': 정렬된 결과, 'fetched': 요청한 결과 수, 'cached_at': 저장 시각}
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {'hit': 0, 'refine': 0, 'miss': 0}
+
+
+def _search_in_memory(index, active, search_term, limit):
+    """색인 + 최근 활동 숙소 집합으로 검색 (DB 조회 없음, 정렬은 기존 쿼리의 ORDER BY와 동일)"""
+    rows = []
+    for pos in index.find_positions(search_term):
+        idx = index.ids[pos]
+        has_recent_booking = idx in active['booked']
+        # 최근 예약이 있거나, 신규 등록 호텔도 검색
+        if has_recent_booking or is_new_hotel(active, idx):
+            rows.append((not has_recent_booking, index.names[pos], -idx, pos))
+
+    return [
+        {
+            'idx': index.ids[pos],
+            'product_code': index.codes[pos],
+            'name_kr': index.names[pos],
+            'has_recent_booking': int(not no_recent_booking)
+        }
+        for no_recent_booking, _, _, pos in heapq.nsmallest(limit, rows)
+    ]
+
+
+def _cache_key(search_term):
+    """캐시 키 (앞뒤 공백 제거, 소문자 - LIKE 검색처럼 대소문자 구분 없음)"""
+    return search_term.strip().lower()
+
+
+def _matches(hotel, key):
+    """기존 LIKE 조건과 동일한 부분 일치 확인 (숙소명 / 숙소코드 / 공백 제거 숙소명)"""
+    name = hotel['name_kr'].lower()
+    return (key in name
+            or key in hotel['product_code'].lower()
+            or key.replace(' ', '') in name.replace(' ', ''))
+
+
+def _lookup_cache(key, limit):
+    """
+    캐시에서 검색 결과 조회
+
+    가장 긴 앞부분 검색어의 캐시 결과를 현재 검색어로 걸러서 사용합니다.
+    정렬 순서(최근 예약 여부, 숙소명, idx)는 검색어와 무관하므로 걸러낸 결과도 정렬이 유지되고,
+    앞부분 검색 결과가 전부(요청 수 미만) 있거나 걸러낸 결과가 limit개 이상이면 DB 결과와 같습니다.
+
+    Returns:
+        tuple: (결과 리스트 또는 None, 'hit' | 'refine' | 'miss')
+    """
+    now = time.time()
+    with _cache_lock:
+        for end in range(len(key), 1, -1):
+            prefix = key[:end]
+            entry = _cache.get(prefix)
+            if entry is None:
+                continue
+            if now - entry['cached_at'] >= HOTEL_SEARCH_CACHE_TTL:
+                del _cache[prefix]
+                continue
+            results = entry['results']
+            if end < len(key):
+                results = [hotel for hotel in results if _matches(hotel, key)]
+            if len(entry['results']) < entry['fetched'] or len(results) >= limit:
+                _cache.move_to_end(prefix)
+                return [dict(hotel) for hotel in results[:limit]], 'hit' if end == len(key) else 'refine'
+    return None, 'miss'
+
+
+def _store_cache(key, results, fetched):
+    with _cache_lock:
+        _cache[key] = {'results': results, 'fetched': fetched, 'cached_at': time.time()}
+        _cache.move_to_end(key)
+        while len(_cache) > HOTEL_SEARCH_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _record(outcome):
+    """캐시 적중 집계 (HOTEL_SEARCH_STATS_EVERY회마다 앱 로그에 적중률 기록)"""
+    with _cache_lock:
+        _stats[outcome] += 1
+        total = sum(_stats.values())
+        if not HOTEL_SEARCH_STATS_EVERY or total % HOTEL_SEARCH_STATS_EVERY:
+            return
+        stats = dict(_stats)
+        entries = len(_cache)
+    log_app("INFO", "숙소 검색 캐시",
+            검색=total, 적중=stats['hit'], 좁히기=stats['refine'], 미적중=stats['miss'],
+            적중률=f"{(stats['hit'] + stats['refine']) / total * 100:.1f}%", 캐시항목=entries)
+
+
+def get_search_cache_stats():
+    """검색 결과 캐시 적중 현황 (hit: 같은 검색어, refine: 앞부분 검색어 결과를 걸러 응답, miss: 검색 실행)"""
+    with _cache_lock:
+        stats = dict(_stats)
+        stats['entries'] = len(_cache)
+    return stats
+
+
+def clear_search_cache():
+    """검색 결과 캐시 및 집계 초기화"""
+    with _cache_lock:
+        _cache.clear()
+        for outcome in _stats:
+            _stats[outcome] = 0
 
 
 def search_hotels(search_term, limit=15):
     """
     숙소 검색 함수
     
+    같은 검색어나 앞부분 검색어의 캐시 결과로 응답할 수 있으면 캐시를 사용하고,
+    그렇지 않으면 검색 후 결과를 캐시에 저장합니다 (짧은 검색어는 HOTEL_SEARCH_PREFIX_LIMIT개까지 저장).
+    
     Args:
         search_term: 검색어 (2자 이상 권장)
         limit: 최대 결과 수 (기본값: 15)
@@ -39,73 +168,20 @@ def search_hotels(search_term, limit=15):
         return []
     
     try:
-        engine = get_db_connection()
-        
-        # 검색어 정리 (공백 제거)
         search_term_clean = search_term.strip()
-        search_term_no_space = search_term_clean.replace(' ', '')
-        
-        # 검색 쿼리 (최적화)
-        query = """
-        SELECT DISTINCT 
-            p.idx, 
-            p.product_code, 
-            p.name_kr,
-            CASE WHEN op.idx IS NOT NULL THEN 1 ELSE 0 END as has_recent_booking
-        FROM product p
-        LEFT JOIN order_product op ON p.idx = op.product_idx
-            AND (
-                -- 구매일 기준: 최근 180일 (6개월)
-                op.create_date >= DATE_SUB(CURDATE(), INTERVAL 180 DAY)
-                -- 또는 이용일 기준: 오늘 기준 앞뒤 180일
-                OR (
-                    op.checkin_date >= DATE_SUB(CURDATE(), INTERVAL 180 DAY)
-                    AND op.checkin_date <= DATE_ADD(CURDATE(), INTERVAL 180 DAY)
-                )
-            )
-        WHERE (
-            p.name_kr LIKE %s 
-            OR p.product_code LIKE %s
-            OR REPLACE(p.name_kr, ' ', '') LIKE %s  -- 공백 제거 검색
-        )
-        -- 최근 예약이 있거나, 신규 등록 호텔도 검색
-        AND (
-            op.idx IS NOT NULL  -- 최근 예약이 있는 호텔
-            OR p.reg_date >= DATE_SUB(CURDATE(), INTERVAL 90 DAY)  -- 최근 90일 이내 등록 (신규 호텔)
-        )
-        GROUP BY p.idx, p.product_code, p.name_kr
-        ORDER BY 
-            has_recent_booking DESC,  -- 예약 있는 호텔 우선 표시
-            p.name_kr ASC, 
-            p.idx DESC
-        LIMIT %s
-        """
+        if HOTEL_SEARCH_CACHE_SIZE <= 0:
+            return _fetch_hotels(search_term_clean, limit)
         
-        # 검색어에 와일드카드 추가
-        search_pattern = f'%{search_term_clean}%'
-        search_pattern_no_space = f'%{search_term_no_space}%'
+        key = _cache_key(search_term_clean)
+        results, outcome = _lookup_cache(key, limit)
+        _record(outcome)
+        if results is not None:
+            return results
         
-        # 쿼리 실행 (params는 튜플로 전달)
-        df = pd.read_sql(
-            query, 
-            engine,
-            params=(search_pattern, search_pattern, search_pattern_no_space, limit)
-        )
-        
-        # 결과를 딕셔너리 리스트로 변환
-        if df.empty:
-            return []
-        
-        results = []
-        for _, row in df.iterrows():
-            results.append({
-                'idx': int(row['idx']),
-                'product_code': str(row['product_code']) if pd.notna(row['product_code']) else '',
-                'name_kr': str(row['name_kr']) if pd.notna(row['name_kr']) else '',
-                'has_recent_booking': int(row['has_recent_booking'])
-            })
-        
-        return results
+        fetched = max(limit, HOTEL_SEARCH_PREFIX_LIMIT) if len(key) <= HOTEL_SEARCH_PREFIX_CHARS else limit
+        results = _fetch_hotels(search_term_clean, fetched)
+        _store_cache(key, results, fetched)
+        return [dict(hotel) for hotel in results[:limit]]
         
     except Exception as e:
         print(f"❌ 숙소 검색 오류: {e}")
@@ -114,9 +190,122 @@ def search_hotels(search_term, limit=15):
         return []
 
 
+def _fetch_hotels(search_term_clean, limit):
+    """검색 실행 (메모리 색인 또는 DB LIKE 검색, 오류는 호출한 쪽에서 처리)"""
+    # 검색어 정리 (공백 제거)
+    search_term_no_space = search_term_clean.replace(' ', '')
+    
+    index = get_hotel_index()
+    active = get_active_hotels()
+    if index is not None and active is not None:
+        return _search_in_memory(index, active, search_term_clean, limit)
+    
+    engine = get_db_connection()
+    
+    # 검색 쿼리 (최적화)
+    query = """
+    SELECT DISTINCT 
+        p.idx, 
+        p.product_code, 
+        p.name_kr,
+        CASE WHEN op.idx IS NOT NULL THEN 1 ELSE 0 END as has_recent_booking
+    FROM product p
+    LEFT JOIN order_product op ON p.idx = op.product_idx
+        AND (
+            -- 구매일 기준: 최근 180일 (6개월)
+            op.create_date >= DATE_SUB(CURDATE(), INTERVAL 180 DAY)
+            -- 또는 이용일 기준: 오늘 기준 앞뒤 180일
+            OR (
+                op.checkin_date >= DATE_SUB(CURDATE(), INTERVAL 180 DAY)
+                AND op.checkin_date <= DATE_ADD(CURDATE(), INTERVAL 180 DAY)
+            )
+        )
+    WHERE (
+        p.name_kr LIKE %s 
+        OR p.product_code LIKE %s
+        OR REPLACE(p.name_kr, ' ', '') LIKE %s  -- 공백 제거 검색
+    )
+    -- 최근 예약이 있거나, 신규 등록 호텔도 검색
+    AND (
+        op.idx IS NOT NULL  -- 최근 예약이 있는 호텔
+        OR p.reg_date >= DATE_SUB(CURDATE(), INTERVAL 90 DAY)  -- 최근 90일 이내 등록 (신규 호텔)
+    )
+    GROUP BY p.idx, p.product_code, p.name_kr
+    ORDER BY 
+        has_recent_booking DESC,  -- 예약 있는 호텔 우선 표시
+        p.name_kr ASC, 
+        p.idx DESC
+    LIMIT %s
+    """
+    
+    # 검색어에 와일드카드 추가
+    search_pattern = f'%{search_term_clean}%'
+    search_pattern_no_space = f'%{search_term_no_space}%'
+    
+    # 쿼리 실행 (params는 튜플로 전달)
+    df = pd.read_sql(
+        query, 
+        engine,
+        params=(search_pattern, search_pattern, search_pattern_no_space, limit)
+    )
+    
+    # 결과를 딕셔너리 리스트로 변환
+    if df.empty:
+        return []
+    
+    results = []
+    for _, row in df.iterrows():
+        results.append({
+            'idx': int(row['idx']),
+            'product_code': str(row['product_code']) if pd.notna(row['product_code']) else '',
+            'name_kr': str(row['name_kr']) if pd.notna(row['name_kr']) else '',
+            'has_recent_booking': int(row['has_recent_booking'])
+        })
+    
+    return results
+
+
+def get_hotels_by_ids(hotel_ids):
+    """
+    숙소 ID 목록으로 숙소 정보 일괄 조회 (숙소 디멘션 캐시 사용, 캐시에 없는 숙소만 한 번에 조회)
+    
+    Args:
+        hotel_ids: 숙소 ID 목록 (product.idx)
+    
+    Returns:
+        list: 요청 순서대로 숙소 정보 딕셔너리 리스트 (중복 ID 및 product에 없는 ID 제외)
+        [
+            {
+                'idx': 숙소 ID,
+                'product_code': 숙소코드,
+                'name_kr': 숙소 한글명,
+                'reg_date': 등록일 (datetime 또는 None)
+            },
+            ...
+        ]
+    """
+    try:
+        ids = list(dict.fromkeys(int(hotel_id) for hotel_id in hotel_ids if pd.notna(hotel_id)))
+        labels = get_product_labels(ids)
+        
+        return [
+            {
+                'idx': hotel_id,
+                'product_code': str(labels[hotel_id]['product_code'] or ''),
+                'name_kr': str(labels[hotel_id]['name_kr'] or ''),
+                'reg_date': labels[hotel_id]['reg_date']
+            }
+            for hotel_id in ids if hotel_id in labels
+        ]
+        
+    except Exception as e:
+        print(f"❌ 숙소 정보 조회 오류: {e}")
+        return []
+
+
 def get_hotel_by_id(hotel_id):
     """
-    숙소 ID로 숙소 정보 조회
+    숙소 ID로 숙소 정보 조회 (get_hotels_by_ids 참고)
     
     Args:
         hotel_id: 숙소 ID (product.idx)
@@ -126,37 +315,12 @@ def get_hotel_by_id(hotel_id):
         {
             'idx': 숙소 ID,
             'product_code': 숙소코드,
-            'name_kr': 숙소 한글명
+            'name_kr': 숙소 한글명,
+            'reg_date': 등록일
         }
     """
-    try:
-        engine = get_db_connection()
-        
-        query = """
-        SELECT 
-            idx,
-            product_code,
-            name_kr
-        FROM product
-        WHERE idx = %s
-        LIMIT 1
-        """
-        
-        df = pd.read_sql(query, engine, params=(hotel_id,))
-        
-        if df.empty:
-            return None
-        
-        row = df.iloc[0]
-        return {
-            'idx': int(row['idx']),
-            'product_code': str(row['product_code']) if pd.notna(row['product_code']) else '',
-            'name_kr': str(row['name_kr']) if pd.notna(row['name_kr']) else ''
-        }
-        
-    except Exception as e:
-        print(f"❌ 숙소 정보 조회 오류: {e}")
-        return None
+    hotels = get_hotels_by_ids([hotel_id])
+    return hotels[0] if hotels else None
 
 
 # 테스트 함수
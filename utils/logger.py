@@ -1,10 +1,20 @@
 # utils/logger.py
-"""로깅 모듈 - 타입별 로그 파일 분리 및 관리"""
+"""로깅 모듈 - 타입별 로그 파일 분리 및 관리
+- 로거에는 QueueHandler만 붙이고, 파일 쓰기(RotatingFileHandler)는 QueueListener 백그라운드 스레드에서 처리
+  (Streamlit 스크립트 실행 중 디스크 I/O로 대기하지 않음)
+- 레벨 확인 후에만 메시지를 만들고, 메시지 문자열 조합은 기록 스레드에서 수행
+  (꺼진 레벨의 로그는 비용 없음, 인자 계산이 비싼 호출은 is_log_enabled로 먼저 확인)
+- ACCESS_LOG_JSON=true면 조회/다운로드 작업을 JSON 한 줄씩 {앱}_access.jsonl에 추가 기록
+  (utils/access_log_report.py로 작업별/기간별/일별 지연시간 분석)
+"""
 
+import atexit
+import json
 import logging
 import os
+import queue
 from datetime import datetime, timedelta
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 # 로그 디렉토리 설정
@@ -51,6 +61,12 @@ except Exception as e:
     print(f"[LOG WARNING] 원래 로그 디렉토리 생성 실패, 임시 디렉토리 사용: {_log_dir.absolute()}")
     print(f"[LOG WARNING] 오류: {e}")
 
+# 통합 로그 기록 레벨 (.env에서 조정 가능, DEBUG로 두면 인증/세션 디버깅 로그도 기록)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
+# JSON 접근 로그 사용 여부 (기존 텍스트 로그는 그대로 기록)
+ACCESS_LOG_JSON = os.getenv('ACCESS_LOG_JSON', 'false').lower() in ('1', 'true', 'yes')
+
 # 로그 포맷
 LOG_FORMAT = "[%(asctime)s] [%(levelname)-8s] [%(category)s] %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -58,6 +74,9 @@ DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 # 로거 딕셔너리
 _loggers = {}
 
+# 로그 파일별 백그라운드 기록 스레드
+_listeners = []
+
 # 로그 레벨 매핑
 LOG_LEVELS = {
     'DEBUG': logging.DEBUG,
@@ -79,8 +98,43 @@ class CategoryFilter(logging.Filter):
         return True
 
 
-def _setup_logger(name: str, filename: str, category: str, level: int = logging.INFO):
-    """로거 설정"""
+class _Message:
+    """로그 메시지 (기록 스레드에서 str() 될 때 문자열 조합)"""
+    __slots__ = ('prefix', 'message', 'extra_info', 'suffix')
+    
+    def __init__(self, prefix, message, extra_info=None, suffix=''):
+        self.prefix = prefix
+        self.message = message
+        self.extra_info = extra_info
+        self.suffix = suffix
+    
+    def __str__(self):
+        full_message = self.message
+        if self.extra_info:
+            full_message += f": {', '.join(f'{key}={value}' for key, value in self.extra_info)}"
+        return f"{self.prefix}{full_message}{self.suffix}"
+
+
+class _JsonMessage:
+    """JSON 접근 로그 한 줄 (기록 스레드에서 직렬화)"""
+    __slots__ = ('fields',)
+    
+    def __init__(self, fields):
+        self.fields = fields
+    
+    def __str__(self):
+        return json.dumps(self.fields, ensure_ascii=False, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """메시지를 호출한 스레드에서 포맷하지 않고 그대로 큐에 넣는 QueueHandler"""
+    
+    def prepare(self, record):
+        return record
+
+
+def _setup_logger(name: str, filename: str, category: str, level: int = logging.INFO, log_format: str = LOG_FORMAT):
+    """로거 설정 (로거 -> 큐 -> 백그라운드 스레드 -> 파일)"""
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
@@ -91,22 +145,17 @@ def _setup_logger(name: str, filename: str, category: str, level: int = logging.
     # 로그 파일명 처리 (앱 이름이 이미 포함된 경우 그대로 사용)
     log_filename = filename
     
+    formatter = logging.Formatter(log_format, DATE_FORMAT)
+    
     # 파일 핸들러 (일별 로테이션)
     log_file = _log_dir / log_filename
     try:
-        file_handler = RotatingFileHandler(
+        handler = RotatingFileHandler(
             log_file,
             maxBytes=10 * 1024 * 1024,  # 10MB
             backupCount=30,  # 30일 보관
             encoding='utf-8'
         )
-        file_handler.setLevel(level)
-        file_handler.addFilter(CategoryFilter(category))
-        
-        formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-        file_handler.setFormatter(formatter)
-        
-        logger.addHandler(file_handler)
         
         # 디버깅: 로그 파일 경로 확인 (최초 설정 시에만)
         if not hasattr(_setup_logger, '_files_logged'):
@@ -117,16 +166,40 @@ def _setup_logger(name: str, filename: str, category: str, level: int = logging.
         print(f"[LOG ERROR] 로그 파일 생성 실패: {log_file.absolute()}")
         print(f"[LOG ERROR] 오류: {e}")
         # 콘솔 핸들러 추가 (파일 쓰기 실패 시 대안)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(level)
-        console_handler.addFilter(CategoryFilter(category))
-        formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handler = logging.StreamHandler()
+    
+    handler.setLevel(level)
+    handler.addFilter(CategoryFilter(category))
+    handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    # 상위(root) 로거 핸들러에서 호출 스레드가 다시 포맷/기록하지 않도록 전파하지 않음
+    logger.propagate = False
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
     
     return logger
 
 
+def flush_logs():
+    """대기 중인 로그를 모두 파일에 기록 (기록 스레드를 멈췄다가 다시 시작)"""
+    for listener in _listeners:
+        listener.stop()
+        listener.start()
+
+
+def _stop_listeners():
+    for listener in _listeners:
+        listener.stop()
+    _listeners.clear()
+
+
+# 프로세스 종료 시 남은 로그 기록
+atexit.register(_stop_listeners)
+
+
 def _get_logger(log_type: str):
     """로거 가져오기 (통합 로그)"""
     # 앱 이름을 포함한 고유 키 생성 (앱별로 로거 분리)
@@ -141,7 +214,8 @@ def _get_logger(log_type: str):
             log_filename = "app.log"
             logger_name = "app_unified"
         
-        _loggers[logger_key] = _setup_logger(logger_name, log_filename, 'APP')
+        _loggers[logger_key] = _setup_logger(logger_name, log_filename, 'APP',
+                                             level=LOG_LEVELS.get(LOG_LEVEL, logging.INFO))
     
     return _loggers[logger_key]
 
@@ -164,11 +238,28 @@ def _get_error_logger():
     return _loggers[logger_key]
 
 
+def _get_event_logger():
+    """JSON 접근 로그 로거 가져오기 (한 줄에 JSON 하나, channels_access.jsonl, hotel_access.jsonl)"""
+    logger_key = f"event_{_app_name}" if _app_name else "event"
+    
+    if logger_key not in _loggers:
+        if _app_name:
+            log_filename = f"{_app_name}_access.jsonl"
+            logger_name = f"{_app_name}_event"
+        else:
+            log_filename = "access.jsonl"
+            logger_name = "event"
+        
+        _loggers[logger_key] = _setup_logger(logger_name, log_filename, 'EVENT', log_format='%(message)s')
+    
+    return _loggers[logger_key]
+
+
 def _clean_old_logs(days: int = 30):
     """오래된 로그 파일 삭제"""
     try:
         cutoff_date = datetime.now() - timedelta(days=days)
-        for log_file in _log_dir.glob("*.log.*"):  # 로테이션된 파일
+        for log_file in [*_log_dir.glob("*.log.*"), *_log_dir.glob("*.jsonl.*")]:  # 로테이션된 파일
             try:
                 file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
                 if file_time < cutoff_date:
@@ -179,43 +270,42 @@ def _clean_old_logs(days: int = 30):
         pass
 
 
+def is_log_enabled(level: str) -> bool:
+    """해당 레벨 로그가 기록되는지 확인 (인자 계산 비용이 큰 로그 호출 전에 사용)"""
+    return _get_logger('unified').isEnabledFor(LOG_LEVELS.get(level.upper(), logging.INFO))
+
+
+def _log(log_level: int, message, write_error: bool = False):
+    """통합 로그 기록 (ERROR 레벨 이상이거나 write_error면 에러 로그에도 기록)"""
+    _get_logger('unified').log(log_level, message)
+    if write_error or log_level >= logging.ERROR:
+        _get_error_logger().log(log_level, message)
+
+
 def log_auth(level: str, message: str, admin_id: str = None, ip: str = None, **kwargs):
     """인증 관련 로그"""
-    logger = _get_logger('unified')
     log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    if not _get_logger('unified').isEnabledFor(log_level):
+        return
     
-    # 추가 정보 포맷팅
+    # 추가 정보 (문자열 조합은 기록 스레드에서)
     extra_info = []
     if admin_id:
-        extra_info.append(f"admin_id={admin_id}")
+        extra_info.append(('admin_id', admin_id))
     if ip:
-        extra_info.append(f"IP={ip}")
-    for key, value in kwargs.items():
-        if key not in ['admin_id', 'ip']:
-            extra_info.append(f"{key}={value}")
-    
-    full_message = message
-    if extra_info:
-        full_message += f": {', '.join(extra_info)}"
-    
-    # 통합 로그에 기록
-    logger.log(log_level, f"[AUTH] {full_message}")
+        extra_info.append(('IP', ip))
+    extra_info.extend(kwargs.items())
     
-    # ERROR 레벨인 경우 에러 로그에도 기록
-    if log_level >= logging.ERROR:
-        error_logger = _get_error_logger()
-        error_logger.log(log_level, f"[AUTH] {full_message}")
+    _log(log_level, _Message("[AUTH] ", message, extra_info))
 
 
 def log_error(level: str, message: str, exception: Exception = None, traceback_str: str = None, **kwargs):
-    """에러 로그"""
-    logger = _get_logger('unified')
+    """에러 로그 (레벨과 관계없이 에러 로그에도 기록)"""
     log_level = LOG_LEVELS.get(level.upper(), logging.ERROR)
-    
-    full_message = message
-    if kwargs:
-        extra_info = [f"{key}={value}" for key, value in kwargs.items()]
-        full_message += f": {', '.join(extra_info)}"
+    unified_enabled = _get_logger('unified').isEnabledFor(log_level)
+    error_enabled = _get_error_logger().isEnabledFor(log_level)
+    if not unified_enabled and not error_enabled:
+        return
     
     # 실패 사유: 사용자 친화적 메시지 + 기술적 상세 정보
     if exception:
@@ -235,67 +325,64 @@ def log_error(level: str, message: str, exception: Exception = None, traceback_s
         }
         
         user_msg = user_friendly_msgs.get(exception_type, f'{exception_type} 오류')
-        full_message += f", 사유={user_msg} | Exception: {exception_type}: {exception_msg}"
+        suffix = f", 사유={user_msg} | Exception: {exception_type}: {exception_msg}"
     else:
-        full_message += f", 사유={message}"
-    
-    # 통합 로그에 기록
-    logger.log(log_level, f"[ERROR] {full_message}")
+        suffix = f", 사유={message}"
     
-    # 에러 로그에도 기록
-    error_logger = _get_error_logger()
-    error_logger.log(log_level, f"[ERROR] {full_message}")
+    full_message = _Message("[ERROR] ", message, list(kwargs.items()), suffix)
+    _log(log_level, full_message, write_error=True)
     
     if traceback_str:
-        logger.log(log_level, f"Traceback: {traceback_str}")
-        error_logger.log(log_level, f"Traceback: {traceback_str}")
+        _log(log_level, f"Traceback: {traceback_str}", write_error=True)
 
 
 def log_access(level: str, message: str, admin_id: str = None, action: str = None, **kwargs):
     """접근/활동 로그"""
-    logger = _get_logger('unified')
     log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    if not _get_logger('unified').isEnabledFor(log_level):
+        return
     
-    # 추가 정보 포맷팅
+    # 추가 정보 (문자열 조합은 기록 스레드에서)
     extra_info = []
     if admin_id:
-        extra_info.append(f"admin_id={admin_id}")
+        extra_info.append(('admin_id', admin_id))
     if action:
-        extra_info.append(f"action={action}")
-    for key, value in kwargs.items():
-        if key not in ['admin_id', 'action']:
-            extra_info.append(f"{key}={value}")
-    
-    full_message = message
-    if extra_info:
-        full_message += f": {', '.join(extra_info)}"
+        extra_info.append(('action', action))
+    extra_info.extend(kwargs.items())
     
-    # 통합 로그에 기록
-    logger.log(log_level, f"[ACCESS] {full_message}")
-    
-    # ERROR 레벨인 경우 에러 로그에도 기록
-    if log_level >= logging.ERROR:
-        error_logger = _get_error_logger()
-        error_logger.log(log_level, f"[ACCESS] {full_message}")
+    _log(log_level, _Message("[ACCESS] ", message, extra_info))
 
 
 def log_app(level: str, message: str, **kwargs):
     """전체 로그 (통합 로그)"""
-    logger = _get_logger('unified')
     log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
+    if not _get_logger('unified').isEnabledFor(log_level):
+        return
     
-    full_message = message
-    if kwargs:
-        extra_info = [f"{key}={value}" for key, value in kwargs.items()]
-        full_message += f": {', '.join(extra_info)}"
+    _log(log_level, _Message("", message, list(kwargs.items())))
+
+
+def log_event(action: str, status: str = 'success', **fields):
+    """
+    JSON 접근 로그 (ACCESS_LOG_JSON=true일 때만 기록)
     
-    # 통합 로그에 기록
-    logger.log(log_level, full_message)
+    Args:
+        action: 작업 이름 ('search', 'excel_download', 'raw_export')
+        status: 'success' 또는 'error'
+        **fields: 값 그대로 기록할 항목 (admin_id, start_date, end_date, days, date_type, sale_type,
+                  channel_count, hotel_count, rows, elapsed_ms, timings 등, None은 생략)
+    """
+    if not ACCESS_LOG_JSON:
+        return
     
-    # ERROR 레벨인 경우 에러 로그에도 기록
-    if log_level >= logging.ERROR:
-        error_logger = _get_error_logger()
-        error_logger.log(log_level, full_message)
+    record = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'app': _app_name,
+        'action': action,
+        'status': status,
+    }
+    record.update((key, value) for key, value in fields.items() if value is not None)
+    _get_event_logger().info(_JsonMessage(record))
 
 
 def setup_logging(app_name: str = None):
@@ -339,5 +426,6 @@ if __name__ == "__main__":
     log_auth("INFO", "로그인 성공", admin_id="test_user")
     log_error("ERROR", "데이터베이스 연결 실패", exception=Exception("Connection timeout"))
     log_access("INFO", "데이터 조회", admin_id="test_user", action="fetch_data", 기간="2025-01-01~2025-01-07")
+    flush_logs()
     print("✅ 로깅 테스트 완료")
 
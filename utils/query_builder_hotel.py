@@ -2,7 +2,8 @@
 """숙소별 통계 쿼리 생성 모듈
 - 날짜별 + 숙소별 + 채널별 집계
 - order_item.due_price 사용 (입금가)
-- product 테이블 JOIN
+- 정수 키로만 집계 (라벨은 utils.dimension_cache에서 부여)
+- 빌더는 SQLAlchemy text() 객체를 반환 (값은 바인딩 파라미터, SQL 본문은 형태별로 재사용)
 """
 
 import sys
@@ -11,11 +12,104 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import text
 from config.order_status_mapping import (
     get_status_codes_by_group,
     get_all_status_codes
 )
 from config.master_data_loader import get_all_order_status_codes
+from utils.rollup_etl import ROLLUP_TABLE
+from utils.query_sql_common import (
+    DEPOSIT_EXPR,
+    build_booking_count_sql,
+    build_deposit_join,
+    build_order_rows,
+    channel_key_sql,
+    date_params,
+    date_sql,
+    date_str,
+    with_expanding
+)
+
+
+@lru_cache(maxsize=None)
+def _hotel_statistics_template(date_type, has_status_filter, has_hotel_filter, has_sale_type_filter):
+    """숙소별 통계 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    hotel_filter = "AND op.product_idx IN :hotel_ids" if has_hotel_filter else ""
+    sale_type_filter = "AND pr.sale_type = :sale_type" if has_sale_type_filter else ""
+
+    # order_product 행 단위 입금가/대표 행 표시 (order_product는 한 번만 조회)
+    order_rows = build_order_rows(
+        date_type, [status_condition, hotel_filter, sale_type_filter], columns=('product_idx',)
+    )
+
+    # 입금가/실구매가는 내부 집계에서 한 번만 계산하고, 수익/수익률/취소율은 바깥에서 파생
+    query = f"""
+    SELECT
+        agg.booking_date,
+        agg.hotel_idx,
+        agg.channel_idx,
+        agg.order_type,
+        agg.channel_code,
+        agg.sale_type,
+        agg.booking_count,
+        agg.order_count,
+        agg.total_rooms,
+        agg.confirmed_rooms,
+        agg.cancelled_rooms,
+        CASE
+            WHEN agg.total_rooms = 0 THEN 0
+            ELSE agg.cancelled_rooms * 100.0 / agg.total_rooms
+        END as cancellation_rate,
+        agg.total_deposit,
+        agg.total_purchase,
+        agg.total_purchase - agg.total_deposit as total_profit,
+        CASE
+            WHEN agg.total_deposit = 0 THEN 0
+            ELSE (agg.total_purchase - agg.total_deposit) * 100.0 / agg.total_deposit
+        END as profit_rate
+    FROM (
+        SELECT
+            r.booking_date,
+            -- 집계는 정수 키(product_idx, order_channel_idx) 기준
+            -- 숙소명/숙소코드/채널명은 조회 후 utils.dimension_cache에서 부여
+            r.product_idx as hotel_idx,
+            r.order_channel_idx as channel_idx,
+            -- common_code에 없는 채널의 대체 라벨 (없는 채널은 order_type별로 그룹화되므로 그룹 키와 같음)
+            MIN(r.order_type) as order_type,
+            GROUP_CONCAT(DISTINCT r.order_type ORDER BY r.order_type SEPARATOR ', ') as channel_code,
+            -- 판매유형 추가
+            COALESCE(r.sale_type, '') as sale_type,
+            COUNT(DISTINCT r.order_num) as booking_count,
+            -- 대표 행 수 (합산하면 전체 기간 고유 예약건수, 요약 통계용)
+            SUM(r.is_first_order) as order_count,
+            SUM(r.rooms) as total_rooms,
+            SUM(CASE
+                WHEN r.order_product_status IN :confirmed_statuses
+                THEN r.rooms
+                ELSE 0
+            END) as confirmed_rooms,
+            SUM(CASE
+                WHEN r.order_product_status IN :cancelled_statuses
+                THEN r.rooms
+                ELSE 0
+            END) as cancelled_rooms,
+            SUM(r.deposit) as total_deposit,
+            SUM(COALESCE(r.total_amount, 0)) as total_purchase
+        FROM {order_rows}
+        GROUP BY r.booking_date, r.product_idx, r.order_channel_idx, r.channel_group, r.sale_type
+    ) agg
+    ORDER BY agg.booking_date DESC
+    """
+
+    expanding = ['confirmed_statuses', 'cancelled_statuses']
+    if has_status_filter:
+        expanding.append('all_statuses')
+    if has_hotel_filter:
+        expanding.append('hotel_ids')
+    return with_expanding(text(query), *expanding)
 
 
 def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
@@ -23,7 +117,8 @@ def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
     """
     숙소별 통계 쿼리 생성
     날짜별 + 숙소별 + 채널별 집계
-    
+    숙소명/숙소코드/채널명은 포함하지 않음 - 조회 후 utils.dimension_cache로 부여
+
     Args:
         start_date: 시작일 (YYYY-MM-DD)
         end_date: 종료일 (YYYY-MM-DD)
@@ -31,133 +126,198 @@ def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
         date_type: 날짜유형 ('useDate', 'orderDate')
         order_status: 예약상태 (항상 '전체'로 고정)
         sale_type: 판매유형 ('전체', 'b2c', 'b2b')
-    
+
     Returns:
-        SQL 쿼리 문자열
+        sqlalchemy TextClause (바인딩 값 포함, pd.read_sql에 그대로 전달)
     """
-    
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+
     # 숙소 필터 조건 생성
-    hotel_filter = ""
-    if selected_hotel_ids and len(selected_hotel_ids) > 0:
-        hotel_ids_str = ','.join([str(hid) for hid in selected_hotel_ids])
-        hotel_filter = f"AND op.product_idx IN ({hotel_ids_str})"
-    
+    hotel_ids = [int(hid) for hid in selected_hotel_ids] if selected_hotel_ids else []
+
     # 판매유형 필터 조건 생성
-    sale_type_filter = ""
-    if sale_type and sale_type != '전체':
-        sale_type_filter = f"AND pr.sale_type = '{sale_type}'"
-    
-    # 날짜 조건 생성
-    date_condition = ""
-    if date_type == 'useDate':
-        # 이용일 기준
-        date_condition = f"op.checkin_date >= '{start_date}' AND op.checkin_date <= '{end_date}'"
-        date_field = "DATE(op.checkin_date)"
-    else:  # orderDate (기본값)
-        # 구매일 기준
-        date_condition = f"op.create_date >= '{start_date}' AND op.create_date <= '{end_date} 23:59:59'"
-        date_field = "DATE(op.create_date)"
-    
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+
     # 예약상태 조건 생성 (항상 '전체'로 고정)
-    status_condition = ""
-    if order_status == '전체':
-        all_statuses = get_all_order_status_codes()
-        if all_statuses:
-            status_list = ','.join([f"'{s}'" for s in all_statuses])
-            status_condition = f"AND op.order_product_status IN ({status_list})"
-        else:
-            status_condition = ""
-    
-    # 확정/취소 상태 리스트 생성
-    confirmed_statuses = get_status_codes_by_group('확정')
-    cancelled_statuses = get_status_codes_by_group('취소')
-    
-    confirmed_list = ','.join([f"'{s}'" for s in confirmed_statuses]) if confirmed_statuses else "''"
-    cancelled_list = ','.join([f"'{s}'" for s in cancelled_statuses]) if cancelled_statuses else "''"
-    
+    all_statuses = get_all_order_status_codes() if order_status == '전체' else None
+
+    params = {
+        **date_params(date_type, start_date, end_date),
+        # 확정/취소 상태 리스트
+        'confirmed_statuses': list(get_status_codes_by_group('확정') or []),
+        'cancelled_statuses': list(get_status_codes_by_group('취소') or [])
+    }
+    if all_statuses:
+        params['all_statuses'] = list(all_statuses)
+    if hotel_ids:
+        params['hotel_ids'] = hotel_ids
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    template = _hotel_statistics_template(date_type, bool(all_statuses), bool(hotel_ids), has_sale_type_filter)
+    return template.bindparams(**params)
+
+
+@lru_cache(maxsize=None)
+def _rollup_hotel_statistics_template(has_hotel_filter, has_sale_type_filter):
+    """롤업 숙소별 통계 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    hotel_filter = "AND r.product_idx IN :hotel_ids" if has_hotel_filter else ""
+    sale_type_filter = "AND r.sale_type = :sale_type" if has_sale_type_filter else ""
+    channel_join, channel_key = channel_key_sql('r')
+
     query = f"""
-    SELECT 
-        {date_field} as booking_date,
-        p.name_kr as hotel_name,
-        p.idx as hotel_idx,
-        p.product_code as hotel_code,
-        -- order_channel_idx 기준으로 channel_name 결정
-        COALESCE((
-            SELECT cc.code_name 
-            FROM common_code cc 
-            WHERE cc.code_id = op.order_channel_idx 
-                AND cc.parent_idx = 1 
-            ORDER BY cc.idx
-            LIMIT 1
-        ), op.order_type, 
-            CASE op.order_type
-                WHEN 'expedia' THEN 'Expedia'
-                WHEN 'expediab2b' THEN 'Expedia B2B'
-                WHEN 'hotelbeds' THEN 'Hotelbeds'
-                WHEN 'dabo' THEN '다보'
-                WHEN 'nuuaapi' THEN '누아'
-                WHEN 'hiot' THEN '하이오티'
-                ELSE op.order_type
-            END
-        ) as channel_name,
-        op.order_channel_idx as channel_idx,
-        GROUP_CONCAT(DISTINCT op.order_type ORDER BY op.order_type SEPARATOR ', ') as channel_code,
-        -- 판매유형 추가
-        COALESCE(pr.sale_type, '') as sale_type,
-        COUNT(DISTINCT op.order_num) as booking_count,
-        SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)) as total_rooms,
-        SUM(CASE 
-            WHEN op.order_product_status IN ({confirmed_list}) 
-            THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0) 
-            ELSE 0 
-        END) as confirmed_rooms,
-        SUM(CASE 
-            WHEN op.order_product_status IN ({cancelled_list}) 
-            THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0) 
-            ELSE 0 
-        END) as cancelled_rooms,
-        CASE 
-            WHEN SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)) = 0 THEN 0
-            ELSE (SUM(CASE 
-                WHEN op.order_product_status IN ({cancelled_list}) 
-                THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0) 
-                ELSE 0 
-            END) / SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0))) * 100
+    SELECT
+        agg.booking_date,
+        agg.hotel_idx,
+        agg.channel_idx,
+        agg.order_type,
+        agg.channel_code,
+        agg.sale_type,
+        agg.booking_count,
+        agg.order_count,
+        agg.total_rooms,
+        agg.confirmed_rooms,
+        agg.cancelled_rooms,
+        CASE
+            WHEN agg.total_rooms = 0 THEN 0
+            ELSE agg.cancelled_rooms * 100.0 / agg.total_rooms
         END as cancellation_rate,
-        -- order_item.due_price 사용 (입금가) - due_price 합계 * room_cnt
-        SUM(COALESCE((
-            SELECT SUM(oi2.due_price)
-            FROM order_item oi2
-            WHERE oi2.order_product_idx = op.idx
-        ), 0) * COALESCE(op.room_cnt, 1)) as total_deposit,
-        -- order_pay는 직접 JOIN하여 사용 (1:1 관계이므로 중복 없음)
-        SUM(COALESCE(opay.total_amount, 0)) as total_purchase,
-        SUM(COALESCE(opay.total_amount, 0)) - SUM(COALESCE((
-            SELECT SUM(oi2.due_price)
-            FROM order_item oi2
-            WHERE oi2.order_product_idx = op.idx
-        ), 0) * COALESCE(op.room_cnt, 1)) as total_profit,
-        CASE 
-            WHEN SUM(COALESCE((
-                SELECT SUM(oi2.due_price)
-                FROM order_item oi2
-                WHERE oi2.order_product_idx = op.idx
-            ), 0) * COALESCE(op.room_cnt, 1)) = 0 THEN 0
-            ELSE ((SUM(COALESCE(opay.total_amount, 0)) - SUM(COALESCE((
-                SELECT SUM(oi2.due_price)
-                FROM order_item oi2
-                WHERE oi2.order_product_idx = op.idx
-            ), 0) * COALESCE(op.room_cnt, 1))) 
-                  / SUM(COALESCE((
-                SELECT SUM(oi2.due_price)
-                FROM order_item oi2
-                WHERE oi2.order_product_idx = op.idx
-            ), 0) * COALESCE(op.room_cnt, 1))) * 100
+        agg.total_deposit,
+        agg.total_purchase,
+        agg.total_purchase - agg.total_deposit as total_profit,
+        CASE
+            WHEN agg.total_deposit = 0 THEN 0
+            ELSE (agg.total_purchase - agg.total_deposit) * 100.0 / agg.total_deposit
         END as profit_rate
+    FROM (
+        SELECT
+            r.stat_date as booking_date,
+            r.product_idx as hotel_idx,
+            r.order_channel_idx as channel_idx,
+            MIN(r.order_type) as order_type,
+            GROUP_CONCAT(DISTINCT r.order_type ORDER BY r.order_type SEPARATOR ', ') as channel_code,
+            r.sale_type,
+            -- 롤업 행은 order_type까지 나뉘어 있으므로 booking_count를 그대로 합산
+            SUM(r.booking_count) as booking_count,
+            SUM(r.order_count) as order_count,
+            SUM(r.total_rooms) as total_rooms,
+            SUM(r.confirmed_rooms) as confirmed_rooms,
+            SUM(r.cancelled_rooms) as cancelled_rooms,
+            SUM(r.total_deposit) as total_deposit,
+            SUM(r.total_purchase) as total_purchase
+        FROM {ROLLUP_TABLE} r
+        {channel_join}
+        WHERE r.date_type = :date_type
+            AND r.stat_date >= :start_date AND r.stat_date <= :end_date
+            {hotel_filter}
+            {sale_type_filter}
+        GROUP BY r.stat_date, r.product_idx, r.order_channel_idx, {channel_key}, r.sale_type
+    ) agg
+    ORDER BY agg.booking_date DESC
+    """
+
+    if has_hotel_filter:
+        return with_expanding(text(query), 'hotel_ids')
+    return text(query)
+
+
+def build_rollup_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
+                                        date_type='orderDate', order_status='전체', sale_type='전체'):
+    """
+    숙소별 통계 쿼리 생성 - 롤업 테이블(utils.rollup_etl) 사용
+    build_hotel_statistics_query와 같은 컬럼을 반환하며, 원본 테이블 대신 일별 집계 행만 합산
+    (기준은 마지막 ETL 실행 시점)
+
+    order_count는 (주문번호, 날짜) 대표 행 기준이므로, 요약 통계 예약건수는
+    build_hotel_booking_count_query로 원본 테이블에서 따로 계산합니다 (fetch_hotel_data).
+
+    Args:
+        build_hotel_statistics_query와 동일
+
+    Returns:
+        sqlalchemy TextClause (바인딩 값 포함)
+    """
+    hotel_ids = [int(hid) for hid in selected_hotel_ids] if selected_hotel_ids else []
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+
+    params = {
+        'date_type': 'useDate' if date_type == 'useDate' else 'orderDate',
+        'start_date': date_str(start_date),
+        'end_date': date_str(end_date)
+    }
+    if hotel_ids:
+        params['hotel_ids'] = hotel_ids
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    return _rollup_hotel_statistics_template(bool(hotel_ids), has_sale_type_filter).bindparams(**params)
+
+
+@lru_cache(maxsize=None)
+def _hotel_booking_count_template(date_type, has_status_filter, has_hotel_filter, has_sale_type_filter):
+    """숙소별 고유 예약건수 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    hotel_filter = "AND op.product_idx IN :hotel_ids" if has_hotel_filter else ""
+    sale_type_filter = "AND pr.sale_type = :sale_type" if has_sale_type_filter else ""
+
+    query = build_booking_count_sql(
+        date_type, [status_condition, hotel_filter, sale_type_filter], has_sale_type_filter
+    )
+
+    expanding = []
+    if has_status_filter:
+        expanding.append('all_statuses')
+    if has_hotel_filter:
+        expanding.append('hotel_ids')
+    return with_expanding(text(query), *expanding)
+
+
+def build_hotel_booking_count_query(start_date, end_date, selected_hotel_ids=None,
+                                    date_type='orderDate', order_status='전체', sale_type='전체'):
+    """
+    숙소별 조회 기간 고유 예약건수 쿼리 생성 (build_hotel_statistics_query와 같은 조건)
+    롤업 테이블 조회 시 요약 통계 예약건수(total_bookings)를 정확히 계산하는 데 사용
+
+    Args:
+        build_hotel_statistics_query와 동일
+
+    Returns:
+        sqlalchemy TextClause (바인딩 값 포함, 컬럼 total_bookings)
+    """
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+    hotel_ids = [int(hid) for hid in selected_hotel_ids] if selected_hotel_ids else []
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+    all_statuses = get_all_order_status_codes() if order_status == '전체' else None
+
+    params = date_params(date_type, start_date, end_date)
+    if all_statuses:
+        params['all_statuses'] = list(all_statuses)
+    if hotel_ids:
+        params['hotel_ids'] = hotel_ids
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    template = _hotel_booking_count_template(date_type, bool(all_statuses), bool(hotel_ids), has_sale_type_filter)
+    return template.bindparams(**params)
+
+
+@lru_cache(maxsize=None)
+def _hotel_summary_template(date_type, has_status_filter, has_hotel_filter, has_sale_type_filter):
+    """숙소별 요약 통계 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    date_field, date_condition = date_sql(date_type)
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    hotel_filter = "AND op.product_idx IN :hotel_ids" if has_hotel_filter else ""
+    sale_type_filter = "AND pr.sale_type = :sale_type" if has_sale_type_filter else ""
+    deposit_join = build_deposit_join(date_type)
+
+    query = f"""
+    SELECT
+        COUNT(DISTINCT op.order_num) as total_bookings,
+        SUM({DEPOSIT_EXPR}) as total_revenue,
+        COUNT(DISTINCT op.product_idx) as hotel_count,
+        COUNT(DISTINCT {date_field}) as active_days
     FROM order_product op
-    LEFT JOIN product p ON op.product_idx = p.idx
-    LEFT JOIN order_pay opay 
-        ON op.order_pay_idx = opay.idx
+    {deposit_join}
     LEFT JOIN product_rateplan pr
         ON op.rateplan_idx = pr.idx
     WHERE {date_condition}
@@ -165,18 +325,21 @@ def build_hotel_statistics_query(start_date, end_date, selected_hotel_ids=None,
         {status_condition}
         {hotel_filter}
         {sale_type_filter}
-    GROUP BY {date_field}, p.idx, p.name_kr, p.product_code, op.order_channel_idx, channel_name, pr.sale_type
-    ORDER BY booking_date DESC, hotel_name ASC, channel_name ASC
     """
-    
-    return query
+
+    expanding = []
+    if has_status_filter:
+        expanding.append('all_statuses')
+    if has_hotel_filter:
+        expanding.append('hotel_ids')
+    return with_expanding(text(query), *expanding)
 
 
 def build_hotel_summary_query(start_date, end_date, selected_hotel_ids=None,
                               date_type='orderDate', order_status='전체', sale_type='전체'):
     """
     숙소별 요약 통계 쿼리 생성
-    
+
     Args:
         start_date: 시작일
         end_date: 종료일
@@ -184,60 +347,31 @@ def build_hotel_summary_query(start_date, end_date, selected_hotel_ids=None,
         date_type: 날짜유형
         order_status: 예약상태 (항상 '전체'로 고정)
         sale_type: 판매유형 ('전체', 'b2c', 'b2b')
-    
+
     Returns:
-        SQL 쿼리 문자열
+        sqlalchemy TextClause (바인딩 값 포함)
     """
-    
-    # 날짜 조건
-    date_condition = ""
-    if date_type == 'useDate':
-        date_condition = f"op.checkin_date >= '{start_date}' AND op.checkin_date <= '{end_date}'"
-    else:  # orderDate
-        date_condition = f"op.create_date >= '{start_date}' AND op.create_date <= '{end_date} 23:59:59'"
-    
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+
     # 예약상태 조건 (항상 '전체')
-    status_condition = ""
     all_statuses = get_all_order_status_codes()
-    if all_statuses:
-        status_list = ','.join([f"'{s}'" for s in all_statuses])
-        status_condition = f"AND op.order_product_status IN ({status_list})"
-    
+
     # 숙소 필터
-    hotel_filter = ""
-    if selected_hotel_ids and len(selected_hotel_ids) > 0:
-        hotel_ids_str = ','.join([str(hid) for hid in selected_hotel_ids])
-        hotel_filter = f"AND op.product_idx IN ({hotel_ids_str})"
-    
+    hotel_ids = [int(hid) for hid in selected_hotel_ids] if selected_hotel_ids else []
+
     # 판매유형 필터 조건 생성
-    sale_type_filter = ""
-    if sale_type and sale_type != '전체':
-        sale_type_filter = f"AND pr.sale_type = '{sale_type}'"
-    
-    query = f"""
-    SELECT 
-        COUNT(DISTINCT op.order_num) as total_bookings,
-        SUM(COALESCE((
-            SELECT SUM(oi2.due_price)
-            FROM order_item oi2
-            WHERE oi2.order_product_idx = op.idx
-        ), 0) * COALESCE(op.room_cnt, 1)) as total_revenue,
-        COUNT(DISTINCT op.product_idx) as hotel_count,
-        COUNT(DISTINCT CASE 
-            WHEN '{date_type}' = 'useDate' THEN DATE(op.checkin_date)
-            ELSE DATE(op.create_date)
-        END) as active_days
-    FROM order_product op
-    LEFT JOIN product_rateplan pr
-        ON op.rateplan_idx = pr.idx
-    WHERE {date_condition}
-        AND op.create_date < CURDATE()
-        {status_condition}
-        {hotel_filter}
-        {sale_type_filter}
-    """
-    
-    return query
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+
+    params = date_params(date_type, start_date, end_date)
+    if all_statuses:
+        params['all_statuses'] = list(all_statuses)
+    if hotel_ids:
+        params['hotel_ids'] = hotel_ids
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    template = _hotel_summary_template(date_type, bool(all_statuses), bool(hotel_ids), has_sale_type_filter)
+    return template.bindparams(**params)
 
 
 # 테스트 함수
@@ -245,27 +379,27 @@ if __name__ == "__main__":
     # 테스트용 날짜
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=7)
-    
+
     print("="*60)
     print("📝 숙소별 통계 쿼리 빌더 테스트")
     print("="*60)
-    
+
     # 테스트 1: 기본 쿼리
     print(f"\n[테스트 1] 기본 쿼리 ({start_date} ~ {end_date})")
     print("- 날짜유형: 구매일, 예약상태: 전체")
     query = build_hotel_statistics_query(start_date, end_date, None, 'orderDate', '전체')
-    print(query[:500] + "...")
-    
+    print(str(query)[:500] + "...")
+
     # 테스트 2: 숙소 필터 포함
     print(f"\n[테스트 2] 숙소 필터 포함")
     print("- 숙소 ID: [1, 2, 3]")
     query = build_hotel_statistics_query(start_date, end_date, [1, 2, 3], 'orderDate', '전체')
-    print(query[:500] + "...")
-    
+    print(str(query)[:500] + "...")
+    print(f"- 파라미터: {query.compile().params}")
+
     # 테스트 3: 요약 통계 쿼리
     print(f"\n[테스트 3] 요약 통계 쿼리")
     query = build_hotel_summary_query(start_date, end_date, [1, 2, 3], 'orderDate', '전체')
     print(query)
-    
-    print("\n✅ 숙소별 통계 쿼리 빌더 준비 완료!")
 
+    print("\n✅ 숙소별 통계 쿼리 빌더 준비 완료!")
@@ -1,5 +1,8 @@
 # utils/query_builder_v1.5.py
-"""동적 쿼리 생성 모듈 v1.5 - order_item.due_price 사용 (입금가)"""
+"""동적 쿼리 생성 모듈 v1.5 - order_item.due_price 사용 (입금가)
+- 빌더는 SQLAlchemy text() 객체를 반환 (날짜/상태/판매유형/채널 값은 바인딩 파라미터)
+- SQL 본문은 형태(date_type × 필터 유무)별로 한 번만 만들어 재사용
+"""
 
 import sys
 import os
@@ -7,19 +10,144 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import text
 from config.order_status_mapping import (
     ORDER_STATUS_GROUPS,
     get_status_codes_by_group,
     get_all_status_codes
 )
 from config.master_data_loader import get_all_order_status_codes
+from utils.rollup_etl import ROLLUP_TABLE
+from utils.dimension_cache import resolve_channel_filter
+from utils.query_sql_common import (
+    DEPOSIT_EXPR,
+    build_booking_count_sql,
+    build_deposit_join,
+    build_order_rows,
+    channel_key_sql,
+    date_params,
+    date_sql,
+    date_str,
+    with_expanding
+)
+
+def _status_params():
+    """전체/확정/취소 상태 목록 파라미터 (전체 상태가 없으면 all_statuses는 None)"""
+    all_statuses = get_all_order_status_codes()
+    return {
+        'all_statuses': list(all_statuses) if all_statuses else None,
+        'confirmed_statuses': list(get_status_codes_by_group('확정') or []),
+        'cancelled_statuses': list(get_status_codes_by_group('취소') or [])
+    }
+
+@lru_cache(maxsize=None)
+def _integrated_template(date_type, has_status_filter, has_channel_filter, has_sale_type_filter, by_date=True):
+    """
+    통합 쿼리 템플릿 (형태별로 한 번만 생성)
+
+    by_date=False이면 날짜 구분 없이 채널/판매유형별로만 집계합니다 (채널별 성과).
+    """
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    # 채널 필터: common_code 채널 idx 또는 (common_code에 없는 채널의) order_type
+    channel_filter = (
+        "AND (op.order_channel_idx IN :channel_idxs OR op.order_type IN :channel_order_types)"
+        if has_channel_filter else ""
+    )
+    sale_type_filter = "AND pr.sale_type = :sale_type" if has_sale_type_filter else ""
+
+    # order_product 행 단위 입금가/대표 행 표시 (order_product는 한 번만 조회)
+    order_rows = build_order_rows(date_type, [status_condition, channel_filter, sale_type_filter])
 
-def build_integrated_query(start_date, end_date, selected_channels=None, 
-                          date_type='orderDate', order_status='전체', sale_type='전체'):
+    booking_date_outer = "agg.booking_date,\n        " if by_date else ""
+    booking_date_inner = "r.booking_date,\n            " if by_date else ""
+    group_by = "r.order_channel_idx, r.channel_group, r.sale_type"
+    if by_date:
+        group_by = f"r.booking_date, {group_by}"
+    order_by = "agg.booking_date DESC, agg.booking_count DESC" if by_date else "agg.booking_count DESC"
+
+    # 입금가/실구매가는 내부 집계에서 한 번만 계산하고, 수익/수익률/취소율은 바깥에서 파생
+    query = f"""
+    SELECT
+        {booking_date_outer}agg.channel_idx,
+        agg.order_type,
+        agg.channel_code,
+        agg.sale_type,
+        agg.booking_count,
+        agg.order_count,
+        agg.hotel_count,
+        agg.total_rooms,
+        agg.confirmed_rooms,
+        agg.cancelled_rooms,
+        CASE
+            WHEN agg.total_rooms = 0 THEN 0
+            ELSE agg.cancelled_rooms * 100.0 / agg.total_rooms
+        END as cancellation_rate,
+        agg.total_deposit,
+        agg.total_purchase,
+        agg.total_purchase - agg.total_deposit as total_profit,
+        CASE
+            WHEN agg.total_deposit = 0 THEN 0
+            ELSE (agg.total_purchase - agg.total_deposit) * 100.0 / agg.total_deposit
+        END as profit_rate
+    FROM (
+        SELECT
+            {booking_date_inner}-- 집계는 order_channel_idx(정수 키) 기준, channel_name은 조회 후 common_code 캐시에서 부여
+            r.order_channel_idx as channel_idx,
+            -- common_code에 없는 채널의 대체 라벨 (없는 채널은 order_type별로 그룹화되므로 그룹 키와 같음)
+            MIN(r.order_type) as order_type,
+            -- channel_code는 참고용으로만 유지 (그룹화에는 사용하지 않음)
+            GROUP_CONCAT(DISTINCT r.order_type ORDER BY r.order_type SEPARATOR ', ') as channel_code,
+            -- 판매유형 추가
+            COALESCE(r.sale_type, '') as sale_type,
+            COUNT(DISTINCT r.order_num) as booking_count,
+            -- 대표 행 수 (합산하면 전체 기간 고유 예약건수, 요약 통계용)
+            SUM(r.is_first_order) as order_count,
+            COUNT(DISTINCT r.product_name) as hotel_count,
+            SUM(r.rooms) as total_rooms,
+            SUM(CASE
+                WHEN r.order_product_status IN :confirmed_statuses
+                THEN r.rooms
+                ELSE 0
+            END) as confirmed_rooms,
+            SUM(CASE
+                WHEN r.order_product_status IN :cancelled_statuses
+                THEN r.rooms
+                ELSE 0
+            END) as cancelled_rooms,
+            SUM(r.deposit) as total_deposit,
+            SUM(COALESCE(r.total_amount, 0)) as total_purchase
+        FROM {order_rows}
+        GROUP BY {group_by}
+    ) agg
+    ORDER BY {order_by}
+    """
+
+    expanding = ['confirmed_statuses', 'cancelled_statuses']
+    if has_status_filter:
+        expanding.append('all_statuses')
+    if has_channel_filter:
+        expanding += ['channel_idxs', 'channel_order_types']
+    return with_expanding(text(query), *expanding)
+
+def _channel_params(selected_channels):
+    """선택된 채널 -> 채널 필터 바인딩 값 (필터가 없으면 빈 dict)"""
+    channel_filter = resolve_channel_filter(selected_channels)
+    if not channel_filter:
+        return {}
+    return {
+        'channel_idxs': channel_filter['channel_idxs'],
+        'channel_order_types': channel_filter['order_types']
+    }
+
+def build_integrated_query(start_date, end_date, selected_channels=None,
+                          date_type='orderDate', order_status='전체', sale_type='전체',
+                          by_date=True):
     """
     통합 쿼리 생성 (order_product 테이블만 사용, order_pay JOIN 추가)
     v1.5: order_item.due_price 사용 (입금가)
-    
+    채널명(channel_name)은 포함하지 않음 - 조회 후 utils.dimension_cache.attach_channel_labels로 부여
+
     Args:
         start_date: 시작일 (YYYY-MM-DD)
         end_date: 종료일 (YYYY-MM-DD)
@@ -27,310 +155,327 @@ def build_integrated_query(start_date, end_date, selected_channels=None,
         date_type: 날짜유형 ('useDate', 'orderDate')
         order_status: 예약상태 ('전체', '확정', '취소') - 항상 '전체'로 고정됨
         sale_type: 판매유형 ('전체', 'b2c', 'b2b')
-    
+        by_date: False면 날짜 구분 없이 채널/판매유형별로만 집계
+
     Returns:
-        SQL 쿼리 문자열
+        sqlalchemy TextClause (바인딩 값 포함, pd.read_sql에 그대로 전달)
     """
-    
-    # 채널 필터 조건 생성
-    channel_filter = ""
-    if selected_channels and '전체' not in selected_channels:
-        # order_type 필터링
-        channel_codes = []
-        from config.channels import CHANNEL_CONFIG
-        for channel_name in selected_channels:
-            for order_type, config in CHANNEL_CONFIG['order_product'].items():
-                if config['name'] == channel_name:
-                    channel_codes.append(order_type)
-        
-        if channel_codes:
-            status_list = ','.join([f"'{c}'" for c in channel_codes])
-            channel_filter = f"AND op.order_type IN ({status_list})"
-    
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+
+    # 채널 필터 조건 생성 (채널명 -> order_channel_idx / order_type 키)
+    channel_params = _channel_params(selected_channels)
+
     # 판매유형 필터 조건 생성
-    sale_type_filter = ""
-    if sale_type and sale_type != '전체':
-        sale_type_filter = f"AND pr.sale_type = '{sale_type}'"
-    
-    # 날짜 조건 생성
-    date_condition = ""
-    if date_type == 'useDate':
-        # 이용일 기준
-        date_condition = f"op.checkin_date >= '{start_date}' AND op.checkin_date <= '{end_date}'"
-        date_field = "DATE(op.checkin_date)"
-    else:  # orderDate (기본값)
-        # 구매일 기준
-        date_condition = f"op.create_date >= '{start_date}' AND op.create_date <= '{end_date} 23:59:59'"
-        date_field = "DATE(op.create_date)"
-    
-    # 예약상태 조건 생성 (항상 '전체'로 고정)
-    status_condition = ""
-    if order_status == '전체':
-        # order_status 시트의 모든 상태값 사용
-        all_statuses = get_all_order_status_codes()
-        if all_statuses:
-            status_list = ','.join([f"'{s}'" for s in all_statuses])
-            status_condition = f"AND op.order_product_status IN ({status_list})"
-        else:
-            # order_status 시트가 없으면 모든 상태 허용
-            status_condition = ""
-    
-    # 확정/취소 상태 리스트 생성
-    confirmed_statuses = get_status_codes_by_group('확정')
-    cancelled_statuses = get_status_codes_by_group('취소')
-    
-    confirmed_list = ','.join([f"'{s}'" for s in confirmed_statuses]) if confirmed_statuses else "''"
-    cancelled_list = ','.join([f"'{s}'" for s in cancelled_statuses]) if cancelled_statuses else "''"
-    
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+
+    # 예약상태 조건 생성 (항상 '전체'로 고정, order_status 시트가 없으면 모든 상태 허용)
+    statuses = _status_params()
+    has_status_filter = order_status == '전체' and statuses['all_statuses'] is not None
+
+    params = {
+        **date_params(date_type, start_date, end_date),
+        'confirmed_statuses': statuses['confirmed_statuses'],
+        'cancelled_statuses': statuses['cancelled_statuses']
+    }
+    if has_status_filter:
+        params['all_statuses'] = statuses['all_statuses']
+    params.update(channel_params)
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    template = _integrated_template(
+        date_type, has_status_filter, bool(channel_params), has_sale_type_filter, by_date
+    )
+    return template.bindparams(**params)
+
+@lru_cache(maxsize=None)
+def _rollup_integrated_template(has_channel_filter, has_sale_type_filter):
+    """롤업 통합 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    channel_filter = (
+        "AND (r.order_channel_idx IN :channel_idxs OR r.order_type IN :channel_order_types)"
+        if has_channel_filter else ""
+    )
+    sale_type_filter = "AND r.sale_type = :sale_type" if has_sale_type_filter else ""
+    channel_join, channel_key = channel_key_sql('r')
+
     query = f"""
-    SELECT 
-        {date_field} as booking_date,
-        -- order_channel_idx 기준으로 channel_name 결정 (같은 order_channel_idx는 하나의 channel_name으로 합침)
-        COALESCE((
-            SELECT cc.code_name 
-            FROM common_code cc 
-            WHERE cc.code_id = op.order_channel_idx 
-                AND cc.parent_idx = 1 
-            ORDER BY cc.idx
-            LIMIT 1
-        ), op.order_type, 
-            CASE op.order_type
-                WHEN 'expedia' THEN 'Expedia'
-                WHEN 'expediab2b' THEN 'Expedia B2B'
-                WHEN 'hotelbeds' THEN 'Hotelbeds'
-                WHEN 'dabo' THEN '다보'
-                WHEN 'nuuaapi' THEN '누아'
-                WHEN 'hiot' THEN '하이오티'
-                ELSE op.order_type
-            END
-        ) as channel_name,
-        op.order_channel_idx as channel_idx,
-        -- channel_code는 참고용으로만 유지 (그룹화에는 사용하지 않음)
-        GROUP_CONCAT(DISTINCT op.order_type ORDER BY op.order_type SEPARATOR ', ') as channel_code,
-        -- 판매유형 추가
-        COALESCE(pr.sale_type, '') as sale_type,
-        COUNT(DISTINCT op.order_num) as booking_count,
-        COUNT(DISTINCT op.product_name) as hotel_count,
-        -- order_item JOIN으로 인한 중복 방지: terms * room_cnt는 order_product에서 직접 계산
-        -- order_item JOIN은 입금가 계산에만 사용되므로, terms * room_cnt는 중복되지 않음
-        SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)) as total_rooms,
-        SUM(CASE 
-            WHEN op.order_product_status IN ({confirmed_list}) 
-            THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0) 
-            ELSE 0 
-        END) as confirmed_rooms,
-        SUM(CASE 
-            WHEN op.order_product_status IN ({cancelled_list}) 
-            THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0) 
-            ELSE 0 
-        END) as cancelled_rooms,
-        CASE 
-            WHEN SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)) = 0 THEN 0
-            ELSE (SUM(CASE 
-                WHEN op.order_product_status IN ({cancelled_list}) 
-                THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0) 
-                ELSE 0 
-            END) / SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0))) * 100
+    SELECT
+        agg.booking_date,
+        agg.channel_idx,
+        agg.order_type,
+        agg.channel_code,
+        agg.sale_type,
+        agg.booking_count,
+        agg.order_count,
+        agg.hotel_count,
+        agg.total_rooms,
+        agg.confirmed_rooms,
+        agg.cancelled_rooms,
+        CASE
+            WHEN agg.total_rooms = 0 THEN 0
+            ELSE agg.cancelled_rooms * 100.0 / agg.total_rooms
         END as cancellation_rate,
-        -- v1.5: order_item.due_price 사용 (입금가) - due_price 합계 * room_cnt (terms는 곱하지 않음, 이미 날짜별 row로 합산됨)
-        SUM(COALESCE((
-            SELECT SUM(oi2.due_price)
-            FROM order_item oi2
-            WHERE oi2.order_product_idx = op.idx
-        ), 0) * COALESCE(op.room_cnt, 1)) as total_deposit,
-        -- order_pay는 직접 JOIN하여 사용 (1:1 관계이므로 중복 없음)
-        SUM(COALESCE(opay.total_amount, 0)) as total_purchase,
-        SUM(COALESCE(opay.total_amount, 0)) - SUM(COALESCE((
-            SELECT SUM(oi2.due_price)
-            FROM order_item oi2
-            WHERE oi2.order_product_idx = op.idx
-        ), 0) * COALESCE(op.room_cnt, 1)) as total_profit,
-        CASE 
-            WHEN SUM(COALESCE((
-                SELECT SUM(oi2.due_price)
-                FROM order_item oi2
-                WHERE oi2.order_product_idx = op.idx
-            ), 0) * COALESCE(op.room_cnt, 1)) = 0 THEN 0
-            ELSE ((SUM(COALESCE(opay.total_amount, 0)) - SUM(COALESCE((
-                SELECT SUM(oi2.due_price)
-                FROM order_item oi2
-                WHERE oi2.order_product_idx = op.idx
-            ), 0) * COALESCE(op.room_cnt, 1))) 
-                  / SUM(COALESCE((
-                SELECT SUM(oi2.due_price)
-                FROM order_item oi2
-                WHERE oi2.order_product_idx = op.idx
-            ), 0) * COALESCE(op.room_cnt, 1))) * 100
+        agg.total_deposit,
+        agg.total_purchase,
+        agg.total_purchase - agg.total_deposit as total_profit,
+        CASE
+            WHEN agg.total_deposit = 0 THEN 0
+            ELSE (agg.total_purchase - agg.total_deposit) * 100.0 / agg.total_deposit
         END as profit_rate
+    FROM (
+        SELECT
+            r.stat_date as booking_date,
+            r.order_channel_idx as channel_idx,
+            MIN(r.order_type) as order_type,
+            GROUP_CONCAT(DISTINCT r.order_type ORDER BY r.order_type SEPARATOR ', ') as channel_code,
+            r.sale_type,
+            SUM(r.channel_booking_count) as booking_count,
+            SUM(r.order_count) as order_count,
+            COUNT(DISTINCT r.product_idx) as hotel_count,
+            SUM(r.total_rooms) as total_rooms,
+            SUM(r.confirmed_rooms) as confirmed_rooms,
+            SUM(r.cancelled_rooms) as cancelled_rooms,
+            SUM(r.total_deposit) as total_deposit,
+            SUM(r.total_purchase) as total_purchase
+        FROM {ROLLUP_TABLE} r
+        {channel_join}
+        WHERE r.date_type = :date_type
+            AND r.stat_date >= :start_date AND r.stat_date <= :end_date
+            {channel_filter}
+            {sale_type_filter}
+        GROUP BY r.stat_date, r.order_channel_idx, {channel_key}, r.sale_type
+    ) agg
+    ORDER BY agg.booking_date DESC, agg.booking_count DESC
+    """
+
+    if has_channel_filter:
+        return with_expanding(text(query), 'channel_idxs', 'channel_order_types')
+    return text(query)
+
+def build_rollup_integrated_query(start_date, end_date, selected_channels=None,
+                                  date_type='orderDate', order_status='전체', sale_type='전체'):
+    """
+    통합 쿼리 생성 - 롤업 테이블(utils.rollup_etl) 사용
+    build_integrated_query와 같은 컬럼을 반환하며, 원본 테이블 대신 일별 집계 행만 합산
+
+    - booking_count: channel_booking_count 합계 (주문번호당 한 번만 집계됨)
+    - order_count: 날짜별 대표 행 수 합계 (이용일 기준에서 여러 체크인일에 걸친 주문은 날짜마다 집계,
+      판매유형 필터 시 대표 행의 판매유형 기준)
+    - hotel_count: product_idx 기준 고유 숙소 수
+    - 기준은 마지막 ETL 실행 시점 (CURDATE() 이전 생성 예약만 적재됨)
+
+    Args:
+        build_integrated_query와 동일
+
+    Returns:
+        sqlalchemy TextClause (바인딩 값 포함)
+    """
+    channel_params = _channel_params(selected_channels)
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+
+    params = {
+        'date_type': 'useDate' if date_type == 'useDate' else 'orderDate',
+        'start_date': date_str(start_date),
+        'end_date': date_str(end_date)
+    }
+    params.update(channel_params)
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    return _rollup_integrated_template(bool(channel_params), has_sale_type_filter).bindparams(**params)
+
+@lru_cache(maxsize=None)
+def _booking_count_template(date_type, has_status_filter, has_channel_filter, has_sale_type_filter):
+    """고유 예약건수 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    channel_filter = (
+        "AND (op.order_channel_idx IN :channel_idxs OR op.order_type IN :channel_order_types)"
+        if has_channel_filter else ""
+    )
+    sale_type_filter = "AND pr.sale_type = :sale_type" if has_sale_type_filter else ""
+
+    query = build_booking_count_sql(
+        date_type, [status_condition, channel_filter, sale_type_filter], has_sale_type_filter
+    )
+
+    expanding = []
+    if has_status_filter:
+        expanding.append('all_statuses')
+    if has_channel_filter:
+        expanding += ['channel_idxs', 'channel_order_types']
+    return with_expanding(text(query), *expanding)
+
+def build_booking_count_query(start_date, end_date, selected_channels=None,
+                              date_type='orderDate', order_status='전체', sale_type='전체'):
+    """
+    조회 기간 고유 예약건수 쿼리 생성 (build_integrated_query와 같은 조건)
+    롤업 테이블 조회 시 요약 통계 예약건수(total_bookings)를 정확히 계산하는 데 사용
+
+    Args:
+        build_integrated_query와 동일
+
+    Returns:
+        sqlalchemy TextClause (바인딩 값 포함, 컬럼 total_bookings)
+    """
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+    channel_params = _channel_params(selected_channels)
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+    all_statuses = _status_params()['all_statuses']
+    has_status_filter = order_status == '전체' and all_statuses is not None
+
+    params = date_params(date_type, start_date, end_date)
+    if has_status_filter:
+        params['all_statuses'] = all_statuses
+    params.update(channel_params)
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    template = _booking_count_template(date_type, has_status_filter, bool(channel_params), has_sale_type_filter)
+    return template.bindparams(**params)
+
+@lru_cache(maxsize=None)
+def _summary_template(date_type, has_status_filter, has_sale_type_filter):
+    """요약 통계 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    # 날짜 조건 (build_integrated_query와 동일한 로직)
+    date_field, date_condition = date_sql(date_type)
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    sale_type_filter = "AND pr.sale_type = :sale_type" if has_sale_type_filter else ""
+    deposit_join = build_deposit_join(date_type)
+
+    query = f"""
+    SELECT
+        COUNT(DISTINCT op.order_num) as total_bookings,
+        -- v1.5: order_item.due_price 사용 (입금가) - due_price 합계 * room_cnt (terms는 곱하지 않음, 이미 날짜별 row로 합산됨)
+        SUM({DEPOSIT_EXPR}) as total_revenue,
+        COUNT(DISTINCT op.order_type) as channel_count,
+        COUNT(DISTINCT {date_field}) as active_days
     FROM order_product op
-    LEFT JOIN order_pay opay 
-        ON op.order_pay_idx = opay.idx
+    {deposit_join}
     LEFT JOIN product_rateplan pr
         ON op.rateplan_idx = pr.idx
     WHERE {date_condition}
         AND op.create_date < CURDATE()
         {status_condition}
-        {channel_filter}
         {sale_type_filter}
-    GROUP BY {date_field}, op.order_channel_idx, channel_name, pr.sale_type
-    ORDER BY booking_date DESC, booking_count DESC
     """
-    
-    return query
+
+    if has_status_filter:
+        return with_expanding(text(query), 'all_statuses')
+    return text(query)
 
 def build_summary_query(start_date, end_date, date_type='orderDate', order_status='전체', sale_type='전체'):
     """
     요약 통계 쿼리 생성
-    
+
     Args:
         start_date: 시작일
         end_date: 종료일
         date_type: 날짜유형 ('useDate', 'orderDate')
         order_status: 예약상태 (항상 '전체'로 고정)
         sale_type: 판매유형 ('전체', 'b2c', 'b2b')
-    
+
     Returns:
-        SQL 쿼리 문자열
+        sqlalchemy TextClause (바인딩 값 포함)
     """
-    
-    # 날짜 조건 (build_integrated_query와 동일한 로직)
-    date_condition = ""
-    if date_type == 'useDate':
-        date_condition = f"op.checkin_date >= '{start_date}' AND op.checkin_date <= '{end_date}'"
-    else:  # orderDate
-        date_condition = f"op.create_date >= '{start_date}' AND op.create_date <= '{end_date} 23:59:59'"
-    
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+
     # 예약상태 조건 (항상 '전체')
-    status_condition = ""
     all_statuses = get_all_order_status_codes()
-    if all_statuses:
-        status_list = ','.join([f"'{s}'" for s in all_statuses])
-        status_condition = f"AND op.order_product_status IN ({status_list})"
-    
+
     # 판매유형 필터 조건 생성
-    sale_type_filter = ""
-    if sale_type and sale_type != '전체':
-        sale_type_filter = f"AND pr.sale_type = '{sale_type}'"
-    
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+
+    params = date_params(date_type, start_date, end_date)
+    if all_statuses:
+        params['all_statuses'] = list(all_statuses)
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    return _summary_template(date_type, bool(all_statuses), has_sale_type_filter).bindparams(**params)
+
+@lru_cache(maxsize=None)
+def _daily_trend_template(date_type, has_status_filter, has_sale_type_filter):
+    """일별 추세 쿼리 템플릿 (형태별로 한 번만 생성)"""
+    date_field, date_condition = date_sql(date_type)
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    sale_type_filter = "AND pr.sale_type = :sale_type" if has_sale_type_filter else ""
+    deposit_join = build_deposit_join(date_type)
+
     query = f"""
-    SELECT 
-        COUNT(DISTINCT op.order_num) as total_bookings,
+    SELECT
+        {date_field} as date,
+        COUNT(DISTINCT op.order_num) as bookings,
         -- v1.5: order_item.due_price 사용 (입금가) - due_price 합계 * room_cnt (terms는 곱하지 않음, 이미 날짜별 row로 합산됨)
-        SUM(COALESCE((
-            SELECT SUM(oi2.due_price)
-            FROM order_item oi2
-            WHERE oi2.order_product_idx = op.idx
-        ), 0) * COALESCE(op.room_cnt, 1)) as total_revenue,
-        COUNT(DISTINCT op.order_type) as channel_count,
-        COUNT(DISTINCT CASE 
-            WHEN '{date_type}' = 'useDate' THEN DATE(op.checkin_date)
-            ELSE DATE(op.create_date)
-        END) as active_days
+        SUM({DEPOSIT_EXPR}) as revenue
     FROM order_product op
+    {deposit_join}
     LEFT JOIN product_rateplan pr
         ON op.rateplan_idx = pr.idx
     WHERE {date_condition}
         AND op.create_date < CURDATE()
         {status_condition}
         {sale_type_filter}
+    GROUP BY {date_field}
+    ORDER BY date ASC
     """
-    
-    return query
+
+    if has_status_filter:
+        return with_expanding(text(query), 'all_statuses')
+    return text(query)
 
 def build_daily_trend_query(start_date, end_date, date_type='orderDate', order_status='전체', sale_type='전체'):
     """
     일별 추세 쿼리 생성
-    
+
     Args:
         start_date: 시작일
         end_date: 종료일
         date_type: 날짜유형
         order_status: 예약상태 (항상 '전체'로 고정)
         sale_type: 판매유형 ('전체', 'b2c', 'b2b')
-    
+
     Returns:
-        SQL 쿼리 문자열
+        sqlalchemy TextClause (바인딩 값 포함)
     """
-    
-    # 날짜 조건
-    if date_type == 'useDate':
-        date_field = "DATE(op.checkin_date)"
-        date_condition = f"op.checkin_date >= '{start_date}' AND op.checkin_date <= '{end_date}'"
-    else:  # orderDate
-        date_field = "DATE(op.create_date)"
-        date_condition = f"op.create_date >= '{start_date}' AND op.create_date <= '{end_date} 23:59:59'"
-    
+    date_type = 'useDate' if date_type == 'useDate' else 'orderDate'
+
     # 예약상태 조건 (항상 '전체')
-    status_condition = ""
     all_statuses = get_all_order_status_codes()
-    if all_statuses:
-        status_list = ','.join([f"'{s}'" for s in all_statuses])
-        status_condition = f"AND op.order_product_status IN ({status_list})"
-    
+
     # 판매유형 필터 조건 생성
-    sale_type_filter = ""
-    if sale_type and sale_type != '전체':
-        sale_type_filter = f"AND pr.sale_type = '{sale_type}'"
-    
-    query = f"""
-    SELECT 
-        {date_field} as date,
-        COUNT(DISTINCT op.order_num) as bookings,
-        -- v1.5: order_item.due_price 사용 (입금가) - due_price 합계 * room_cnt (terms는 곱하지 않음, 이미 날짜별 row로 합산됨)
-        SUM(COALESCE((
-            SELECT SUM(oi2.due_price)
-            FROM order_item oi2
-            WHERE oi2.order_product_idx = op.idx
-        ), 0) * COALESCE(op.room_cnt, 1)) as revenue
-    FROM order_product op
-    LEFT JOIN product_rateplan pr
-        ON op.rateplan_idx = pr.idx
-    WHERE {date_condition}
-        AND op.create_date < CURDATE()
-        {status_condition}
-        {sale_type_filter}
-    GROUP BY {date_field}
-    ORDER BY date ASC
-    """
-    
-    return query
+    has_sale_type_filter = bool(sale_type and sale_type != '전체')
+
+    params = date_params(date_type, start_date, end_date)
+    if all_statuses:
+        params['all_statuses'] = list(all_statuses)
+    if has_sale_type_filter:
+        params['sale_type'] = sale_type
+
+    return _daily_trend_template(date_type, bool(all_statuses), has_sale_type_filter).bindparams(**params)
 
 def build_channel_performance_query(start_date, end_date, date_type='orderDate', order_status='전체', sale_type='전체'):
     """
-    채널별 성과 쿼리 생성
+    채널별 성과 쿼리 생성 (날짜 구분 없이 채널/판매유형별 집계)
     """
-    
-    query = build_integrated_query(start_date, end_date, None, date_type, order_status, sale_type)
-    
-    # GROUP BY를 채널별로만 수정
-    modified_query = query.replace(
-        "GROUP BY booking_date, channel_name, channel_code",
-        "GROUP BY channel_name, channel_code"
-    ).replace(
-        "booking_date, ",
-        ""
-    ).replace(
-        "ORDER BY booking_date DESC, booking_count DESC",
-        "ORDER BY booking_count DESC"
+    return build_integrated_query(
+        start_date, end_date, None, date_type, order_status, sale_type, by_date=False
     )
-    
-    return modified_query
 
 # 테스트 함수
 if __name__ == "__main__":
     # 테스트용 날짜
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=7)
-    
+
     print("="*60)
     print("📝 쿼리 빌더 테스트 v1.5")
     print("="*60)
-    
+
     # 통합 쿼리 테스트
     print(f"\n[통합 쿼리] ({start_date} ~ {end_date})")
     print("- 날짜유형: 구매일, 예약상태: 전체")
     query = build_integrated_query(start_date, end_date, None, 'orderDate', '전체')
-    print(query[:800] + "...")
-    
-    print("\n✅ 쿼리 빌더 v1.5 준비 완료!")
+    print(str(query)[:800] + "...")
+    print(f"- 파라미터: {query.compile().params}")
 
+    print("\n✅ 쿼리 빌더 v1.5 준비 완료!")
@@ -0,0 +1,196 @@
+# utils/query_executor.py
+"""조회 쿼리 동시 실행 모듈
+- 프로세스 전체에서 공유하는 크기 제한 ThreadPoolExecutor
+- 서로 독립적인 조회(상세 쿼리, 라벨 조회 등)를 커넥션 풀의 연결로 동시에 실행
+- 작업별 대기/실행 시간을 future.timing에 기록
+- 서버 측 커서 구간 조회 (read_sql_chunks) 및 조회 중 DataFrame 메모리 최대값 추적
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+
+import pandas as pd
+from config.configdb import DB_POOL_SIZE
+
+# 동시 실행 설정 (.env에서 조정 가능)
+# 작업 스레드 수는 커넥션 풀 크기를 넘지 않도록 제한 (풀 대기로 인한 지연 방지)
+QUERY_MAX_WORKERS = max(1, min(int(os.getenv('QUERY_MAX_WORKERS', 4)), DB_POOL_SIZE))
+QUERY_TIMEOUT = int(os.getenv('QUERY_TIMEOUT', 300))            # 작업당 최대 대기 시간 (초)
+STREAM_CHUNK_ROWS = int(os.getenv('STREAM_CHUNK_ROWS', 20000))  # 서버 측 커서에서 한 번에 가져올 행 수
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# 현재 스레드가 작업 스레드인지 표시 (작업 안에서 다시 작업을 기다리면 풀이 막힐 수 있음)
+_worker_state = threading.local()
+
+
+def _reset_executor_after_fork():
+    """fork된 자식 프로세스에는 부모의 작업 스레드가 없으므로 새로 생성하도록 초기화"""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executor_after_fork)
+
+
+def _get_executor():
+    """프로세스 공유 executor 반환 (최초 호출 시 생성)"""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=QUERY_MAX_WORKERS,
+                    thread_name_prefix='query'
+                )
+    return _executor
+
+
+def in_worker_thread():
+    """현재 스레드가 조회 작업 스레드인지 여부"""
+    return getattr(_worker_state, 'active', False)
+
+
+def submit_query(label, fn, *args, **kwargs):
+    """
+    조회 함수를 공유 executor에 제출
+
+    작업 스레드 안에서 호출되면 풀 고갈(중첩 대기)을 막기 위해 즉시 현재 스레드에서 실행합니다.
+
+    Args:
+        label: 작업 이름 (로그/시간 기록용)
+        fn: 실행할 함수
+
+    Returns:
+        Future: 결과 future (future.timing = {'label', 'wait', 'elapsed'}, 단위 초)
+    """
+    timing = {'label': label, 'wait': None, 'elapsed': None}
+    submitted = time.perf_counter()
+
+    def _run():
+        started = time.perf_counter()
+        timing['wait'] = started - submitted
+        nested = in_worker_thread()
+        _worker_state.active = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _worker_state.active = nested
+            timing['elapsed'] = time.perf_counter() - started
+
+    if in_worker_thread():
+        future = Future()
+        try:
+            future.set_result(_run())
+        except Exception as e:
+            future.set_exception(e)
+    else:
+        future = _get_executor().submit(_run)
+
+    future.timing = timing
+    return future
+
+
+def run_concurrently(tasks, timeout=None):
+    """
+    여러 조회 작업을 동시에 실행하고 모두 끝날 때까지 대기
+
+    Args:
+        tasks: {label: (fn, args, kwargs)} 또는 {label: fn}
+        timeout: 작업별 최대 대기 시간 (초, None이면 QUERY_TIMEOUT)
+
+    Returns:
+        tuple: ({label: 결과}, [timing dict, ...])
+        작업 중 하나라도 실패하면 해당 예외를 그대로 발생시킵니다.
+    """
+    timeout = timeout or QUERY_TIMEOUT
+    futures = {}
+    for label, task in tasks.items():
+        if callable(task):
+            task = (task,)
+        fn = task[0]
+        args = task[1] if len(task) > 1 else ()
+        kwargs = task[2] if len(task) > 2 else {}
+        futures[label] = submit_query(label, fn, *args, **kwargs)
+
+    results = {label: future.result(timeout=timeout) for label, future in futures.items()}
+    return results, [future.timing for future in futures.values()]
+
+
+def read_sql_chunks(query, engine, chunk_rows=None):
+    """
+    서버 측 커서(stream_results)로 쿼리 결과를 구간별 DataFrame으로 반환
+
+    전체 결과를 클라이언트 메모리에 올리지 않으므로 CSV/Parquet 내보내기처럼
+    행을 바로 기록하는 경우에 사용합니다. 연결은 반복이 끝나거나 중단되면 반환됩니다.
+
+    Yields:
+        pandas DataFrame: 최대 chunk_rows 행
+    """
+    chunk_rows = chunk_rows or STREAM_CHUNK_ROWS
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_rows) as conn:
+        yield from pd.read_sql(query, conn, chunksize=chunk_rows)
+
+
+def frame_bytes(df):
+    """DataFrame 메모리 사용량 (object 컬럼의 문자열 포함, bytes)"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class MemoryTracker:
+    """조회 중 보유한 DataFrame 메모리 합계와 최대값 추적 (동시에 실행되는 작업이 함께 갱신)"""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def add(self, nbytes):
+        with self._lock:
+            self.current += nbytes
+            self.peak = max(self.peak, self.current)
+
+    def release(self, nbytes):
+        with self._lock:
+            self.current -= nbytes
+
+
+def format_memory(nbytes):
+    """메모리 크기를 로그용 문자열로 변환 (예: '12.3MB', 값이 없으면 '-')"""
+    if nbytes is None:
+        return '-'
+    return f"{nbytes / 1024 / 1024:.1f}MB"
+
+
+def format_timings(timings):
+    """작업별 시간 기록을 로그용 문자열로 변환 (예: 'detail=0.52s, channel_labels=0.03s')"""
+    return ', '.join(
+        f"{t['label']}={t['elapsed']:.2f}s" for t in timings if t.get('elapsed') is not None
+    )
+
+
+def timings_to_ms(timings):
+    """작업별 시간 기록을 JSON 로그용 딕셔너리로 변환 (예: {'detail': 520.3, 'channel_labels': 31.0})"""
+    return {
+        t['label']: round(t['elapsed'] * 1000, 1) for t in timings if t.get('elapsed') is not None
+    }
+
+
+def shutdown_executor(wait=True):
+    """공유 executor 종료 (테스트/프로세스 종료용)"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
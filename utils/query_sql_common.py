@@ -0,0 +1,193 @@
+# utils/query_sql_common.py
+"""쿼리 빌더 공통 SQL 조각
+- 채널별(query_builder_v1.5) / 숙소별(query_builder_hotel) 빌더가 함께 사용
+- 날짜 조건/바인딩 값, 입금가(order_item) 집계 JOIN, 상세 쿼리용 행 단위 파생 테이블,
+  고유 예약건수 쿼리, expanding IN 파라미터, 채널 그룹 키
+"""
+
+from sqlalchemy import bindparam
+
+
+def date_str(value):
+    """date/datetime/문자열을 'YYYY-MM-DD' 문자열로 변환"""
+    return value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else str(value)
+
+
+def date_sql(date_type, alias='op'):
+    """
+    date_type별 (날짜 컬럼, 기간 조건) SQL 조각
+
+    기간 조건은 :start_date, :end_date 파라미터를 사용합니다 (date_params로 생성).
+    """
+    if date_type == 'useDate':
+        # 이용일 기준
+        return (f"DATE({alias}.checkin_date)",
+                f"{alias}.checkin_date >= :start_date AND {alias}.checkin_date <= :end_date")
+    # 구매일 기준 (기본값)
+    return (f"DATE({alias}.create_date)",
+            f"{alias}.create_date >= :start_date AND {alias}.create_date <= :end_date")
+
+
+def date_params(date_type, start_date, end_date):
+    """date_sql 기간 조건에 바인딩할 값 (구매일 기준은 종료일 23:59:59까지)"""
+    end_value = date_str(end_date) if date_type == 'useDate' else f"{date_str(end_date)} 23:59:59"
+    return {
+        'start_date': date_str(start_date),
+        'end_date': end_value
+    }
+
+
+def build_deposit_join(date_type):
+    """
+    order_item 입금가를 order_product 1건당 한 번만 집계하는 파생 테이블 JOIN 생성
+
+    조회 기간에 해당하는 order_product의 order_item만 GROUP BY 하므로
+    행마다 상관 서브쿼리를 반복 실행하지 않습니다.
+
+    Returns:
+        str: LEFT JOIN 구문 (별칭 oi_sum, 컬럼 due_price_sum)
+    """
+    _, date_condition = date_sql(date_type, 'op_f')
+
+    return f"""LEFT JOIN (
+        SELECT
+            oi.order_product_idx,
+            SUM(oi.due_price) as due_price_sum
+        FROM order_item oi
+        INNER JOIN order_product op_f
+            ON op_f.idx = oi.order_product_idx
+        WHERE {date_condition}
+            AND op_f.create_date < CURDATE()
+        GROUP BY oi.order_product_idx
+    ) oi_sum
+        ON oi_sum.order_product_idx = op.idx"""
+
+
+# v1.5: order_item.due_price 사용 (입금가) - due_price 합계 * room_cnt (terms는 곱하지 않음, 이미 날짜별 row로 합산됨)
+DEPOSIT_EXPR = "COALESCE(oi_sum.due_price_sum, 0) * COALESCE(op.room_cnt, 1)"
+
+
+def build_order_rows(date_type, filters, columns=()):
+    """
+    상세 쿼리용 order_product 행 단위 파생 테이블 생성
+
+    order_product를 한 번만 읽으면서 행마다 아래 값을 함께 계산하므로,
+    입금가 집계나 주문번호 대표 행 선택을 위해 order_product를 다시 읽지 않습니다.
+    - deposit: order_item 입금가 합계 * room_cnt (order_item은 order_product_idx로 JOIN 후 행 단위로 합산)
+    - is_first_order: 주문번호(order_num)별 대표 행(가장 작은 op.idx)이면 1
+      (바깥에서 합산하면 주문번호가 여러 그룹(판매유형/날짜)에 걸쳐 있어도 전체 기간 고유 예약건수)
+
+    대표 행은 ROW_NUMBER() 윈도 함수로 고르므로 MySQL 8.0 이상이 필요합니다.
+    GROUP BY는 op.idx(기본키)와 그에 종속된 컬럼이므로 order_product 1건이 1행입니다.
+
+    Args:
+        date_type: 날짜유형 ('useDate', 'orderDate')
+        filters: 추가 조건 문자열 목록 (op/pr 별칭, 'AND ...' 형식)
+        columns: 추가로 가져올 order_product 컬럼명 (예: ('product_idx',))
+
+    Returns:
+        str: FROM 절에 넣을 파생 테이블 (별칭 r, 컬럼 booking_date, order_channel_idx, channel_group,
+             order_type, sale_type, order_num, product_name, rooms, order_product_status,
+             total_amount, deposit, is_first_order 및 columns)
+    """
+    date_field, date_condition = date_sql(date_type)
+    channel_join, channel_key = channel_key_sql()
+    extra = "\n            ".join(f for f in filters if f)
+
+    grouped = [date_field, 'op.order_channel_idx', channel_key, 'op.order_type', 'pr.sale_type',
+               'op.order_num', 'op.product_name', 'op.terms', 'op.room_cnt', 'op.order_product_status',
+               'opay.total_amount'] + [f'op.{column}' for column in columns]
+    extra_columns = "".join(f"\n            op.{column}," for column in columns)
+
+    return f"""(
+        SELECT
+            {date_field} as booking_date,
+            op.order_channel_idx,
+            {channel_key} as channel_group,
+            op.order_type,
+            pr.sale_type,
+            op.order_num,
+            op.product_name,{extra_columns}
+            COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0) as rooms,
+            op.order_product_status,
+            -- order_pay는 1:1 관계이므로 행 단위로 그대로 사용
+            opay.total_amount,
+            -- v1.5: order_item.due_price 사용 (입금가) - due_price 합계 * room_cnt (terms는 곱하지 않음, 이미 날짜별 row로 합산됨)
+            COALESCE(SUM(oi.due_price), 0) * COALESCE(op.room_cnt, 1) as deposit,
+            CASE
+                WHEN op.order_num IS NOT NULL
+                    AND ROW_NUMBER() OVER (PARTITION BY op.order_num ORDER BY op.idx) = 1
+                THEN 1
+                ELSE 0
+            END as is_first_order
+        FROM order_product op
+        LEFT JOIN order_item oi
+            ON oi.order_product_idx = op.idx
+        LEFT JOIN order_pay opay
+            ON op.order_pay_idx = opay.idx
+        LEFT JOIN product_rateplan pr
+            ON op.rateplan_idx = pr.idx
+        {channel_join}
+        WHERE {date_condition}
+            AND op.create_date < CURDATE()
+            {extra}
+        GROUP BY op.idx, {', '.join(grouped)}
+    ) r"""
+
+
+def build_booking_count_sql(date_type, filters, rateplan_join=False):
+    """
+    조회 기간 고유 예약건수(COUNT(DISTINCT order_num)) 쿼리 생성
+
+    롤업 테이블의 order_count는 (주문번호, 날짜) 단위로 적재되어 기간 전체 고유 건수와 다를 수 있으므로,
+    롤업 조회 시 요약 통계 예약건수만 원본 테이블에서 계산합니다 (order_item/order_pay JOIN 없음).
+
+    Args:
+        date_type: 날짜유형 ('useDate', 'orderDate')
+        filters: 상세 쿼리와 동일한 추가 조건 문자열 목록 (op/pr 별칭)
+        rateplan_join: 판매유형 필터가 있어 product_rateplan JOIN이 필요한 경우 True
+
+    Returns:
+        str: 쿼리 (컬럼 total_bookings)
+    """
+    _, date_condition = date_sql(date_type)
+    pr_join = """LEFT JOIN product_rateplan pr
+        ON op.rateplan_idx = pr.idx""" if rateplan_join else ""
+    extra = "\n        ".join(f for f in filters if f)
+
+    return f"""
+    SELECT
+        COUNT(DISTINCT op.order_num) as total_bookings
+    FROM order_product op
+    {pr_join}
+    WHERE {date_condition}
+        AND op.create_date < CURDATE()
+        {extra}
+    """
+
+
+def with_expanding(statement, *names):
+    """IN 목록 파라미터를 expanding으로 선언"""
+    return statement.bindparams(*[bindparam(name, expanding=True) for name in names])
+
+
+def channel_key_sql(alias='op'):
+    """
+    채널 그룹화용 (JOIN, 그룹 키) SQL 조각
+
+    common_code에 등록된 채널(dimension_cache.get_channel_names와 같은 조건)은 order_channel_idx로,
+    등록되지 않은 채널은 idx가 같거나 NULL이어도 order_type별로 나누어 집계합니다
+    (등록되지 않은 채널의 channel_name은 order_type이므로).
+
+    Returns:
+        tuple: (LEFT JOIN 구문 (별칭 ch_map), GROUP BY에 추가할 식)
+    """
+    join = f"""LEFT JOIN (
+            SELECT DISTINCT code_id
+            FROM common_code
+            WHERE parent_idx = 1
+                AND code_name IS NOT NULL
+        ) ch_map
+            ON ch_map.code_id = {alias}.order_channel_idx"""
+    key = f"CASE WHEN ch_map.code_id IS NULL THEN {alias}.order_type ELSE '' END"
+    return join, key
@@ -0,0 +1,286 @@
+# utils/result_cache.py
+"""조회 결과 디스크 캐시 모듈
+- 채널별/숙소별 상세 조회와 요약 조회 결과를 파라미터 기준으로 캐시
+- 로컬 디스크(pickle)에 저장하므로 앱을 재시작해도 유지
+- 종료일이 오늘 이전인 기간(마감된 기간)은 길게, 오늘/미래를 포함한 기간은 짧게 유지
+- 적중/미적중 카운터, 전체 용량 제한 (오래 사용하지 않은 항목부터 삭제)
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+import pandas as pd
+
+from config.master_data_loader import load_master_data
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 캐시 설정 (.env에서 조정 가능)
+RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR', os.path.join(_project_root, '.cache', 'results'))
+RESULT_CACHE_TTL_CLOSED = int(os.getenv('RESULT_CACHE_TTL_CLOSED', 6 * 3600))  # 마감된 기간 (초)
+RESULT_CACHE_TTL_OPEN = int(os.getenv('RESULT_CACHE_TTL_OPEN', 300))           # 오늘/미래 포함 기간 (초)
+RESULT_CACHE_MAX_MB = int(os.getenv('RESULT_CACHE_MAX_MB', 512))
+
+# 결과 형식이 바뀌면 올려서 이전 캐시를 무시
+CACHE_VERSION = 1
+
+# 캐시 적중 시 지우는 df.attrs 조회 통계 (저장 당시 조회에만 해당하는 값)
+FETCH_STAT_ATTRS = ('query_timings', 'peak_memory_bytes')
+
+_stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'errors': 0}
+_lock = threading.Lock()
+
+
+def _count(name, n=1):
+    with _lock:
+        _stats[name] += n
+
+
+def _normalize(value):
+    """캐시 키용 값 정규화 (날짜 -> 'YYYY-MM-DD', 목록 -> 정렬된 리스트)"""
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set)):
+        return sorted((_normalize(v) for v in value), key=str)
+    if hasattr(value, 'item'):  # numpy 스칼라
+        return value.item()
+    return value
+
+
+def make_key(name, params):
+    """
+    함수 이름 + 정규화된 파라미터 (+ 접속 DB, 롤업 사용 여부, master_data 버전) -> sha256 키
+
+    쿼리의 예약 상태 목록은 master_data 스냅샷에서 읽으므로, 워크북이 바뀌어 다시 로드되면
+    (수정시각 ns, 크기) 버전이 달라져 이전 상태 목록으로 계산한 결과를 사용하지 않습니다.
+    """
+    source = [os.getenv('DB_HOST'), os.getenv('DB_NAME'), os.getenv('USE_ROLLUP_TABLE'),
+              load_master_data()['meta']['workbook']]
+    payload = json.dumps(
+        {'v': CACHE_VERSION, 'fn': name, 'source': source,
+         'params': {k: _normalize(v) for k, v in params.items()}},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def ttl_for_range(end_date, today=None):
+    """
+    조회 기간별 캐시 유지 시간
+
+    통계 쿼리는 CURDATE() 이전 생성 예약만 집계하므로, 종료일이 오늘 이전이면
+    날짜가 바뀌어도 결과 범위가 같습니다 (예약 상태 변경만 반영되도록 TTL 적용).
+    """
+    today = today or date.today()
+    try:
+        end = pd.Timestamp(end_date).date()
+    except Exception:
+        return RESULT_CACHE_TTL_OPEN
+    return RESULT_CACHE_TTL_CLOSED if end < today else RESULT_CACHE_TTL_OPEN
+
+
+def _is_cacheable(value):
+    """
+    캐시할 결과인지 확인
+
+    조회 함수는 오류 시 빈 DataFrame/0 요약을 반환하므로, 빈 결과는 캐시하지 않습니다.
+    """
+    if isinstance(value, pd.DataFrame):
+        return not value.empty
+    if isinstance(value, dict):
+        return any(value.values())
+    return value is not None
+
+
+def _path(key):
+    return os.path.join(RESULT_CACHE_DIR, f"{key}.pkl")
+
+
+def get(key):
+    """
+    캐시 조회
+
+    Returns:
+        tuple: (적중 여부, 값)
+    """
+    path = _path(key)
+    try:
+        with open(path, 'rb') as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return False, None
+    except Exception as e:
+        # 손상된 파일은 삭제
+        print(f"⚠️ 결과 캐시 읽기 실패: {e}")
+        _count('errors')
+        _remove(path)
+        return False, None
+
+    if entry.get('expires_at', 0) <= time.time():
+        _remove(path)
+        return False, None
+
+    # 최근 사용 시각 갱신 (용량 초과 시 오래 사용하지 않은 항목부터 삭제)
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return True, entry['value']
+
+
+def put(key, value, ttl, name=None):
+    """캐시 저장 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽에서 쓰다 만 파일을 보지 않음)"""
+    try:
+        os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+        entry = {
+            'name': name,
+            'created_at': time.time(),
+            'expires_at': time.time() + ttl,
+            'value': value
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=RESULT_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, _path(key))
+        except Exception:
+            _remove(tmp_path)
+            raise
+        _count('writes')
+        _evict()
+    except Exception as e:
+        print(f"⚠️ 결과 캐시 저장 실패: {e}")
+        _count('errors')
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _evict(max_bytes=None):
+    """전체 용량이 RESULT_CACHE_MAX_MB를 넘으면 오래 사용하지 않은 항목부터 삭제"""
+    max_bytes = RESULT_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+
+    entries = []
+    total = 0
+    for entry in os.scandir(RESULT_CACHE_DIR):
+        if not entry.name.endswith('.pkl'):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+
+    if total <= max_bytes:
+        return
+
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+        evicted += 1
+    _count('evictions', evicted)
+
+
+def cached_result(name=None, end_param='end_date'):
+    """
+    조회 함수 결과 캐시 데코레이터
+
+    파라미터를 기본값까지 채워 정규화한 뒤 키를 만들고, 종료일(end_param) 기준으로 TTL을 정합니다.
+    DataFrame 결과는 적중 시 df.attrs의 조회 통계(FETCH_STAT_ATTRS)를 지우고 캐시 읽기 시간(query_timings)만 기록합니다
+    (저장 당시의 조회 통계가 다시 기록되지 않도록, total_bookings 같은 결과 값은 유지).
+
+    Args:
+        name: 캐시 키에 사용할 이름 (None이면 함수 이름)
+        end_param: TTL 판단에 사용할 종료일 파라미터 이름
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        cache_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not RESULT_CACHE_ENABLED:
+                return fn(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            key = make_key(cache_name, params)
+
+            started = time.perf_counter()
+            hit, value = get(key)
+            if hit:
+                _count('hits')
+                if isinstance(value, pd.DataFrame):
+                    value.attrs = {k: v for k, v in value.attrs.items() if k not in FETCH_STAT_ATTRS}
+                    value.attrs['query_timings'] = [{
+                        'label': 'cache', 'wait': 0.0, 'elapsed': time.perf_counter() - started
+                    }]
+                return value
+
+            _count('misses')
+            value = fn(*args, **kwargs)
+            if _is_cacheable(value):
+                put(key, value, ttl_for_range(params.get(end_param)), cache_name)
+            return value
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+def get_cache_stats():
+    """적중/미적중 카운터와 디스크 사용량"""
+    with _lock:
+        stats = dict(_stats)
+
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+
+    entries = 0
+    size = 0
+    if os.path.isdir(RESULT_CACHE_DIR):
+        for entry in os.scandir(RESULT_CACHE_DIR):
+            if entry.name.endswith('.pkl'):
+                entries += 1
+                try:
+                    size += entry.stat().st_size
+                except OSError:
+                    pass
+    stats['entries'] = entries
+    stats['size_bytes'] = size
+    return stats
+
+
+def clear_result_cache():
+    """캐시 파일과 카운터 초기화 (롤업 재생성, master_data 상태값 변경 후 등)"""
+    if os.path.isdir(RESULT_CACHE_DIR):
+        for entry in os.scandir(RESULT_CACHE_DIR):
+            if entry.name.endswith(('.pkl', '.tmp')):
+                _remove(entry.path)
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,511 @@
+# utils/rollup_etl.py
+"""일별 예약 집계(롤업) 테이블 ETL
+- (date_type, 날짜, order_channel_idx, order_type, sale_type, product_idx) 단위로
+  예약수/객실수/확정·취소 객실수/입금가/실구매가를 미리 합산해 저장
+- 변경된 예약(order_product.update_date 기준)이 속한 날짜만 다시 계산 (증분 갱신)
+  예약별 마지막 집계 날짜를 {ROLLUP_TABLE}_source에 보관하여, 구매일/체크인일이 바뀐 예약은
+  이전 날짜도 함께 다시 계산
+- 조회 화면은 USE_ROLLUP_TABLE=true 일 때 원본 테이블 대신 이 테이블을 읽음
+
+사용법:
+    python utils/rollup_etl.py            # 증분 갱신 (최초 실행 시 전체 생성)
+    python utils/rollup_etl.py --full     # 보관 기간 전체 재생성
+    python utils/rollup_etl.py --from 2025-01-01 --to 2025-01-31   # 지정 기간 재계산
+"""
+
+import sys
+import os
+# 프로젝트 루트 디렉토리를 path에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import time
+import argparse
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import (
+    MetaData, Table, Column, Index, Integer, BigInteger, String, Date, DateTime, Numeric,
+    text, bindparam, select, insert, update
+)
+from config.configdb import get_db_connection
+from config.order_status_mapping import get_status_codes_by_group
+from config.master_data_loader import get_all_order_status_codes
+
+# 롤업 설정 (.env에서 조정 가능)
+ROLLUP_TABLE = os.getenv('ROLLUP_TABLE', 'daily_booking_rollup')
+USE_ROLLUP_TABLE = os.getenv('USE_ROLLUP_TABLE', 'false').lower() in ('1', 'true', 'yes')
+ROLLUP_CHANGE_COLUMN = os.getenv('ROLLUP_CHANGE_COLUMN', 'update_date')  # order_product 변경 시각 컬럼
+ROLLUP_BACKFILL_DAYS = int(os.getenv('ROLLUP_BACKFILL_DAYS', 400))      # 보관(재생성) 기간 (과거 일수)
+ROLLUP_FUTURE_DAYS = int(os.getenv('ROLLUP_FUTURE_DAYS', 365))          # 이용일 기준 미래 보관 일수
+ROLLUP_CHUNK_DAYS = int(os.getenv('ROLLUP_CHUNK_DAYS', 31))             # 한 트랜잭션에서 재계산할 최대 일수
+ROLLUP_OVERLAP_MINUTES = int(os.getenv('ROLLUP_OVERLAP_MINUTES', 10))   # 진행 중 트랜잭션 누락 방지용 여유
+
+DATE_TYPES = ('orderDate', 'useDate')
+
+metadata = MetaData()
+
+rollup_table = Table(
+    ROLLUP_TABLE, metadata,
+    Column('idx', BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True),
+    Column('date_type', String(20), nullable=False),
+    Column('stat_date', Date, nullable=False),
+    Column('order_channel_idx', Integer),
+    Column('order_type', String(50)),
+    Column('sale_type', String(20), nullable=False),
+    Column('product_idx', Integer),
+    # 행 단위 COUNT(DISTINCT order_num) - 숙소별 통계용
+    Column('booking_count', Integer, nullable=False),
+    # (날짜, 채널, 판매유형) 안에서 주문번호당 한 행에만 1로 집계 - 채널별 통계에서 합산해도 중복 없음
+    Column('channel_booking_count', Integer, nullable=False),
+    # 날짜 안에서 주문번호당 한 행에만 1로 집계 - 요약 통계(전체 예약건수)용
+    Column('order_count', Integer, nullable=False),
+    Column('total_rooms', Integer, nullable=False),
+    Column('confirmed_rooms', Integer, nullable=False),
+    Column('cancelled_rooms', Integer, nullable=False),
+    Column('total_deposit', Numeric(18, 2), nullable=False),
+    Column('total_purchase', Numeric(18, 2), nullable=False),
+    Column('refreshed_at', DateTime),
+    Index(f'ix_{ROLLUP_TABLE}_date', 'date_type', 'stat_date', 'order_channel_idx'),
+    Index(f'ix_{ROLLUP_TABLE}_product', 'date_type', 'product_idx', 'stat_date'),
+)
+
+state_table = Table(
+    f'{ROLLUP_TABLE}_state', metadata,
+    Column('table_name', String(64), primary_key=True),
+    Column('last_change_at', DateTime),   # 마지막 실행 시작 시점의 DB 시각 (변경 감지 기준)
+    Column('last_closed_date', Date),     # 마지막 실행 시점의 CURDATE() (이후 마감된 날짜 감지)
+    Column('updated_at', DateTime),
+)
+
+# 예약(order_product)별 마지막으로 집계된 날짜 - 날짜가 바뀐 예약의 이전 날짜를 찾는 용도
+source_table = Table(
+    f'{ROLLUP_TABLE}_source', metadata,
+    Column('order_product_idx', BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=False),
+    Column('order_date', Date),
+    Column('use_date', Date),
+)
+
+# 이전 날짜 조회/갱신 시 IN 목록 크기
+SOURCE_BATCH_SIZE = 1000
+
+
+def _status_params():
+    """집계 대상/확정/취소 상태 목록 (쿼리 빌더와 동일한 기준)"""
+    return {
+        'all_statuses': get_all_order_status_codes() or [],
+        'confirmed_statuses': get_status_codes_by_group('확정') or [],
+        'cancelled_statuses': get_status_codes_by_group('취소') or [],
+    }
+
+
+def _date_sql(date_type, alias):
+    """date_type별 (날짜 컬럼, 기간 조건) SQL 조각"""
+    if date_type == 'useDate':
+        return (f"DATE({alias}.checkin_date)",
+                f"{alias}.checkin_date >= :start_date AND {alias}.checkin_date <= :end_date")
+    return (f"DATE({alias}.create_date)",
+            f"{alias}.create_date >= :start_date AND {alias}.create_date <= :end_datetime")
+
+
+def _build_refresh_statement(date_type, has_status_filter):
+    """지정 기간의 롤업 행을 다시 계산하는 INSERT ... SELECT 생성"""
+    date_field, date_condition = _date_sql(date_type, 'op')
+    f_date_field, f_date_condition = _date_sql(date_type, 'op_f')
+
+    status_condition = "AND op.order_product_status IN :all_statuses" if has_status_filter else ""
+    f_status_condition = "AND op_f.order_product_status IN :all_statuses" if has_status_filter else ""
+
+    query = f"""
+    INSERT INTO {ROLLUP_TABLE} (
+        date_type, stat_date, order_channel_idx, order_type, sale_type, product_idx,
+        booking_count, channel_booking_count, order_count, total_rooms, confirmed_rooms, cancelled_rooms,
+        total_deposit, total_purchase, refreshed_at
+    )
+    SELECT
+        :date_type,
+        {date_field},
+        op.order_channel_idx,
+        op.order_type,
+        COALESCE(pr.sale_type, ''),
+        op.product_idx,
+        COUNT(DISTINCT op.order_num),
+        COUNT(first_op.idx),
+        COUNT(first_day_op.idx),
+        SUM(COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)),
+        SUM(CASE
+            WHEN op.order_product_status IN :confirmed_statuses
+            THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)
+            ELSE 0
+        END),
+        SUM(CASE
+            WHEN op.order_product_status IN :cancelled_statuses
+            THEN COALESCE(op.terms, 1) * COALESCE(op.room_cnt, 0)
+            ELSE 0
+        END),
+        SUM(COALESCE(oi_sum.due_price_sum, 0) * COALESCE(op.room_cnt, 1)),
+        SUM(COALESCE(opay.total_amount, 0)),
+        CURRENT_TIMESTAMP
+    FROM order_product op
+    LEFT JOIN (
+        SELECT
+            oi.order_product_idx,
+            SUM(oi.due_price) as due_price_sum
+        FROM order_item oi
+        INNER JOIN order_product op_f
+            ON op_f.idx = oi.order_product_idx
+        WHERE {f_date_condition}
+            AND op_f.create_date < CURDATE()
+        GROUP BY oi.order_product_idx
+    ) oi_sum
+        ON oi_sum.order_product_idx = op.idx
+    LEFT JOIN (
+        -- 주문번호별 대표 행 (채널별 통계에서 예약수를 중복 없이 합산하기 위함)
+        SELECT
+            MIN(op_f.idx) as idx
+        FROM order_product op_f
+        LEFT JOIN product_rateplan pr_f
+            ON op_f.rateplan_idx = pr_f.idx
+        WHERE {f_date_condition}
+            AND op_f.create_date < CURDATE()
+            AND op_f.order_num IS NOT NULL
+            {f_status_condition}
+        GROUP BY op_f.order_num, {f_date_field}, op_f.order_channel_idx, COALESCE(pr_f.sale_type, '')
+    ) first_op
+        ON first_op.idx = op.idx
+    LEFT JOIN (
+        -- 주문번호별 날짜 대표 행 (요약 통계의 전체 예약건수용)
+        SELECT
+            MIN(op_f.idx) as idx
+        FROM order_product op_f
+        WHERE {f_date_condition}
+            AND op_f.create_date < CURDATE()
+            AND op_f.order_num IS NOT NULL
+            {f_status_condition}
+        GROUP BY op_f.order_num, {f_date_field}
+    ) first_day_op
+        ON first_day_op.idx = op.idx
+    LEFT JOIN order_pay opay
+        ON op.order_pay_idx = opay.idx
+    LEFT JOIN product_rateplan pr
+        ON op.rateplan_idx = pr.idx
+    WHERE {date_condition}
+        AND op.create_date < CURDATE()
+        {status_condition}
+    GROUP BY {date_field}, op.order_channel_idx, op.order_type, COALESCE(pr.sale_type, ''), op.product_idx
+    """
+
+    statement = text(query).bindparams(
+        bindparam('confirmed_statuses', expanding=True),
+        bindparam('cancelled_statuses', expanding=True),
+    )
+    if has_status_filter:
+        statement = statement.bindparams(bindparam('all_statuses', expanding=True))
+    return statement
+
+
+def _date_ranges(dates, chunk_days=None):
+    """날짜 목록을 연속 구간 [(시작, 끝), ...]으로 묶음 (구간 길이는 chunk_days 이하)"""
+    chunk_days = chunk_days or ROLLUP_CHUNK_DAYS
+    ranges = []
+    for current in sorted(set(dates)):
+        if ranges and current - ranges[-1][1] == timedelta(days=1) \
+                and (current - ranges[-1][0]).days < chunk_days:
+            ranges[-1][1] = current
+        else:
+            ranges.append([current, current])
+    return [(start, end) for start, end in ranges]
+
+
+def _to_date(value):
+    """DB 드라이버별 날짜 반환값(date/datetime/문자열)을 date로 변환"""
+    if value is None or (not isinstance(value, (date, datetime)) and pd.isna(value)):
+        return None
+    return pd.Timestamp(value).date()
+
+
+def ensure_rollup_tables(engine=None):
+    """롤업 테이블과 상태 테이블 생성 (이미 있으면 무시)"""
+    engine = engine or get_db_connection()
+    metadata.create_all(engine, checkfirst=True)
+
+
+def refresh_date_range(engine, date_type, start_date, end_date, statuses=None):
+    """
+    지정 기간(포함)의 롤업 행을 삭제 후 다시 계산
+
+    Returns:
+        int: 새로 적재된 행 수
+    """
+    statuses = statuses or _status_params()
+    has_status_filter = bool(statuses['all_statuses'])
+    statement = _build_refresh_statement(date_type, has_status_filter)
+
+    params = {
+        'date_type': date_type,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'end_datetime': f"{end_date.isoformat()} 23:59:59",
+        'confirmed_statuses': statuses['confirmed_statuses'],
+        'cancelled_statuses': statuses['cancelled_statuses'],
+    }
+    if has_status_filter:
+        params['all_statuses'] = statuses['all_statuses']
+
+    # 삭제와 재적재를 한 트랜잭션으로 처리하여 조회 중 빈 구간이 보이지 않도록 함
+    with engine.begin() as conn:
+        conn.execute(
+            rollup_table.delete().where(
+                (rollup_table.c.date_type == date_type)
+                & (rollup_table.c.stat_date >= start_date)
+                & (rollup_table.c.stat_date <= end_date)
+            )
+        )
+        result = conn.execute(statement, params)
+    return result.rowcount
+
+
+def _load_state(conn):
+    row = conn.execute(
+        select(state_table.c.last_change_at, state_table.c.last_closed_date)
+        .where(state_table.c.table_name == ROLLUP_TABLE)
+    ).first()
+    return row
+
+
+def _save_state(engine, run_started_at, run_curdate):
+    values = {
+        'last_change_at': run_started_at,
+        'last_closed_date': run_curdate,
+        'updated_at': datetime.now(),
+    }
+    with engine.begin() as conn:
+        if _load_state(conn) is None:
+            conn.execute(insert(state_table).values(table_name=ROLLUP_TABLE, **values))
+        else:
+            conn.execute(
+                update(state_table).where(state_table.c.table_name == ROLLUP_TABLE).values(**values)
+            )
+
+
+def _find_changed_rows(conn, since, last_closed_date):
+    """
+    마지막 실행 이후 변경되었거나 새로 마감된 예약 행 조회
+
+    Returns:
+        pandas DataFrame: idx, order_date, use_date (현재 날짜)
+    """
+    if not re.fullmatch(r'\w+', ROLLUP_CHANGE_COLUMN or ''):
+        raise ValueError(f"ROLLUP_CHANGE_COLUMN 값이 올바르지 않습니다: {ROLLUP_CHANGE_COLUMN!r}")
+
+    # 오늘 생성된 행도 포함 (집계 대상은 아니지만 날짜 기록은 유지)
+    query = text(f"""
+    SELECT
+        op.idx,
+        DATE(op.create_date) as order_date,
+        DATE(op.checkin_date) as use_date
+    FROM order_product op
+    WHERE op.{ROLLUP_CHANGE_COLUMN} >= :since
+        OR op.create_date >= :last_closed_date
+    """)
+    df = pd.read_sql(query, conn, params={
+        'since': since.strftime('%Y-%m-%d %H:%M:%S'),
+        'last_closed_date': last_closed_date.isoformat(),
+    })
+    df['order_date'] = df['order_date'].map(_to_date)
+    df['use_date'] = df['use_date'].map(_to_date)
+    return df
+
+
+def _load_previous_dates(conn, ids):
+    """{ROLLUP_TABLE}_source에 기록된 예약별 이전 날짜 (구매일 목록, 이용일 목록)"""
+    order_dates, use_dates = [], []
+    for i in range(0, len(ids), SOURCE_BATCH_SIZE):
+        rows = conn.execute(
+            select(source_table.c.order_date, source_table.c.use_date)
+            .where(source_table.c.order_product_idx.in_(ids[i:i + SOURCE_BATCH_SIZE]))
+        ).all()
+        order_dates += [_to_date(row.order_date) for row in rows]
+        use_dates += [_to_date(row.use_date) for row in rows]
+    return order_dates, use_dates
+
+
+def _find_changed_dates(conn, changed, last_closed_date, today):
+    """
+    재계산할 날짜 (변경된 예약의 현재 날짜 + 이전에 집계된 날짜 + 새로 마감된 날짜)
+
+    Args:
+        changed: _find_changed_rows 결과
+
+    Returns:
+        dict: {'orderDate': set(date), 'useDate': set(date)}
+    """
+    previous_order_dates, previous_use_dates = _load_previous_dates(conn, [int(i) for i in changed['idx']])
+
+    window_start = today - timedelta(days=ROLLUP_BACKFILL_DAYS)
+    window_end = today + timedelta(days=ROLLUP_FUTURE_DAYS)
+
+    order_dates = {
+        d for d in list(changed['order_date']) + previous_order_dates
+        if d and window_start <= d < today
+    }
+    use_dates = {
+        d for d in list(changed['use_date']) + previous_use_dates
+        if d and window_start <= d <= window_end
+    }
+
+    # 마지막 실행 이후 마감된 날짜는 예약이 없어도 재계산 (이전 값 정리)
+    day = max(last_closed_date, window_start)
+    while day < today:
+        order_dates.add(day)
+        day += timedelta(days=1)
+
+    return {'orderDate': order_dates, 'useDate': use_dates}
+
+
+def _save_source_dates(engine, changed):
+    """변경된 예약의 현재 날짜를 {ROLLUP_TABLE}_source에 기록 (롤업 재계산 후 호출)"""
+    records = [
+        {'order_product_idx': int(idx), 'order_date': order_date, 'use_date': use_date}
+        for idx, order_date, use_date in zip(changed['idx'], changed['order_date'], changed['use_date'])
+    ]
+    with engine.begin() as conn:
+        for i in range(0, len(records), SOURCE_BATCH_SIZE):
+            batch = records[i:i + SOURCE_BATCH_SIZE]
+            conn.execute(source_table.delete().where(
+                source_table.c.order_product_idx.in_([record['order_product_idx'] for record in batch])
+            ))
+            conn.execute(insert(source_table), batch)
+
+
+def _rebuild_source_dates(engine, today):
+    """{ROLLUP_TABLE}_source 전체 재생성 (보관 기간에 걸친 예약만)"""
+    window_start = (today - timedelta(days=ROLLUP_BACKFILL_DAYS)).isoformat()
+    with engine.begin() as conn:
+        conn.execute(source_table.delete())
+        conn.execute(text(f"""
+        INSERT INTO {source_table.name} (order_product_idx, order_date, use_date)
+        SELECT
+            op.idx,
+            DATE(op.create_date),
+            DATE(op.checkin_date)
+        FROM order_product op
+        WHERE op.create_date >= :window_start
+            OR op.checkin_date >= :window_start
+        """), {'window_start': window_start})
+
+
+def _has_source_dates(conn):
+    return conn.execute(select(source_table.c.order_product_idx).limit(1)).first() is not None
+
+
+def _full_window(today):
+    """전체 재생성 대상 기간"""
+    window_start = today - timedelta(days=ROLLUP_BACKFILL_DAYS)
+    return {
+        'orderDate': (window_start, today - timedelta(days=1)),
+        'useDate': (window_start, today + timedelta(days=ROLLUP_FUTURE_DAYS)),
+    }
+
+
+def run_rollup(full=False, start_date=None, end_date=None, engine=None):
+    """
+    롤업 테이블 갱신
+
+    Args:
+        full: True면 보관 기간 전체 재생성
+        start_date, end_date: 지정 시 해당 기간만 재계산 (두 날짜유형 모두)
+        engine: SQLAlchemy 엔진 (None이면 get_db_connection 사용)
+
+    Returns:
+        dict: 날짜유형별 재계산 구간 수/적재 행 수
+    """
+    engine = engine or get_db_connection()
+    ensure_rollup_tables(engine)
+
+    with engine.connect() as conn:
+        run_started_at, run_curdate = conn.execute(text("SELECT CURRENT_TIMESTAMP, CURDATE()")).first()
+        state = _load_state(conn)
+        # 예약별 날짜 기록이 없으면 (이전 버전에서 생성된 롤업) 이전 날짜를 알 수 없으므로 전체 재생성
+        has_source_dates = _has_source_dates(conn)
+
+    run_started_at = pd.Timestamp(run_started_at).to_pydatetime()
+    today = _to_date(run_curdate)
+    statuses = _status_params()
+    changed = None
+
+    if start_date and end_date:
+        ranges = {dt: _date_ranges(pd.date_range(start_date, end_date).date) for dt in DATE_TYPES}
+        mode = 'range'
+    elif full or state is None or state.last_change_at is None or not has_source_dates:
+        ranges = {
+            dt: _date_ranges(pd.date_range(*window).date)
+            for dt, window in _full_window(today).items()
+        }
+        mode = 'full'
+    else:
+        since = pd.Timestamp(state.last_change_at).to_pydatetime() - timedelta(minutes=ROLLUP_OVERLAP_MINUTES)
+        last_closed_date = _to_date(state.last_closed_date) or today
+        with engine.connect() as conn:
+            changed = _find_changed_rows(conn, since, last_closed_date)
+            changed_dates = _find_changed_dates(conn, changed, last_closed_date, today)
+        ranges = {dt: _date_ranges(dates) for dt, dates in changed_dates.items()}
+        mode = 'incremental'
+
+    # 전체 재생성은 재계산 전에 기록 (재계산 중 바뀐 예약은 다음 실행에서 기록된 날짜로 함께 재계산)
+    if mode == 'full':
+        _rebuild_source_dates(engine, today)
+
+    result = {'mode': mode}
+    for date_type in DATE_TYPES:
+        rows = 0
+        for range_start, range_end in ranges[date_type]:
+            rows += refresh_date_range(engine, date_type, range_start, range_end, statuses)
+        result[date_type] = {'ranges': len(ranges[date_type]), 'rows': rows}
+
+    # 증분 갱신의 예약별 날짜 기록은 재계산이 끝난 뒤 갱신 (중간에 실패하면 다음 실행에서 이전 날짜를 다시 찾음)
+    if mode == 'incremental':
+        _save_source_dates(engine, changed)
+
+    # 지정 기간 재계산은 변경 감지 기준 시각을 옮기지 않음
+    if mode != 'range':
+        _save_state(engine, run_started_at, today)
+
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='일별 예약 집계(롤업) 테이블 갱신')
+    parser.add_argument('--full', action='store_true', help='보관 기간 전체 재생성')
+    parser.add_argument('--from', dest='start_date', help='재계산 시작일 (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end_date', help='재계산 종료일 (YYYY-MM-DD)')
+    args = parser.parse_args(argv)
+
+    if bool(args.start_date) != bool(args.end_date):
+        parser.error('--from과 --to는 함께 지정해야 합니다.')
+
+    start_date = date.fromisoformat(args.start_date) if args.start_date else None
+    end_date = date.fromisoformat(args.end_date) if args.end_date else None
+
+    print("="*60)
+    print(f"📦 롤업 테이블 갱신: {ROLLUP_TABLE}")
+    print("="*60)
+
+    started = time.time()
+    try:
+        result = run_rollup(full=args.full, start_date=start_date, end_date=end_date)
+    except Exception as e:
+        print(f"❌ 롤업 갱신 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    print(f"  - 모드: {result['mode']}")
+    for date_type in DATE_TYPES:
+        print(f"  - {date_type}: {result[date_type]['ranges']}개 구간, {result[date_type]['rows']:,}행 적재")
+    print(f"\n✅ 롤업 갱신 완료 ({time.time() - started:.1f}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())